@@ -0,0 +1,34 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bird"))
+from bird_sim import BirdSim
+
+# Benchmark: headless Flappy Bird ticks per second.
+# A simple bot flaps whenever it sinks close to the bottom of the gaps just
+# ahead, so the run mixes long rounds with crashes and restarts.
+
+TICKS = 500_000
+
+
+def bot(sim):
+    floor = sim.height
+    for x, gap_top in sim.pipes():
+        if x + sim.pipe_width > sim.bird_x and x < sim.bird_x + 150:
+            floor = min(floor, gap_top + sim.pipe_gap)
+    return sim.bird_y + sim.bird_size > floor - 15
+
+
+if __name__ == "__main__":
+    sim = BirdSim(seed=1)
+    crashes = best = 0
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        score = sim.score
+        if sim.step(bot(sim)):
+            crashes += 1
+            best = max(best, score)
+    elapsed = time.perf_counter() - start
+    print(f"{TICKS:,} ticks in {elapsed:.2f}s: {TICKS / elapsed:,.0f} ticks/s "
+          f"({crashes} crashes, best score {max(best, sim.score)})")
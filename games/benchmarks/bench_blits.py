@@ -0,0 +1,52 @@
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+from common.render import Renderer
+
+# Benchmark: one pygame.draw.rect per entity vs one Renderer.blits() batch
+# of a pre-converted sprite, for the entity counts the stress presets
+# reach (long snake body, invader swarm, bullet storm).
+
+WIDTH, HEIGHT = 1200, 1200
+FRAMES = 200
+CASES = [("snake body", 5000, (10, 10)), ("invaders", 1080, (12, 8)), ("bullets", 2000, (5, 10))]
+
+
+def per_rect(renderer, positions, size):
+    w, h = size
+    for x, y in positions:
+        renderer.rect((0, 0, 0), (x, y, w, h))
+
+
+def batched(renderer, positions, size):
+    renderer.blits(renderer.sprite((0, 0, 0), size), positions)
+
+
+def bench(draw, renderer, positions, size):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        draw(renderer, positions, size)
+        renderer.drawn.clear()
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+if __name__ == "__main__":
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    renderer = Renderer(screen, (50, 153, 213), dirty=False)
+    rng = random.Random(1)
+    for name, count, size in CASES:
+        positions = [(rng.randrange(WIDTH), rng.randrange(HEIGHT)) for _ in range(count)]
+        slow = bench(per_rect, renderer, positions, size)
+        fast = bench(batched, renderer, positions, size)
+        print(f"{name:11} x{count:5}: draw.rect {slow:6.2f} ms/frame, blits {fast:6.2f} ms/frame "
+              f"({slow / fast:.1f}x)")
+    pygame.quit()
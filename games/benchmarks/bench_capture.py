@@ -0,0 +1,119 @@
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# Scripted input so the game plays itself; the driver's report is not wanted
+os.environ.setdefault("GAMES_BENCH_TICKS", str(10 ** 9))
+os.environ.setdefault("GAMES_BENCH_OUT", os.devnull)
+os.environ.setdefault("GAMES_SEED", "1")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import launcher
+from common import game
+from common.capture import FrameRecorder
+from common.profiler import percentile
+
+# Benchmark: cost of capturing every frame of space2.py (800x600) with
+# common/capture.py, headless.
+#
+# Unthrottled: frames per second of step + render, without and with the
+# recorder; the extra time per captured frame is the whole overhead,
+# including the writer thread's (it shares the CPU). Paced: 60 FPS as in
+# the real game, counting frames that ran over budget and frames the
+# recorder had to drop. "capture() ms" is what the frame loop itself waits
+# for.
+#
+#     python3 benchmarks/bench_capture.py [--frames 2000] [--seconds 10]
+
+BUDGET_MS = 1000 / 60
+
+
+def new_game(game_class, screen):
+    instance = game_class(screen)
+    instance.step()
+    return instance
+
+
+def unthrottled(game_class, screen, frames, recorder):
+    instance = new_game(game_class, screen)
+    capture_ms = []
+    started = time.perf_counter()
+    for _ in range(frames):
+        if not instance.step():
+            instance = new_game(game_class, screen)  # game over: start again
+        instance.render()
+        if recorder:
+            before = time.perf_counter()
+            recorder.capture(screen)
+            capture_ms.append((time.perf_counter() - before) * 1000)
+    if recorder:
+        recorder.close()  # waits for the writer to catch up
+    return frames / (time.perf_counter() - started), capture_ms
+
+
+def paced(game_class, screen, seconds, recorder):
+    instance = new_game(game_class, screen)
+    frame_ms = []
+    next_frame = time.perf_counter()
+    end = next_frame + seconds
+    while next_frame < end:
+        started = time.perf_counter()
+        if not instance.step():
+            instance = new_game(game_class, screen)
+        instance.render()
+        if recorder:
+            recorder.capture(screen)
+        frame_ms.append((time.perf_counter() - started) * 1000)
+        next_frame += 1 / 60
+        delay = next_frame - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    if recorder:
+        recorder.close()
+    return frame_ms
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    pygame.init()
+    game_class = launcher.load("space", "space2").Game
+    screen = game.open_display(game_class)
+    fd, path = tempfile.mkstemp(suffix=".cap")
+    os.close(fd)
+    try:
+        base_fps, _ = unthrottled(game_class, screen, args.frames, None)
+        recorder = FrameRecorder(path, screen, capacity=300)
+        capture_fps, capture_ms = unthrottled(game_class, screen, args.frames, recorder)
+        # Spread over the frames actually written (an unthrottled loop
+        # outruns the writer, and dropped frames cost next to nothing)
+        written = recorder.frames - recorder.dropped
+        overhead = (args.frames / capture_fps - args.frames / base_fps) * 1000 / written
+        print(f"space2 {screen.get_width()}x{screen.get_height()}, {args.frames} frames unthrottled")
+        print(f"  without capture {base_fps:8,.0f} FPS ({1000 / base_fps:.2f} ms/frame)")
+        print(f"  with capture    {capture_fps:8,.0f} FPS ({1000 / capture_fps:.2f} ms/frame), "
+              f"{recorder.dropped} dropped")
+        print(f"  overhead        {overhead:8.2f} ms per captured frame ({overhead / BUDGET_MS:.1%} of the 60 FPS budget)")
+        print(f"  capture() ms    p50 {statistics.median(capture_ms):.3f}, p99 {percentile(capture_ms, 99):.3f}, "
+              f"max {max(capture_ms):.3f}")
+
+        print(f"paced at 60 FPS for {args.seconds:g}s")
+        for label, capturing in (("without capture", False), ("with capture", True)):
+            recorder = FrameRecorder(path, screen, capacity=300) if capturing else None
+            frame_ms = paced(game_class, screen, args.seconds, recorder)
+            over = sum(1 for ms in frame_ms if ms > BUDGET_MS)
+            dropped = f", {recorder.dropped} of {recorder.frames} dropped" if recorder else ""
+            print(f"  {label:16}frame p50 {statistics.median(frame_ms):.2f} ms, p99 {percentile(frame_ms, 99):.2f} ms, "
+                  f"{over} of {len(frame_ms)} over {BUDGET_MS:.1f} ms{dropped}")
+    finally:
+        os.remove(path)
+    pygame.quit()
@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+GAMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, GAMES_DIR)
+sys.path.insert(0, os.path.join(GAMES_DIR, "snake"))
+
+import pygame
+from common.hud import Hud
+from common.render import Renderer
+from snake_sim import SnakeSim, LEFT, RIGHT, UP, DOWN
+from snake_view import SnakeView, blue, red
+
+# Benchmark: full-frame vs dirty-rectangle rendering, headless.
+# Runs on a large window, where filling and presenting the whole screen
+# every frame costs the most.
+
+WIDTH, HEIGHT = 1920, 1080
+FRAMES = 2000
+
+
+def snake_frames(renderer, frames):
+    view = SnakeView(renderer, Hud(pygame.font.Font(None, 30), red))
+    sim = SnakeSim(WIDTH, HEIGHT, obstacles=40, seed=7)
+    sim.length = 400
+    turns = [RIGHT, DOWN, LEFT, UP]
+
+    start = time.perf_counter()
+    for tick in range(frames):
+        # Run laps around a square that stays on screen
+        sim.step(turns[(tick // 60) % 4] if tick % 60 == 0 else None)
+        if sim.game_close:
+            sim.reset()
+            sim.length = 400
+            renderer.invalidate()
+        view.draw(sim, 0)
+        renderer.present()
+    return (time.perf_counter() - start) / frames
+
+
+def sprite_frames(renderer, frames):
+    # Pong-style scene: two paddles, a ball, the net and two scores
+    font = pygame.font.Font(None, 50)
+    white = (255, 255, 255)
+    left = pygame.Rect(20, HEIGHT // 2 - 50, 10, 100)
+    right = pygame.Rect(WIDTH - 30, HEIGHT // 2 - 50, 10, 100)
+    ball = pygame.Rect(WIDTH // 2, HEIGHT // 2, 20, 20)
+    speed_x, speed_y = 7, 5
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        ball.x += speed_x
+        ball.y += speed_y
+        if ball.top <= 0 or ball.bottom >= HEIGHT:
+            speed_y *= -1
+        if ball.left <= 30 or ball.right >= WIDTH - 30:
+            speed_x *= -1
+        left.centery = right.centery = ball.centery
+
+        renderer.begin()
+        renderer.rect(white, left)
+        renderer.rect(white, right)
+        renderer.ellipse(white, ball)
+        renderer.aaline(white, (WIDTH // 2, 0), (WIDTH // 2, HEIGHT))
+        renderer.blit(font.render("3", True, white), (WIDTH // 4, 20))
+        renderer.blit(font.render("5", True, white), (WIDTH * 3 // 4, 20))
+        renderer.present()
+    return (time.perf_counter() - start) / frames
+
+
+if __name__ == "__main__":
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+
+    print(f"{WIDTH}x{HEIGHT}, {FRAMES} frames, SDL_VIDEODRIVER={os.environ['SDL_VIDEODRIVER']}")
+    for name, scene, background in (("snake", snake_frames, blue), ("sprites", sprite_frames, (0, 0, 0))):
+        full = scene(Renderer(screen, background, dirty=False), FRAMES)
+        dirty = scene(Renderer(screen, background, dirty=True), FRAMES)
+        print(f"{name:8} full: {full * 1000:7.3f} ms/frame  dirty: {dirty * 1000:7.3f} ms/frame  "
+              f"({full / dirty:.1f}x)")
+
+    pygame.quit()
@@ -0,0 +1,71 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from envs import make, ENVS
+from envs.vector import SyncVectorEnv, ProcVectorEnv
+
+# Benchmark: environment steps per second (random actions, auto-reset),
+# for one env, a SyncVectorEnv and a ProcVectorEnv with 1, 2, 4, ...
+# workers up to the number of cores. Each vector step moves every env, so
+# steps/sec counts env steps, not vector steps.
+#
+#     python3 benchmarks/bench_envs.py [--envs N] [--steps N] [--workers 1,2,4] [names...]
+
+
+def actions_for(space, num_envs, count, seed=1):
+    # Pre-drawn so the loop only measures the envs
+    rng = random.Random(seed)
+    return [[rng.randrange(space.n) for _ in range(num_envs)] for _ in range(count)]
+
+
+def bench_single(name, steps):
+    env = make(name, seed=1)
+    env.reset()
+    actions = [a for (a,) in actions_for(env.action_space, 1, steps)]
+    started = time.perf_counter()
+    for action in actions:
+        _, _, terminated, truncated, _ = env.step(action)
+        if terminated or truncated:
+            env.reset()
+    return steps / (time.perf_counter() - started)
+
+
+def bench_vector(envs, steps):
+    with envs:
+        envs.reset(seed=1)
+        rounds = max(1, steps // envs.num_envs)
+        actions = actions_for(envs.action_space, envs.num_envs, rounds)
+        started = time.perf_counter()
+        for batch in actions:
+            envs.step(batch)
+        return rounds * envs.num_envs / (time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("names", nargs="*", default=list(ENVS))
+    parser.add_argument("--envs", type=int, default=32, help="envs per vector env")
+    parser.add_argument("--steps", type=int, default=100_000, help="env steps per measurement")
+    parser.add_argument("--workers", help="comma-separated worker counts (default 1, 2, 4, ... up to the cores)")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= cores:
+        worker_counts.append(worker_counts[-1] * 2)
+    if args.workers:
+        worker_counts = [int(n) for n in args.workers.split(",")]
+
+    print(f"{args.envs} envs per vector env, {args.steps:,} steps each, {cores} cores")
+    for name in args.names:
+        print(f"{name}:")
+        print(f"  {'single env':24}{bench_single(name, args.steps):>12,.0f} steps/s")
+        sync = bench_vector(SyncVectorEnv(name, args.envs, seed=1), args.steps)
+        print(f"  {'SyncVectorEnv':24}{sync:>12,.0f} steps/s")
+        for workers in worker_counts:
+            rate = bench_vector(ProcVectorEnv(name, args.envs, workers=workers, seed=1), args.steps)
+            print(f"  {f'ProcVectorEnv x{workers}':24}{rate:>12,.0f} steps/s  ({rate / sync:.2f}x sync)")
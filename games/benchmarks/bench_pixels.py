@@ -0,0 +1,79 @@
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# Scripted input so the games play themselves; the driver's report is not wanted
+os.environ.setdefault("GAMES_BENCH_TICKS", str(10 ** 9))
+os.environ.setdefault("GAMES_BENCH_OUT", os.devnull)
+os.environ.setdefault("GAMES_SEED", "1")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import launcher
+from common import game, pixels
+from common.pixels import PixelObserver
+
+# Benchmark: pixel observations per second from common/pixels.py, headless.
+# The game runs normally (step + render); only taking the observation is
+# timed. "tobytes" is the usual copy, pygame.image.tobytes of the whole
+# frame, for comparison; "view" is pixels() alone (no copy at all). numpy
+# is optional: without it PixelObserver uses its pure Python path.
+#
+#     python3 benchmarks/bench_pixels.py [--frames 300]
+
+GAMES = [("space", "space2"), ("bird", "bird")]
+
+MODES = [
+    # (label, PixelObserver options or None for the baselines)
+    ("tobytes", None),
+    ("view", None),
+    ("rgb", dict()),
+    ("gray", dict(grayscale=True)),
+    ("gray/4 x4", dict(grayscale=True, downsample=4, stack=4)),
+]
+
+
+def bench(game_class, screen, label, options, frames):
+    instance = game_class(screen)
+    observer = PixelObserver(screen, **(options or {}))
+    if label == "view" and pixels.np is None:
+        return None
+    elapsed = 0.0
+    for _ in range(frames):
+        if not instance.step():
+            instance = game_class(screen)  # game over: start again
+            observer.reset()
+            instance.step()
+        instance.render()
+        started = time.perf_counter()
+        if label == "tobytes":
+            pygame.image.tobytes(screen, "RGB")
+        elif label == "view":
+            view = observer.pixels()
+            del view
+        else:
+            observer.observe()
+        elapsed += time.perf_counter() - started
+    return frames / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = None
+    print(f"backend: {'numpy ' + pixels.np.__version__ if pixels.np else 'pure Python (no numpy)'}")
+    print(f"{'game':10}{'mode':>12}{'shape':>20}{'obs/sec':>12}")
+    for folder, module in GAMES:
+        game_class = launcher.load(folder, module).Game
+        screen = game.open_display(game_class, screen)
+        for label, options in MODES:
+            rate = bench(game_class, screen, label, options, args.frames)
+            shape = PixelObserver(screen, **(options or {})).shape if options is not None else ""
+            print(f"{module:10}{label:>12}{str(shape):>20}{'n/a' if rate is None else f'{rate:.0f}':>12}")
+    pygame.quit()
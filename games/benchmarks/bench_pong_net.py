@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import math
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "pong"))
+from pong_net import (LEFT, PADDLE_SPEED, UDP_OVERHEAD, BALL_X, BALL_Y, NetConditions, add_condition_args,
+                      start_client, start_server)
+
+# Benchmark: pong_net over localhost.
+# One server and two bot clients share an asyncio loop but talk over real
+# UDP sockets, optionally through simulated loss, latency and jitter. The
+# bots steer toward the ball they see. Reports, per client: bandwidth with
+# UDP/IP headers, snapshot sizes, input latency (from a change of direction
+# until the server applies it), prediction corrections and how far the
+# interpolated ball is from the server's ball at the tick being shown.
+#
+#     python3 benchmarks/bench_pong_net.py [--seconds 10] [--loss 0.1 --latency 20 --jitter 30]
+
+LATENCY_TARGET_MS = 1000 / 60   # sub-frame (without simulated delay)
+BANDWIDTH_TARGET = 2048         # bytes/s per client and direction, headers included
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else float("nan")
+
+
+async def run(args):
+    loop = asyncio.get_running_loop()
+    server = await start_server("127.0.0.1", 0, conditions=NetConditions(args.loss, args.latency, args.jitter, 1)
+                                or None)
+    serving = asyncio.create_task(server.serve())
+    port = server.address[1]
+    clients = []
+    for seed in (2, 3):
+        conditions = NetConditions(args.loss, args.latency, args.jitter, seed) or None
+        clients.append(await start_client("127.0.0.1", port, conditions=conditions, interp_ms=args.interp_ms))
+
+    # Input latency: when each command was made, per side
+    made = {client.side: {} for client in clients}
+    latencies = []
+
+    def applied(player, seq):
+        started = made[player.side].pop(seq, None)
+        if started is not None:
+            latencies.append((loop.time() - started) * 1000)
+    server.on_apply = applied
+
+    ball_errors = []
+    interval = 1 / 60
+    started = next_frame = loop.time()
+    while loop.time() - started < args.seconds:
+        now = loop.time()
+        for client in clients:
+            view = client.view(now)
+            direction = 0
+            if view is not None:
+                ball_x, ball_y, left_y, right_y = view[:4]
+                paddle_y = left_y if client.side == LEFT else right_y
+                gap = ball_y + client.geometry.ball_size / 2 - (paddle_y + client.geometry.paddle_height / 2)
+                if abs(gap) > PADDLE_SPEED:
+                    direction = 1 if gap > 0 else -1
+                # Compare with the server at the tick on screen (skipping serves)
+                tick = math.floor(client.view_tick)
+                truth = server.history.get(tick), server.history.get(tick + 1)
+                if None not in truth and truth[0][6:] == truth[1][6:]:
+                    a = client.view_tick - tick
+                    x = truth[0][BALL_X] + (truth[1][BALL_X] - truth[0][BALL_X]) * a
+                    y = truth[0][BALL_Y] + (truth[1][BALL_Y] - truth[0][BALL_Y]) * a
+                    ball_errors.append(math.hypot(ball_x - x, ball_y - y))
+            if direction != client.direction:
+                made[client.side][client.seq + 1] = now  # a key press or release
+            client.frame(direction)
+        next_frame += interval
+        await asyncio.sleep(max(0.0, next_frame - loop.time()))
+    elapsed = loop.time() - started
+
+    print(f"{args.seconds:g}s on localhost, loss {args.loss:.0%}, latency {args.latency:g} ms, "
+          f"jitter {args.jitter:g} ms, server tick {server.tick}, score "
+          f"{server.sim.opponent_score}:{server.sim.player_score}")
+    for client in clients:
+        player = next(p for p in server.players.values() if p.side == client.side)
+        down = (player.bytes_sent + UDP_OVERHEAD * player.packets_sent) / elapsed
+        up = (client.bytes_sent + UDP_OVERHEAD * client.packets_sent) / elapsed
+        print(f"  {'left' if client.side == LEFT else 'right'} client:")
+        print(f"    down {down:7.0f} B/s ({player.bytes_sent / max(1, player.packets_sent):.1f} B payload "
+              f"per snapshot, {client.full_snapshots} full), up {up:.0f} B/s"
+              f"   [{'ok' if max(down, up) < BANDWIDTH_TARGET else 'over'} < {BANDWIDTH_TARGET} B/s]")
+        print(f"    received {client.packets_received} of {player.packets_sent} packets "
+              f"({client.late_snapshots} late), {client.corrections} prediction corrections "
+              f"({client.correction_px / max(1, client.corrections):.1f} px avg)")
+    target = ""
+    if not (args.latency or args.jitter):
+        target = f"   [{'ok' if percentile(latencies, 0.99) < LATENCY_TARGET_MS else 'over'} p99 < 1 frame]"
+    print(f"  input latency: mean {statistics.fmean(latencies):.1f} ms, p50 {percentile(latencies, 0.5):.1f}, "
+          f"p99 {percentile(latencies, 0.99):.1f}{target}")
+    if ball_errors:
+        print(f"  interpolated ball vs server: mean {statistics.fmean(ball_errors):.1f} px, "
+              f"p99 {percentile(ball_errors, 0.99):.1f} px")
+
+    for client in clients:
+        client.close()
+    server.stop()
+    serving.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--interp-ms", type=float, default=100)
+    add_condition_args(parser)
+    asyncio.run(run(parser.parse_args()))
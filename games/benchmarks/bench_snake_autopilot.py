@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "snake"))
+from common.profiler import percentile
+from snake_autopilot import Autopilot
+from snake_sim import SnakeSim
+
+# Benchmark: headless SnakeSim ticks per second with snake_autopilot.py
+# playing, including the autopilot's own time. Deaths restart the round.
+# "replan" throws the planned path away every tick (a fresh search each
+# time) to show what reusing it saves.
+#
+# Big boards are checked against both the mean rate and a per-tick budget
+# at p99. Most ticks only follow the path; a new plan is searched a few
+# layers per tick while the snake keeps to its old route, so p99 stays
+# under the budget (about 0.7 ms at 200x200). The ticks that still plan in
+# one go (nothing left to follow) set the max.
+#
+#     python3 benchmarks/bench_snake_autopilot.py [--ticks 100000]
+
+TARGET = 1000  # ticks/s the autopilot has to keep up with on big boards
+TICK_BUDGET_MS = 1000 / TARGET
+
+# (label, cols, rows, obstacles, replan every tick)
+BOARDS = [
+    ("60x40", 60, 40, 10, False),
+    ("200x200", 200, 200, 400, False),
+    ("300x300", 300, 300, 900, False),
+    ("200x200 replan", 200, 200, 400, True),
+]
+
+
+def run(cols, rows, obstacles, replan, ticks, seed):
+    sim = SnakeSim(cols * 10, rows * 10, 10, obstacles=obstacles, seed=seed)
+    pilot = Autopilot(sim)
+    tick_times = array("d")
+    deaths = best = 0
+    clock = time.perf_counter
+    started = clock()
+    for _ in range(ticks):
+        before = clock()
+        if replan:
+            pilot.path = []
+            pilot.job = None
+        if sim.step(pilot()):
+            deaths += 1
+            best = max(best, sim.length)
+            sim.reset()
+        tick_times.append(clock() - before)
+    elapsed = clock() - started
+    return ticks / elapsed, tick_times, deaths, max(best, sim.length), pilot
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'board':16}{'ticks/s':>10}{'p99 ms':>9}{'max ms':>9}{'length':>8}{'deaths':>8}"
+          f"{'searches':>10}{'layers/tick':>13}")
+    for label, cols, rows, obstacles, replan in BOARDS:
+        ticks = args.ticks // 10 if replan else args.ticks
+        rate, tick_times, deaths, length, pilot = run(cols, rows, obstacles, replan, ticks, args.seed)
+        times_ms = [t * 1000 for t in tick_times]
+        p99 = percentile(times_ms, 99)
+        line = (f"{label:16}{rate:>10,.0f}{p99:>9.3f}{max(times_ms):>9.2f}{length:>8}"
+                f"{deaths:>8}{pilot.searches:>10}{pilot.search_layers / ticks:>13.1f}")
+        if cols * rows >= 200 * 200 and not replan:
+            line += (f"   [{'ok' if rate > TARGET else 'too slow'} > {TARGET} ticks/s, "
+                     f"p99 {'ok' if p99 <= TICK_BUDGET_MS else 'over'} {TICK_BUDGET_MS:g} ms]")
+        print(line)
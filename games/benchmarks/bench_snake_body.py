@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "snake"))
+from snake_sim import SnakeSim, RIGHT
+
+# Benchmark: tick cost of a 100k-segment snake.
+# Compares SnakeSim (deque body + occupancy map) against the old list body
+# (del snake_list[0] and a scan of snake_list[:-1] every tick).
+
+SEGMENTS = 100_000
+TICKS = 2_000
+
+
+def long_snake(segments):
+    # A wide, obstacle-free board so the snake can stretch out in a line
+    sim = SnakeSim(width=10 * (3 * segments), height=400, obstacles=0, seed=1)
+    sim.length = segments
+    sim.step(RIGHT)
+    for _ in range(segments):
+        sim.step()
+    return sim
+
+
+def bench_sim(sim, ticks):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        sim.step()
+    return (time.perf_counter() - start) / ticks
+
+
+def bench_list(body, ticks):
+    x, y = body[-1]
+    start = time.perf_counter()
+    for _ in range(ticks):
+        x += 10
+        snake_head = [x, y]
+        body.append(snake_head)
+        if len(body) > SEGMENTS:
+            del body[0]
+        for segment in body[:-1]:
+            if segment == snake_head:
+                break
+    return (time.perf_counter() - start) / ticks
+
+
+if __name__ == "__main__":
+    sim = long_snake(SEGMENTS)
+    assert len(sim.snake_list) == SEGMENTS and not sim.game_close
+
+    deque_tick = bench_sim(sim, TICKS)
+    list_tick = bench_list([list(cell) for cell in sim.snake_list], TICKS // 20)
+
+    print(f"segments:          {SEGMENTS}")
+    print(f"deque + occupancy: {deque_tick * 1e6:10.2f} us/tick  ({1 / deque_tick:,.0f} ticks/s)")
+    print(f"list body:         {list_tick * 1e6:10.2f} us/tick  ({1 / list_tick:,.0f} ticks/s)")
+    print(f"speedup:           {list_tick / deque_tick:10.1f}x")
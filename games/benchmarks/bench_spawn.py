@@ -0,0 +1,44 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "snake"))
+from snake_sim import SnakeSim
+
+# Benchmark: spawning items on a nearly full board.
+# A 500x500 cell board with the snake covering 99% of it, comparing the
+# free-cell index (SnakeSim.spawn) with rejection sampling over the whole
+# board. Every spawned cell is checked to be free.
+
+CELLS = 500
+FILL = 0.99
+SPAWNS = 2000
+
+
+def rejection_spawn(sim):
+    rng = sim.rng
+    while True:
+        pos = (rng.randrange(sim.cols) * sim.block, rng.randrange(sim.rows) * sim.block)
+        if pos not in sim.occupied and pos not in sim.obstacle_cells:
+            return list(pos)
+
+
+def bench(spawn, sim):
+    start = time.perf_counter()
+    for _ in range(SPAWNS):
+        cell = spawn(sim)
+        assert (cell[0], cell[1]) not in sim.occupied, "spawned on the snake"
+        assert (cell[0], cell[1]) not in sim.obstacle_cells, "spawned on an obstacle"
+    return (time.perf_counter() - start) / SPAWNS
+
+
+if __name__ == "__main__":
+    block = 10
+    sim = SnakeSim(CELLS * block, CELLS * block, block, obstacles=100, seed=1,
+                   start_length=int(CELLS * CELLS * FILL))
+    print(f"board {CELLS}x{CELLS}, snake {sim.length:,} cells, {len(sim.free):,} free")
+
+    rejection = bench(rejection_spawn, sim)
+    indexed = bench(SnakeSim.spawn, sim)  # takes cells: leaves the board a bit fuller
+    print(f"rejection sampling: {rejection * 1e6:9.2f} us/spawn")
+    print(f"free-cell index:    {indexed * 1e6:9.2f} us/spawn  ({rejection / indexed:.0f}x)")
@@ -0,0 +1,58 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from run_benchmarks import GAMES_DIR, RUNS
+
+# Benchmark: startup time, from process start to the first presented frame.
+# Each game is launched headless with GAMES_BENCH_TICKS=1; the bench driver
+# notes the wall clock when the first frame has been presented and exits.
+# "cold" runs start with an empty font cache (the one system font lookup
+# per font name happens), "warm" runs reuse the cache the cold run wrote.
+#
+#     python3 benchmarks/bench_startup.py [--repeat N] [games...]
+
+GAMES = [name for name, (_, preset) in RUNS.items() if preset is None]
+
+
+def startup(script, font_cache):
+    fd, out_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", GAMES_SEED="1",
+               GAMES_BENCH_TICKS="1", GAMES_BENCH_OUT=out_path, GAMES_FONT_CACHE=font_cache)
+    for var in ("GAMES_RECORD", "GAMES_REPLAY", "GAMES_PRESET", "GAMES_NO_RENDER", "GAMES_PROFILE_OUT"):
+        env.pop(var, None)
+    try:
+        started = time.time()
+        proc = subprocess.run([sys.executable, os.path.join(GAMES_DIR, script)], env=env,
+                              cwd=tempfile.gettempdir(), capture_output=True, text=True)
+        with open(out_path) as f:
+            text = f.read()
+        if not text:
+            raise RuntimeError(f"{script} wrote no result (exit {proc.returncode}):\n{proc.stderr}")
+        return json.loads(text)["first_frame_time"] - started
+    finally:
+        os.remove(out_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time from process start to first frame")
+    parser.add_argument("names", nargs="*", help=f"games (default: all of {', '.join(GAMES)})")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'game':12}{'cold ms':>10}{'warm ms':>10}   (median of {args.repeat})")
+    for name in args.names or GAMES:
+        script = RUNS[name][0]
+        cold, warm = [], []
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory() as cache_dir:
+                font_cache = os.path.join(cache_dir, "fonts.json")
+                cold.append(startup(script, font_cache))
+                warm.append(startup(script, font_cache))
+        print(f"{name:12}{statistics.median(cold) * 1000:>10.1f}{statistics.median(warm) * 1000:>10.1f}")
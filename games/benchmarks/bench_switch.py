@@ -0,0 +1,43 @@
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import launcher
+
+# Benchmark: switching games inside one process, as launcher.py does.
+# Each switch starts a game on the shared display and runs its first frame
+# (step + render). The first round includes importing the game module and
+# filling the font and sprite caches; later rounds show the cost of
+# switching back to an already warm game. Compare with a fresh process per
+# game in bench_startup.py.
+
+ROUNDS = 10
+
+
+def switch(index, screen):
+    started = time.perf_counter()
+    game, screen, _ = launcher.start(index, screen)
+    game.step()
+    game.render()
+    return (time.perf_counter() - started) * 1000, screen
+
+
+if __name__ == "__main__":
+    pygame.init()
+    screen = pygame.display.set_mode(launcher.MENU_SIZE)
+    times = [[] for _ in launcher.GAMES]
+    for _ in range(ROUNDS):
+        for i in range(len(launcher.GAMES)):
+            ms, screen = switch(i, screen)
+            times[i].append(ms)
+
+    print(f"{'game':22}{'first ms':>10}{'warm ms':>10}   (warm: median of {ROUNDS - 1})")
+    for (_, _, title), samples in zip(launcher.GAMES, times):
+        print(f"{title:22}{samples[0]:>10.1f}{statistics.median(samples[1:]):>10.1f}")
+    pygame.quit()
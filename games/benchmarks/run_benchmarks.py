@@ -0,0 +1,119 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+# Headless benchmark harness for every game.
+#
+# Each game runs in its own process (so peak RSS is per game) with the
+# dummy SDL driver, a fixed seed and GAMES_BENCH_TICKS set: the game's
+# replay.Session then feeds it seeded scripted key presses and never
+# throttles (see common/bench.py). Results go to a JSON file that can be
+# diffed against an older run with --baseline.
+#
+#     python3 benchmarks/run_benchmarks.py [--ticks N] [--out FILE] [--baseline FILE] [names...]
+
+GAMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# name: (script, preset)
+RUNS = {
+    "snake": ("snake/snake.py", None),
+    "snake_v2": ("snake/snake_v2.py", None),
+    "pong": ("pong/pong.py", None),
+    "pong2": ("pong/pong2.py", None),
+    "space": ("space/space.py", None),
+    "space2": ("space/space2.py", None),
+    "bird": ("bird/bird.py", None),
+    # Stress presets
+    "long_snake": ("snake/snake_v2.py", "long_snake"),
+    "wave_20": ("space/space2.py", "wave_20"),
+    "swarm": ("space/space2.py", "swarm"),
+    "fast_pong": ("pong/pong2.py", "fast_pong"),
+    "snake_autopilot": ("snake/snake_v2.py", "autopilot_200"),
+}
+
+
+def run(name, ticks, seed, render):
+    script, preset = RUNS[name]
+    fd, out_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy",
+               GAMES_SEED=str(seed), GAMES_BENCH_TICKS=str(ticks), GAMES_BENCH_OUT=out_path)
+    for var in ("GAMES_RECORD", "GAMES_REPLAY", "GAMES_PRESET", "GAMES_NO_RENDER", "GAMES_PROFILE_OUT"):
+        env.pop(var, None)
+    if preset:
+        env["GAMES_PRESET"] = preset
+    if not render:
+        env["GAMES_NO_RENDER"] = "1"
+
+    try:
+        proc = subprocess.run([sys.executable, os.path.join(GAMES_DIR, script)], env=env,
+                              cwd=tempfile.gettempdir(), capture_output=True, text=True)
+        with open(out_path) as f:
+            text = f.read()
+        if not text:
+            raise RuntimeError(f"{name} wrote no result (exit {proc.returncode}):\n{proc.stderr}")
+        result = json.loads(text)
+    finally:
+        os.remove(out_path)
+    result["name"] = name
+    return result
+
+
+def print_table(results, baseline):
+    width = max([len("name")] + [len(r["name"]) for r in results])
+    print(f"{'name':{width}}{'ticks':>8}{'ticks/s':>11}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+          f"{'rss KiB':>10}{'gc0':>7}")
+    for r in results:
+        frame = r["frame_ms"]
+        line = (f"{r['name']:{width}}{r['ticks']:>8}{r['ticks_per_s']:>11,.0f}{frame['p50']:>9.3f}"
+                f"{frame['p99']:>9.3f}{frame['max']:>9.3f}{r['peak_rss_kb'] or 0:>10}"
+                f"{r['gc_collections'][0]:>7}")
+        if not r["completed"]:
+            line += "  (game ended early)"
+        old = baseline.get(r["name"])
+        if old:
+            change = (r["ticks_per_s"] / old["ticks_per_s"] - 1) * 100
+            line += f"  {change:+.1f}% ticks/s vs baseline"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless benchmark of every game")
+    parser.add_argument("names", nargs="*", help=f"runs to do (default: all of {', '.join(RUNS)})")
+    parser.add_argument("--ticks", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-render", action="store_true", help="simulation only (GAMES_NO_RENDER=1)")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare ticks/s against")
+    args = parser.parse_args()
+
+    names = args.names or list(RUNS)
+    unknown = [name for name in names if name not in RUNS]
+    if unknown:
+        parser.error(f"unknown run(s): {', '.join(unknown)}")
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {r["name"]: r for r in json.load(f)["results"]}
+
+    results = [run(name, args.ticks, args.seed, not args.no_render) for name in names]
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "ticks": args.ticks,
+        "seed": args.seed,
+        "render": not args.no_render,
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print_table(results, baseline)
+    print(f"wrote {args.out}")
@@ -1,111 +1,104 @@
 import pygame
 import sys
-import random
+import os
 
-# Initialize pygame
-pygame.init()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.fonts import fonts
+from common import game, replay
+from common.hud import DigitAtlas
+from common.profiler import FrameProfiler
+from common.render import Renderer
+from common.scores import shared_store
+from bird_sim import BirdSim
 
 # Screen settings
 WIDTH, HEIGHT = 400, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Flappy Bird")
 
 # Colors
 WHITE = (255, 255, 255)
 BLUE = (135, 206, 235)
 GREEN = (0, 200, 0)
 
-# Clock
-clock = pygame.time.Clock()
-
-# Bird settings
-bird_size = 30
-bird_x = 50
-bird_y = HEIGHT // 2
-bird_velocity = 0
-gravity = 0.5
-jump_strength = -8
-
-# Pipe settings
-pipe_width = 60
-pipe_gap = 150
-pipe_speed = 4
-pipes = []
-
-# Score
-score = 0
-font = pygame.font.Font(None, 50)
-
-def draw_bird(x, y):
-    pygame.draw.rect(screen, WHITE, (x, y, bird_size, bird_size))
-
-def draw_pipes(pipes):
-    for pipe in pipes:
-        pygame.draw.rect(screen, GREEN, pipe["top"])
-        pygame.draw.rect(screen, GREEN, pipe["bottom"])
-
-def check_collision(bird_rect, pipes):
-    # Check ground and ceiling
-    if bird_rect.top <= 0 or bird_rect.bottom >= HEIGHT:
+
+class Game:
+    size = (WIDTH, HEIGHT)
+    caption = "Flappy Bird"
+    fps = 60
+
+    def __init__(self, screen):
+        self.screen = screen
+
+        # Input session (seeded RNG, optional recording / replay)
+        self.session = replay.Session(__file__, [pygame.K_SPACE])
+
+        # Renderer (full frames by default, `--dirty` for dirty rectangles)
+        self.renderer = Renderer(screen, BLUE)
+
+        # Simulation (bird physics, pipes, score)
+        self.sim = BirdSim(WIDTH, HEIGHT, seed=self.session.seed)
+
+        # Score
+        self.digits = DigitAtlas(fonts.get(None, 50), WHITE)
+
+        # Leaderboard (shared with the other games); replays and benchmarks don't post
+        self.scores = shared_store(read_only=bool(self.session.replaying or self.session.bench))
+
+        # Per-phase frame timings (F3 shows the overlay)
+        self.profiler = FrameProfiler()
+        self.sim.profiler = self.profiler
+        self.small_font = fonts.get(None, 22)
+
+    def state(self):
+        return self.sim.state()
+
+    def step(self):
+        self.profiler.begin()
+
+        flap = False
+        for event in self.session.events():
+            if event.type == pygame.QUIT:
+                return False
+            # Bird jump
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    flap = True
+        self.profiler.mark("events")
+
+        # Bird movement, pipes and collision
+        if self.sim.step(flap):
+            self.scores.submit("bird", self.sim.last_score)
         return True
-    # Check pipes
-    for pipe in pipes:
-        if bird_rect.colliderect(pipe["top"]) or bird_rect.colliderect(pipe["bottom"]):
-            return True
-    return False
-
-def reset_game():
-    global bird_y, bird_velocity, pipes, score
-    bird_y = HEIGHT // 2
-    bird_velocity = 0
-    pipes = []
-    score = 0
-
-# Game loop
-while True:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        # Bird jump
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_SPACE:
-                bird_velocity = jump_strength
-
-    # Bird movement
-    bird_velocity += gravity
-    bird_y += bird_velocity
-    bird_rect = pygame.Rect(bird_x, bird_y, bird_size, bird_size)
-
-    # Pipe movement and generation
-    if len(pipes) == 0 or pipes[-1]["x"] < WIDTH - 200:
-        pipe_height = random.randint(100, 400)
-        top_rect = pygame.Rect(WIDTH, 0, pipe_width, pipe_height)
-        bottom_rect = pygame.Rect(WIDTH, pipe_height + pipe_gap, pipe_width, HEIGHT)
-        pipes.append({"x": WIDTH, "top": top_rect, "bottom": bottom_rect})
-
-    for pipe in pipes:
-        pipe["x"] -= pipe_speed
-        pipe["top"].x = pipe["x"]
-        pipe["bottom"].x = pipe["x"]
-
-    # Remove off-screen pipes
-    if pipes and pipes[0]["x"] < -pipe_width:
-        pipes.pop(0)
-        score += 1
-
-    # Collision check
-    if check_collision(bird_rect, pipes):
-        reset_game()
-
-    # Drawing
-    screen.fill(BLUE)
-    draw_bird(bird_x, bird_y)
-    draw_pipes(pipes)
-
-    # Draw score
-    score_text = font.render(str(score), True, WHITE)
-    screen.blit(score_text, (WIDTH // 2 - 10, 20))
-
-    pygame.display.flip()
-    clock.tick(60)
+
+    def draw_bird(self, x, y):
+        self.renderer.rect(WHITE, (x, y, self.sim.bird_size, self.sim.bird_size))
+
+    def draw_pipes(self):
+        # Every pipe half is the same screen-tall sprite, shifted so the part
+        # past the gap is clipped off; one batch for all of them
+        sim = self.sim
+        positions = []
+        for x, gap_top in sim.pipes():
+            positions.append((x, gap_top - HEIGHT))
+            positions.append((x, gap_top + sim.pipe_gap))
+        self.renderer.blits(self.renderer.sprite(GREEN, (sim.pipe_width, HEIGHT)), positions)
+
+    def render(self):
+        renderer, profiler = self.renderer, self.profiler
+
+        # Drawing
+        renderer.begin()
+        self.draw_bird(self.sim.bird_x, self.sim.bird_y)
+        self.draw_pipes()
+
+        # Draw score
+        renderer.mark(self.digits.blit(self.screen, self.sim.score, (WIDTH // 2 - 10, 20)))
+        profiler.draw(renderer, self.small_font)
+        profiler.mark("drawing")
+
+        renderer.present()
+        profiler.mark("flip")
+        profiler.end()
+
+
+if __name__ == "__main__":
+    game.main(Game)
@@ -0,0 +1,148 @@
+import random
+from array import array
+
+# Headless simulation core for Flappy Bird.
+# No pygame in here: bird.py draws a BirdSim, bots and training loops can
+# call step() as fast as they like.
+#
+# Pipes never move. They sit at fixed world positions in a small ring
+# buffer, and the screen x of a pipe is its world x minus the scroll
+# distance. Gap heights come from a sequence precomputed from the seed,
+# and a collision only tests the one or two pipes that overlap the bird.
+# A new round carries on through the sequence, so every round gets new
+# pipes. Once the scroll gets large, it and the pipes' world x are shifted
+# back together (they are 32-bit).
+
+GAP_SEQUENCE = 4096  # gap heights precomputed per seed (then repeated)
+REBASE_SCROLL = 1 << 30  # scroll distance at which world x starts over
+
+
+class BirdSim:
+    def __init__(self, width=400, height=600, seed=None):
+        self.width = width
+        self.height = height
+        self.profiler = None  # optional common.profiler.FrameProfiler
+
+        # Bird settings
+        self.bird_size = 30
+        self.bird_x = 50
+        self.gravity = 0.5
+        self.jump_strength = -8
+
+        # Pipe settings
+        self.pipe_width = 60
+        self.pipe_gap = 150
+        self.pipe_speed = 4
+        self.pipe_spacing = 200  # a new pipe once the last one is this far in
+
+        rng = random.Random(seed)
+        self.gaps = array("H", (rng.randint(100, 400) for _ in range(GAP_SEQUENCE)))
+
+        # Ring buffer of pipe records: world x and gap top, oldest at `first`.
+        # Pipes are more than pipe_spacing apart, so this many always fit.
+        self.capacity = (width + self.pipe_width) // self.pipe_spacing + 2
+        self.pipe_x = array("i", bytes(4 * self.capacity))
+        self.pipe_top = array("i", bytes(4 * self.capacity))
+        self.spawned = 0  # pipes spawned so far, all rounds (indexes the gap sequence)
+        self.last_score = 0  # score of the round that ended last
+        self.reset()
+
+    def reset(self):
+        self.bird_y = self.height // 2
+        self.bird_velocity = 0
+        self.scroll = 0
+        self.first = 0
+        self.count = 0
+        self.score = 0
+        self.ticks = 0
+
+    def state(self):
+        # Everything that decides the next tick, for replay checkpoints
+        return (self.bird_y, self.bird_velocity, self.score, self.scroll,
+                [x for x, _ in self.pipes()])
+
+    def pipes(self):
+        # (screen x, gap top) of every live pipe, oldest first
+        capacity = self.capacity
+        scroll = self.scroll
+        for i in range(self.count):
+            slot = (self.first + i) % capacity
+            yield self.pipe_x[slot] - scroll, self.pipe_top[slot]
+
+    def flap(self):
+        self.bird_velocity = self.jump_strength
+
+    def step(self, flap=False):
+        # One tick; returns True when the bird crashed (the round restarts)
+        self.ticks += 1
+        if flap:
+            self.flap()
+
+        # Bird movement
+        self.bird_velocity += self.gravity
+        self.bird_y += self.bird_velocity
+        profiler = self.profiler
+        if profiler:
+            profiler.mark("movement")
+
+        # Pipe generation: append to the ring buffer
+        capacity = self.capacity
+        if self.count == 0 or self.pipe_x[(self.first + self.count - 1) % capacity] - self.scroll < \
+                self.width - self.pipe_spacing:
+            slot = (self.first + self.count) % capacity
+            self.pipe_x[slot] = self.scroll + self.width
+            self.pipe_top[slot] = self.gaps[self.spawned % GAP_SEQUENCE]
+            self.spawned += 1
+            self.count += 1
+
+        # Scrolling moves every pipe at once
+        self.scroll += self.pipe_speed
+        if self.scroll >= REBASE_SCROLL:
+            self.rebase()
+
+        # Drop the oldest pipe once it is off-screen
+        if self.count and self.pipe_x[self.first] - self.scroll < -self.pipe_width:
+            self.first = (self.first + 1) % capacity
+            self.count -= 1
+            self.score += 1
+        if profiler:
+            profiler.mark("spawning")
+
+        crashed = self.collides()
+        if crashed:
+            self.last_score = self.score
+            self.reset()
+        if profiler:
+            profiler.mark("collision")
+        return crashed
+
+    def rebase(self):
+        # Make the scroll 0 again without moving anything on screen
+        scroll = self.scroll
+        for i in range(self.count):
+            slot = (self.first + i) % self.capacity
+            self.pipe_x[slot] -= scroll
+        self.scroll = 0
+
+    def collides(self):
+        # Ground and ceiling (integer pixels, as pygame.Rect would see them)
+        top = int(self.bird_y)
+        bottom = top + self.bird_size
+        if top <= 0 or bottom >= self.height:
+            return True
+
+        # Only pipes overlapping the bird's columns; they are the oldest
+        # ones still on screen, so the scan stops at the first pipe beyond
+        left = self.bird_x
+        right = left + self.bird_size
+        capacity = self.capacity
+        for i in range(self.count):
+            slot = (self.first + i) % capacity
+            x = self.pipe_x[slot] - self.scroll
+            if x >= right:
+                break
+            if x + self.pipe_width > left:
+                gap_top = self.pipe_top[slot]
+                if top < gap_top or bottom > gap_top + self.pipe_gap:
+                    return True
+        return False
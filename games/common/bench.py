@@ -0,0 +1,121 @@
+import atexit
+import gc
+import json
+import random
+import sys
+import time
+from array import array
+
+import pygame
+
+from common.profiler import percentile
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Benchmark driver used by common.replay.Session when GAMES_BENCH_TICKS is
+# set (benchmarks/run_benchmarks.py sets it for each game it launches).
+#
+# It feeds the game seeded, scripted key presses instead of real input,
+# never throttles, and after GAMES_BENCH_TICKS frames writes one JSON result
+# to GAMES_BENCH_OUT (or stdout) and then feeds the game a QUIT event, so
+# the game ends through its own quit path and the frame loop returns. If
+# the game quits on its own first (e.g. game over), the partial result is
+# written with "completed": false.
+
+PRESS_CHANCE = 0.15  # chance per tick to press or release one scripted key
+
+# The newest driver, whose partial result one exit hook writes
+running = None
+
+
+def finish_at_exit():
+    if running is not None:
+        running.finish(False)
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class BenchDriver:
+    def __init__(self, game, keys, seed, ticks, preset=None, out_path=None):
+        self.game = game
+        self.keys = list(keys)
+        self.seed = seed
+        self.ticks = ticks
+        self.preset = preset
+        self.out_path = out_path
+        self.rng = random.Random(seed ^ 0x5EED)
+        self.held = set()
+        self.frame_times = array("d")
+        self.done = False
+        self.first_frame_time = None  # wall clock, for startup timing
+
+        gc.collect()
+        self.gc_start = [stats["collections"] for stats in gc.get_stats()]
+        self.blocks_start = sys.getallocatedblocks()
+        self.started = self.last = time.perf_counter()
+        global running
+        if running is None:
+            atexit.register(finish_at_exit)
+        running = self
+
+    def events(self):
+        if self.done:
+            return [pygame.event.Event(pygame.QUIT)]
+        if self.rng.random() >= PRESS_CHANCE or not self.keys:
+            return []
+        key = self.rng.choice(self.keys)
+        if key in self.held:
+            self.held.discard(key)
+            return [pygame.event.Event(pygame.KEYUP, key=key)]
+        self.held.add(key)
+        return [pygame.event.Event(pygame.KEYDOWN, key=key)]
+
+    def frame(self):
+        if self.first_frame_time is None:
+            self.first_frame_time = time.time()
+        now = time.perf_counter()
+        self.frame_times.append(now - self.last)
+        self.last = now
+        if len(self.frame_times) >= self.ticks:
+            self.finish(True)  # the next events() ends the game
+
+    def result(self, completed):
+        elapsed = time.perf_counter() - self.started
+        times_ms = [t * 1000 for t in self.frame_times]
+        gc_end = [stats["collections"] for stats in gc.get_stats()]
+        return {
+            "game": self.game,
+            "preset": self.preset,
+            "seed": self.seed,
+            "ticks": len(times_ms),
+            "completed": completed,
+            "elapsed_s": elapsed,
+            "first_frame_time": self.first_frame_time,
+            "ticks_per_s": len(times_ms) / elapsed if elapsed else 0.0,
+            "frame_ms": {"p50": percentile(times_ms, 50), "p90": percentile(times_ms, 90),
+                         "p99": percentile(times_ms, 99), "max": max(times_ms, default=0.0)},
+            "peak_rss_kb": peak_rss_kb(),
+            # Allocation pressure: gen-0 collections fire every gc threshold[0]
+            # net container allocations; blocks is the live-allocation delta
+            "gc_collections": [end - start for start, end in zip(self.gc_start, gc_end)],
+            "allocated_blocks_delta": sys.getallocatedblocks() - self.blocks_start,
+        }
+
+    def finish(self, completed):
+        if self.done:
+            return
+        self.done = True
+        text = json.dumps(self.result(completed))
+        if self.out_path:
+            with open(self.out_path, "w") as f:
+                f.write(text)
+        else:
+            print(text)
@@ -0,0 +1,68 @@
+# Broad-phase collision: a uniform spatial hash.
+#
+# Rects are bucketed into square cells, so a query only looks at the handful
+# of things that share a cell with it instead of every object on screen.
+# Rects are anything that unpacks to (x, y, w, h), e.g. a pygame.Rect.
+# Keep the hash across frames: remove what dies, and for things that move
+# together (a formation) insert them where they started and query with the
+# distance moved subtracted. Rebuilding it every frame to run a handful of
+# queries costs more than testing every rect directly (see
+# ProjectilePool.overlapping).
+
+
+class SpatialHash:
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def _cells(self, x, y, w, h):
+        # The right and bottom edges are open, as in colliderect; float rects
+        # (ProjectilePool's) can end partway into a cell
+        size = self.cell_size
+        x0, y0 = int(x // size), int(y // size)
+        x1 = max(x0, int(-(-(x + w) // size)) - 1)
+        y1 = max(y0, int(-(-(y + h) // size)) - 1)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                yield cx, cy
+
+    def insert(self, item, rect):
+        x, y, w, h = rect
+        entry = (item, x, y, w, h)
+        cells = self.cells
+        for key in self._cells(x, y, w, h):
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [entry]
+            else:
+                bucket.append(entry)
+
+    def remove(self, item, rect):
+        x, y, w, h = rect
+        cells = self.cells
+        for key in self._cells(x, y, w, h):
+            bucket = cells.get(key)
+            if bucket:
+                bucket[:] = [entry for entry in bucket if entry[0] != item]
+
+    def query(self, rect):
+        # Items whose rects overlap rect (same rule as pygame's colliderect)
+        x, y, w, h = rect
+        right, bottom = x + w, y + h
+        cells = self.cells
+        hits = []
+        seen = set()
+        for key in self._cells(x, y, w, h):
+            bucket = cells.get(key)
+            if not bucket:
+                continue
+            for item, ox, oy, ow, oh in bucket:
+                if item in seen:
+                    continue
+                seen.add(item)
+                if ox < right and x < ox + ow and oy < bottom and y < oy + oh:
+                    hits.append(item)
+        return hits
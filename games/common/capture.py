@@ -0,0 +1,243 @@
+import argparse
+import atexit
+import mmap
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+
+import pygame
+
+# Frame capture for QA: every presented frame goes into a fixed-size ring
+# file, so the last N frames of a session are always on disk.
+#
+#     GAMES_CAPTURE=run.cap python3 space/space2.py     # any game
+#     python3 -m common.capture run.cap frames/         # PNG per frame
+#     python3 -m common.capture run.cap run.rgb --raw   # raw rgb24 video
+#
+# GAMES_CAPTURE_FRAMES sets the ring size (default 300 frames, 5 seconds
+# at 60 FPS; 800x600 frames are 1.4 MB each). Capturing a replay
+# (python3 -m common.replay run.rec --render) gives the same video every time.
+#
+# The game's frame loop only blits the display into one of a few spare
+# surfaces (about 0.1 ms at 800x600) and queues it. A background thread
+# converts it to RGB straight into the file's memory map. If the thread
+# falls behind and no spare is free, the frame is dropped rather than
+# waited for, except in replays and benchmark runs, which don't run in
+# real time and capture every frame. A dropped frame still uses up its
+# frame number, so the gap shows in the file; the exporter reports it and
+# repeats the frame before in a raw video, so the video keeps time.
+#
+# One recorder per file is shared by every game session in the process
+# (launcher.py); frames of another size than the first game's are skipped.
+#
+# File layout (little-endian), written through mmap:
+#   header  b"GCAP", version u32, width u32, height u32, capacity u32,
+#           game FPS u32, frame count u64 (the newest frame's number + 1;
+#           on close, every frame's, including dropped ones at the end)
+#   index   `capacity` entries: frame number u64, seconds since the
+#           first frame f64, game tick u32, 4 pad bytes
+#   frames  from the first 4 KiB boundary after the index: `capacity`
+#           slots of width*height*3 bytes of RGB, row by row
+# Frame n lives in slot n % capacity; a dropped frame's slot keeps the
+# older frame its index entry names. Pixels and index entry are written
+# before the header's count moves past them, so the file can be read while
+# a game is still writing it.
+
+MAGIC = b"GCAP"
+VERSION = 1
+HEADER = struct.Struct("<4sIIIIIQ")
+ENTRY = struct.Struct("<QdI4x")
+COUNT_OFFSET = HEADER.size - 8
+PAGE = 4096
+
+DEFAULT_CAPACITY = 300
+SPARE_SURFACES = 3
+
+
+def frame_offset(capacity):
+    index_end = HEADER.size + capacity * ENTRY.size
+    return (index_end + PAGE - 1) // PAGE * PAGE
+
+
+class FrameRecorder:
+    def __init__(self, path, surface, fps=60, capacity=DEFAULT_CAPACITY, spares=SPARE_SURFACES):
+        # `surface` is the display: frames have its size, and the spares
+        # its pixel format so blitting into them is a plain copy
+        self.path = path
+        self.size = width, height = surface.get_size()
+        self.capacity = capacity
+        self.frame_size = width * height * 3
+        self.data_start = frame_offset(capacity)
+        self.frames = 0    # numbered so far, dropped ones included (the next frame's number)
+        self.dropped = 0   # dropped because the writer was behind
+        self.skipped = 0   # skipped for being the wrong size
+        self.started = None
+
+        # Preallocated up front (sparse where the file system allows)
+        with open(path, "w+b") as f:
+            f.truncate(self.data_start + capacity * self.frame_size)
+            self.map = mmap.mmap(f.fileno(), 0)
+        self.map[:HEADER.size] = HEADER.pack(MAGIC, VERSION, width, height, capacity, fps, 0)
+
+        self.free = queue.SimpleQueue()
+        for _ in range(spares):
+            self.free.put(pygame.Surface(self.size, 0, surface))
+        self.work = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self.write_frames, name="frame-capture", daemon=True)
+        self.thread.start()
+
+    def capture(self, surface, tick=0, wait=False):
+        # Queue what `surface` shows now as the next frame; False if dropped.
+        # With `wait`, a frame is never dropped: the caller waits for the
+        # writer instead (unthrottled replays, where nothing is real time)
+        if surface.get_size() != self.size:
+            self.skipped += 1
+            return False
+        now = time.perf_counter()
+        if self.started is None:
+            self.started = now
+        number = self.frames
+        self.frames += 1
+        try:
+            spare = self.free.get(wait)
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        spare.blit(surface, (0, 0))
+        self.work.put((spare, number, now - self.started, tick))
+        return True
+
+    def write_frames(self):
+        # Background thread: RGB into the frame's slot, then its index entry,
+        # then the count that makes it visible
+        view = memoryview(self.map)
+        while True:
+            job = self.work.get()
+            if job is None:
+                break
+            spare, number, seconds, tick = job
+            slot = number % self.capacity
+            start = self.data_start + slot * self.frame_size
+            view[start:start + self.frame_size] = pygame.image.tobytes(spare, "RGB")
+            self.free.put(spare)
+            entry = HEADER.size + slot * ENTRY.size
+            view[entry:entry + ENTRY.size] = ENTRY.pack(number, seconds, tick)
+            view[COUNT_OFFSET:HEADER.size] = struct.pack("<Q", number + 1)
+        view.release()
+
+    def close(self):
+        if self.map.closed:
+            return
+        self.work.put(None)
+        self.thread.join()
+        self.map[COUNT_OFFSET:HEADER.size] = struct.pack("<Q", self.frames)
+        self.map.flush()
+        self.map.close()
+
+
+# path -> FrameRecorder
+recorders = {}
+
+
+def shared_recorder(path, surface, fps=60, capacity=DEFAULT_CAPACITY):
+    recorder = recorders.get(path)
+    if recorder is None:
+        recorder = recorders[path] = FrameRecorder(path, surface, fps, capacity)
+        atexit.register(recorder.close)
+    return recorder
+
+
+class FrameRing:
+    # Read side of a capture file (the exporter below)
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, width, height, capacity, fps, count = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a frame capture file")
+        self.size = (width, height)
+        self.capacity = capacity
+        self.fps = fps
+        self.count = count
+        self.frame_size = width * height * 3
+        self.data_start = frame_offset(capacity)
+
+    def entries(self):
+        # (frame number, seconds, tick, slot) of the frames still in the
+        # ring, oldest first
+        first = max(0, self.count - self.capacity)
+        for number in range(first, self.count):
+            slot = number % self.capacity
+            stored, seconds, tick = ENTRY.unpack_from(self.map, HEADER.size + slot * ENTRY.size)
+            if stored == number:
+                yield number, seconds, tick, slot
+
+    def pixels(self, slot):
+        start = self.data_start + slot * self.frame_size
+        return self.map[start:start + self.frame_size]
+
+    def close(self):
+        self.map.close()
+
+
+def export(ring_path, out_path, raw=False):
+    ring = FrameRing(ring_path)
+    entries = list(ring.entries())
+    if not entries:
+        ring.close()
+        return "no frames"
+    first, last = entries[0][0], entries[-1][0]
+    trailing = ring.count - 1 - last  # dropped after the last one written
+    dropped = last - first + 1 - len(entries) + trailing
+    if raw:
+        with open(out_path, "wb") as out:
+            previous = None
+            for number, _, _, slot in entries:
+                pixels = ring.pixels(slot)
+                if previous is not None:
+                    for _ in range(number - previous_number - 1):
+                        out.write(previous)  # dropped: hold the frame before
+                out.write(pixels)
+                previous, previous_number = pixels, number
+            for _ in range(trailing):
+                out.write(previous)
+    else:
+        os.makedirs(out_path, exist_ok=True)
+        for number, _, _, slot in entries:
+            frame = pygame.image.frombuffer(ring.pixels(slot), ring.size, "RGB")
+            pygame.image.save(frame, os.path.join(out_path, f"frame_{number:06d}.png"))
+    ring.close()
+
+    # Real time between frames (a replay runs unthrottled; the video
+    # plays at the game's own FPS either way)
+    span = entries[-1][1] - entries[0][1]
+    captured = f", {(len(entries) - 1) / span:.1f} FPS while capturing" if span > 0 else ""
+    width, height = ring.size
+    summary = (f"{len(entries)} frames (#{first}..#{last}), {width}x{height}, "
+               f"{ring.fps} FPS game{captured}")
+    if dropped:
+        summary += f"\n  {dropped} frames dropped while capturing"
+        if raw:
+            summary += " (the frame before each is repeated in the video)"
+    if raw:
+        summary += (f"\n  ffmpeg -f rawvideo -pix_fmt rgb24 -s {width}x{height} -r {ring.fps} "
+                    f"-i {out_path} video.mp4")
+    return summary
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python3 -m common.capture",
+                                     description="Export a frame capture ring (GAMES_CAPTURE)")
+    parser.add_argument("ring", help="capture file")
+    parser.add_argument("out", help="directory for PNGs, or the raw video file with --raw")
+    parser.add_argument("--raw", action="store_true", help="write raw rgb24 video instead of PNGs")
+    args = parser.parse_args(argv)
+    print(export(args.ring, args.out, args.raw))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
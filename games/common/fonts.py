@@ -0,0 +1,92 @@
+import json
+import logging
+import os
+import tempfile
+
+import pygame
+
+# Font loading without the system font scan.
+#
+# pygame.font.SysFont() builds a table of every installed font the first
+# time it is called (fc-list on Linux, the registry on Windows) before it
+# can look up one name, and that happens before the first frame. Fonts
+# from this manager are resolved on first use instead, and the resolved
+# path (or "not installed") is kept in a small JSON file, so only the
+# first run on a machine ever scans. A font that isn't installed falls back
+# to pygame's bundled default, as SysFont does. Font objects are shared per
+# (name, size) within the process. GAMES_FONT_CACHE=path overrides the
+# default ~/.pygame_fonts.json.
+#
+#     score_font = fonts.get("comicsansms", 30)
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".pygame_fonts.json")
+
+
+class FontManager:
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path or os.environ.get("GAMES_FONT_CACHE") or DEFAULT_CACHE_PATH
+        self.paths = None   # font name -> file path, or None when not installed
+        self.fonts = {}     # (name, size) -> pygame.font.Font
+        self.scans = 0      # system font lookups done by this process
+
+    def get(self, name, size):
+        # name=None is pygame's bundled default font
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.Font(self.path(name) if name else None, size)
+            self.fonts[key] = font
+        return font
+
+    def path(self, name):
+        if self.paths is None:
+            self.paths = self.read()
+        key = name.lower()
+        if key in self.paths:
+            path = self.paths[key]
+            if path is None or os.path.exists(path):
+                return path
+        # Unknown here (or the font file moved): one real lookup, remembered
+        path = pygame.font.match_font(name)
+        self.scans += 1
+        self.paths[key] = path
+        self.write()
+        return path
+
+    def read(self):
+        try:
+            with open(self.cache_path) as f:
+                paths = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return paths if isinstance(paths, dict) else {}
+
+    def write(self):
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".fonts-", suffix=".tmp")
+        except OSError as e:
+            log.warning("could not save the font cache %s: %s", self.cache_path, e)
+            return
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.paths, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            os.unlink(tmp_path)
+            log.warning("could not save the font cache %s: %s", self.cache_path, e)
+
+    def clear(self):
+        # Forget the resolved paths (in memory and on disk), e.g. after
+        # installing fonts
+        self.paths = {}
+        self.fonts.clear()
+        self.write()
+
+
+# Shared by every game in the process
+fonts = FontManager()
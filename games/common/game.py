@@ -0,0 +1,46 @@
+import pygame
+
+from common import replay
+
+# Entry points shared by the games.
+#
+# Every game module defines a Game class and can be imported without
+# starting anything:
+#
+#     game = Game(screen)      # new round on an existing display
+#     while game.step():       # input + one frame of game logic
+#         game.render()        # draw and present that frame
+#         game.session.tick(clock, game.fps, game.state())
+#
+# step() returns False once the game is over (quit, window closed, Esc).
+# state() is the replay checkpoint tuple for the frame, or None. Run
+# directly, a game script calls main(Game); launcher.py keeps one display
+# and plays any of them in turn. Either way the driver opens the display:
+# a game that needs another size for a stress preset lists it in
+# `preset_sizes` rather than calling set_mode() itself.
+
+
+def display_size(game_class):
+    return getattr(game_class, "preset_sizes", {}).get(replay.preset(), game_class.size)
+
+
+def open_display(game_class, screen=None):
+    # Reuses `screen` when it is already the right size
+    size = display_size(game_class)
+    if screen is None or screen.get_size() != size:
+        screen = pygame.display.set_mode(size)
+    pygame.display.set_caption(game_class.caption)
+    return screen
+
+
+def run(game, clock=None):
+    clock = clock or pygame.time.Clock()
+    while game.step():
+        game.render()
+        game.session.tick(clock, game.fps, game.state())
+
+
+def main(game_class):
+    pygame.init()
+    run(game_class(open_display(game_class)))
+    pygame.quit()
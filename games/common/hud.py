@@ -0,0 +1,75 @@
+from collections import OrderedDict
+
+import pygame
+
+# Cached text for score/HUD overlays.
+#
+# font.render() rasterizes through SDL_ttf every call, even when the string
+# is the same as last frame. TextCache keeps rendered surfaces keyed on
+# (font, text, color) with LRU eviction. DigitAtlas renders 0-9 once and
+# composes numbers by blitting those glyphs, so a changing score never goes
+# back to SDL_ttf. Hud strings the two together for lines like "Score: 12".
+
+
+class TextCache:
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surfaces = self.surfaces
+        surface = surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, antialias, color)
+            surfaces[key] = surface
+            if len(surfaces) > self.capacity:
+                surfaces.popitem(last=False)
+        else:
+            surfaces.move_to_end(key)
+        return surface
+
+
+# Shared by every game in the process
+text_cache = TextCache()
+
+
+class DigitAtlas:
+    def __init__(self, font, color, antialias=True):
+        self.glyphs = {ch: font.render(ch, antialias, color) for ch in "0123456789-"}
+        self.height = self.glyphs["0"].get_height()
+
+    def size(self, value):
+        glyphs = self.glyphs
+        return sum(glyphs[ch].get_width() for ch in str(value)), self.height
+
+    def blit(self, surface, value, pos):
+        glyphs = self.glyphs
+        x, y = pos
+        start = x
+        for ch in str(value):
+            glyph = glyphs[ch]
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+        return pygame.Rect(start, y, x - start, self.height)
+
+
+class Hud:
+    def __init__(self, font, color, cache=text_cache):
+        self.font = font
+        self.color = color
+        self.cache = cache
+        self.digits = DigitAtlas(font, color)
+
+    def draw(self, surface, pos, *parts):
+        # str parts come from the text cache, int parts from the digit atlas
+        x, y = pos
+        height = 0
+        for part in parts:
+            if isinstance(part, int):
+                rect = self.digits.blit(surface, part, (x, y))
+            else:
+                rect = surface.blit(self.cache.render(self.font, part, self.color), (x, y))
+            x = rect.right
+            height = max(height, rect.height)
+        return pygame.Rect(pos[0], y, x - pos[0], height)
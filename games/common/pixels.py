@@ -0,0 +1,164 @@
+from array import array
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # observations still work, a lot slower
+    np = None
+
+# Pixel observations of a game's display, for vision-based bots.
+#
+#     observer = PixelObserver(screen, grayscale=True, downsample=4, stack=4)
+#     game.step(); game.render()
+#     frames = observer.observe()   # (4, 150, 200) uint8, oldest first
+#
+# With numpy, the surface is read through pygame.surfarray.pixels3d, a
+# view of the surface's own memory, and downsampling is a strided view of
+# that (every Nth pixel, no averaging). Grayscale is computed into
+# preallocated buffers, so the only pixels written per frame are the final
+# observation's. Without numpy the same API works on the raw surface
+# buffer in plain Python and returns memoryviews of bytes, which is fine
+# for small downsampled frames.
+#
+# Frames go into a ring buffer holding every frame twice, so the last
+# `stack` frames are always one contiguous slice of it: observe() and
+# stacked() return that slice, no copy, valid until the next observe().
+#
+# A view of the surface locks it, and a locked surface can't be blitted
+# to, so observe() drops its view before returning. pixels() hands out
+# the full-size view itself; delete it before the game draws again.
+
+GRAY_WEIGHTS = (77, 150, 29)  # ITU-R 601 luma in 1/256ths
+
+
+class PixelObserver:
+    def __init__(self, surface=None, grayscale=False, downsample=1, stack=1):
+        self.surface = surface or pygame.display.get_surface()
+        self.grayscale = grayscale
+        self.downsample = downsample
+        self.stack = stack
+        width, height = self.surface.get_size()
+        self.width = -(-width // downsample)
+        self.height = -(-height // downsample)
+        self.channels = 1 if grayscale else 3
+        frame_shape = (self.height, self.width) if grayscale else (self.height, self.width, 3)
+        self.shape = (stack,) + frame_shape
+        self.frame_size = self.width * self.height * self.channels
+        self.slots = 2 * stack if stack > 1 else 1
+        self.index = 0    # slot of the newest frame
+        self.filled = 0   # frames observed since reset()
+
+        if np is not None:
+            self.frames = np.zeros((self.slots,) + frame_shape, np.uint8)
+            if grayscale:
+                self.acc = np.zeros(frame_shape, np.uint16)
+                self.tmp = np.zeros(frame_shape, np.uint16)
+        else:
+            self.frames = array("B", bytes(self.slots * self.frame_size))
+            self.frames_view = memoryview(self.frames)
+            # Byte offsets of R, G, B inside a pixel of this surface
+            self.bytes_per_pixel = self.surface.get_bytesize()
+            self.offsets = [shift // 8 for shift in self.surface.get_shifts()[:3]]
+
+    def pixels(self):
+        # The whole surface as a (height, width, 3) view of its memory
+        # (numpy only); the surface stays locked while this array exists
+        return pygame.surfarray.pixels3d(self.surface).transpose(1, 0, 2)
+
+    def reset(self):
+        # The next frame fills the whole stack (a new episode)
+        self.filled = 0
+
+    def observe(self):
+        # Capture the surface as it is now and return stacked()
+        index = (self.index + 1) % self.stack
+        if np is not None:
+            self.capture_numpy(self.frames[index])
+        else:
+            start = index * self.frame_size
+            self.capture_python(self.frames_view[start:start + self.frame_size])
+        self.index = index
+
+        if self.slots > 1:
+            if self.filled == 0:
+                # First frame of an episode stands in for the older ones
+                for slot in range(self.slots):
+                    if slot != index:
+                        self.copy_slot(index, slot)
+            else:
+                self.copy_slot(index, index + self.stack)
+        self.filled += 1
+        return self.stacked()
+
+    def copy_slot(self, source, target):
+        if np is not None:
+            self.frames[target] = self.frames[source]
+        else:
+            size = self.frame_size
+            self.frames_view[target * size:(target + 1) * size] = self.frames_view[source * size:(source + 1) * size]
+
+    def stacked(self):
+        # The last `stack` frames, oldest first, as one slice of the ring
+        start = self.index + 1 if self.slots > 1 else 0
+        if np is not None:
+            return self.frames[start:start + self.stack]
+        return self.frames_view[start * self.frame_size:(start + self.stack) * self.frame_size]
+
+    def latest(self):
+        if np is not None:
+            return self.frames[self.index]
+        return self.frames_view[self.index * self.frame_size:(self.index + 1) * self.frame_size]
+
+    def capture_numpy(self, out):
+        step = self.downsample
+        view = src = pygame.surfarray.pixels3d(self.surface)
+        try:
+            src = view[::step, ::step].transpose(1, 0, 2)  # (height, width, 3), still a view
+            if self.grayscale:
+                acc, tmp = self.acc, self.tmp
+                red, green, blue = GRAY_WEIGHTS
+                np.multiply(src[..., 0], red, out=acc, dtype=np.uint16)
+                np.multiply(src[..., 1], green, out=tmp, dtype=np.uint16)
+                acc += tmp
+                np.multiply(src[..., 2], blue, out=tmp, dtype=np.uint16)
+                acc += tmp
+                np.right_shift(acc, 8, out=out, casting="unsafe")
+            else:
+                # One channel at a time: numpy copies these strided
+                # uint8 planes several times faster than whole pixels
+                for channel in range(3):
+                    out[..., channel] = src[..., channel]
+        finally:
+            del view, src  # unlocks the surface
+
+    def capture_python(self, out):
+        surface = self.surface
+        step = self.downsample
+        bpp = self.bytes_per_pixel
+        red, green, blue = self.offsets
+        pitch = surface.get_pitch()
+        row_bytes = surface.get_width() * bpp
+        width = self.width
+        buffer = surface.get_buffer()
+        try:
+            raw = memoryview(buffer)
+            stride = bpp * step
+            pos = 0
+            for y in range(0, surface.get_height(), step):
+                row = y * pitch
+                reds = raw[row + red:row + row_bytes:stride]
+                greens = raw[row + green:row + row_bytes:stride]
+                blues = raw[row + blue:row + row_bytes:stride]
+                if self.grayscale:
+                    out[pos:pos + width] = bytes((77 * r + 150 * g + 29 * b) >> 8
+                                                 for r, g, b in zip(reds, greens, blues))
+                    pos += width
+                else:
+                    out[pos:pos + 3 * width:3] = reds
+                    out[pos + 1:pos + 3 * width:3] = greens
+                    out[pos + 2:pos + 3 * width:3] = blues
+                    pos += 3 * width
+            raw.release()
+        finally:
+            del buffer  # unlocks the surface
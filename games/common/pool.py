@@ -0,0 +1,124 @@
+from array import array
+
+# Fixed-capacity projectile pool.
+#
+# Projectiles are stored struct-of-arrays style: one flat array per field
+# (x, y, vy) instead of one pygame.Rect per shot. Live projectiles are kept
+# packed into slots [0, count), so update() and drawing run over contiguous
+# arrays in one pass; killing one swaps the last live projectile into its
+# slot. Nothing is allocated after the pool is created.
+#
+# Because slots move, a projectile is named by a handle instead: spawn()
+# returns one and kill() takes one, and it stays valid until that
+# projectile dies. ids maps slot -> handle and slot maps handle -> slot,
+# -1 for a dead handle (the alive column). The handles past count in ids
+# are the free list, so spawn and kill are O(1) swaps, as in FreeCells
+# (snake_sim.py).
+#
+#     handle = pool.spawn(x, y, vy)
+#     for i in range(pool.count):      # slots, e.g. for collision tests
+#         ... pool.rect(i) ... pool.ids[i] ...
+#     pool.kill(handle)
+
+
+class ProjectilePool:
+    def __init__(self, capacity, width, height):
+        self.capacity = capacity
+        self.width = width
+        self.height = height
+        self.x = array("f", bytes(4 * capacity))
+        self.y = array("f", bytes(4 * capacity))
+        self.vy = array("f", bytes(4 * capacity))
+        self.ids = array("i", range(capacity))   # slot -> handle; free handles after count
+        self.slot = array("i", [-1] * capacity)  # handle -> slot, -1 when dead
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def alive(self, handle):
+        return self.slot[handle] >= 0
+
+    def clear(self):
+        slot = self.slot
+        for i in range(self.count):
+            slot[self.ids[i]] = -1
+        self.count = 0
+
+    def spawn(self, x, y, vy):
+        # Returns the new projectile's handle, or None (dropping the shot)
+        # when the pool is full
+        i = self.count
+        if i == self.capacity:
+            return None
+        self.x[i] = x
+        self.y[i] = y
+        self.vy[i] = vy
+        handle = self.ids[i]
+        self.slot[handle] = i
+        self.count = i + 1
+        return handle
+
+    def remove(self, i):
+        # Drops the projectile in slot i; the last live one moves into it
+        ids, slot = self.ids, self.slot
+        last = self.count - 1
+        handle = ids[i]
+        if i != last:
+            self.x[i] = self.x[last]
+            self.y[i] = self.y[last]
+            self.vy[i] = self.vy[last]
+            moved = ids[last]
+            ids[i] = moved
+            slot[moved] = i
+            ids[last] = handle
+        slot[handle] = -1
+        self.count = last
+
+    def kill(self, handle):
+        i = self.slot[handle]
+        if i >= 0:
+            self.remove(i)
+
+    def kill_many(self, handles):
+        # Last slot first, so the packed order (which decides collision
+        # order, and so replays) doesn't depend on the order handles come in
+        slot = self.slot
+        for i in sorted({slot[handle] for handle in handles}, reverse=True):
+            if i >= 0:
+                self.remove(i)
+
+    def update(self, top, bottom):
+        # Move every projectile and drop the ones outside [top, bottom]
+        y, vy = self.y, self.vy
+        i = 0
+        while i < self.count:
+            new_y = y[i] + vy[i]
+            if top <= new_y <= bottom:
+                y[i] = new_y
+                i += 1
+            else:
+                self.remove(i)
+
+    def overlapping(self, rect):
+        # Handles of the projectiles overlapping rect (colliderect's rule),
+        # in one pass over the arrays: cheaper than hashing every projectile
+        # to run a single query
+        x, y, w, h = rect
+        right, bottom = x + w, y + h
+        top, left = y - self.height, x - self.width  # strict, like colliderect
+        xs, ys, ids = self.x, self.y, self.ids
+        return [ids[i] for i in range(self.count)
+                if top < ys[i] < bottom and left < xs[i] < right]
+
+    def rect(self, i):
+        return (self.x[i], self.y[i], self.width, self.height)
+
+    def positions(self):
+        # Top-left corners of the live projectiles (for Renderer.blits)
+        count = self.count
+        return zip(self.x[:count], self.y[:count])
+
+    def rects(self):
+        x, y, w, h = self.x, self.y, self.width, self.height
+        return [(x[i], y[i], w, h) for i in range(self.count)]
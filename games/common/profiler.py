@@ -0,0 +1,151 @@
+import atexit
+import csv
+import json
+import os
+import sys
+import time
+from array import array
+
+import pygame
+
+# Per-phase frame profiler.
+#
+# A main loop brackets each frame with begin() / end() and calls
+# mark(phase) at the end of every phase; time since the previous mark is
+# added to that phase, so a phase may be marked more than once per frame.
+# The last `capacity` frames are kept in one ring buffer per phase.
+#
+#   F3                      toggles the p50/p99 overlay (or start with --profile)
+#   GAMES_PROFILE_OUT=path  dumps every buffered frame on exit (.csv or .json)
+
+PHASES = ("events", "movement", "collision", "spawning", "drawing", "flip")
+BUDGET_MS = 1000 / 60
+
+# out path -> the newest profiler writing to it, dumped by one exit hook
+exit_dumps = {}
+
+
+def dump_at_exit():
+    for out_path, profiler in exit_dumps.items():
+        profiler.dump(out_path)
+
+
+def percentile(samples, p):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+class FrameProfiler:
+    def __init__(self, phases=PHASES, capacity=600, out_path=None):
+        self.phases = tuple(phases)
+        self.index = {name: i for i, name in enumerate(self.phases)}
+        self.capacity = capacity
+        self.samples = [array("d", bytes(8 * capacity)) for _ in self.phases]
+        self.current = [0.0] * len(self.phases)
+        self.slot = 0
+        self.frames = 0
+        self.last = time.perf_counter()
+
+        self.overlay = "--profile" in sys.argv
+        self.toggle_held = False
+        self.overlay_surface = None
+
+        out_path = out_path or os.environ.get("GAMES_PROFILE_OUT")
+        if out_path:
+            if not exit_dumps:
+                atexit.register(dump_at_exit)
+            exit_dumps[out_path] = self
+
+    def begin(self):
+        current = self.current
+        for i in range(len(current)):
+            current[i] = 0.0
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.current[self.index[phase]] += now - self.last
+        self.last = now
+
+    def end(self):
+        slot = self.slot
+        for column, value in zip(self.samples, self.current):
+            column[slot] = value
+        self.slot = (slot + 1) % self.capacity
+        self.frames += 1
+
+    # Reporting
+
+    def column(self, phase):
+        # Buffered samples for one phase, oldest first, in milliseconds
+        column = self.samples[self.index[phase]]
+        count = min(self.frames, self.capacity)
+        start = (self.slot - count) % self.capacity
+        return [column[(start + i) % self.capacity] * 1000 for i in range(count)]
+
+    def summary(self):
+        stats = {}
+        totals = None
+        for phase in self.phases:
+            values = self.column(phase)
+            totals = values if totals is None else [a + b for a, b in zip(totals, values)]
+            stats[phase] = {"p50": percentile(values, 50), "p99": percentile(values, 99),
+                            "max": max(values, default=0.0)}
+        totals = totals or []
+        stats["total"] = {"p50": percentile(totals, 50), "p99": percentile(totals, 99),
+                          "max": max(totals, default=0.0)}
+        return stats
+
+    def dump(self, path):
+        columns = [self.column(phase) for phase in self.phases]
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"frames": self.frames, "budget_ms": BUDGET_MS, "summary": self.summary(),
+                           "samples_ms": dict(zip(self.phases, columns))}, f, indent=2)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(("frame",) + self.phases)
+                first = self.frames - len(columns[0])
+                for i, row in enumerate(zip(*columns)):
+                    writer.writerow([first + i] + [f"{value:.4f}" for value in row])
+
+    # Overlay
+
+    def poll_toggle(self):
+        held = pygame.key.get_pressed()[pygame.K_F3]
+        if held and not self.toggle_held:
+            self.overlay = not self.overlay
+        self.toggle_held = held
+
+    def draw(self, renderer, font, pos=None):
+        self.poll_toggle()
+        if not self.overlay:
+            return
+        # Text is re-rendered twice a second, not every frame
+        if self.overlay_surface is None or self.frames % 30 == 0:
+            self.overlay_surface = self.render_overlay(font)
+        surface = self.overlay_surface
+        if pos is None:
+            pos = (renderer.screen.get_width() - surface.get_width() - 10, 50)
+        renderer.blit(surface, pos)
+
+    def render_overlay(self, font):
+        lines = [f"{'phase':10}{'p50':>7}{'p99':>7}  ms"]
+        for phase, stats in self.summary().items():
+            lines.append(f"{phase:10}{stats['p50']:7.2f}{stats['p99']:7.2f}")
+        rendered = []
+        for line in lines:
+            over = line.startswith("total") and float(line.split()[2]) > BUDGET_MS
+            rendered.append(font.render(line, True, (255, 80, 80) if over else (255, 255, 255)))
+        width = max(surface.get_width() for surface in rendered) + 10
+        height = sum(surface.get_height() for surface in rendered) + 10
+        panel = pygame.Surface((width, height))
+        panel.set_alpha(200)
+        y = 5
+        for surface in rendered:
+            panel.blit(surface, (5, y))
+            y += surface.get_height()
+        return panel
@@ -0,0 +1,133 @@
+import os
+import sys
+
+import pygame
+
+# Drawing front-end shared by the games.
+#
+# Full mode (the default) is the classic loop: fill the screen, draw
+# everything, flip. Dirty mode is opt-in (`--dirty` on the command line or
+# GAMES_DIRTY=1): every draw call records the rect it touched, begin() only
+# erases what was drawn last frame, and present() hands just those regions
+# to pygame.display.update(rects). GAMES_NO_RENDER=1 turns drawing off
+# entirely (used for headless replays).
+#
+# Many same-looking entities (snake cells, invaders, bullets, pipes) go
+# through sprite() + blits(): the sprite is rendered and convert()-ed to
+# the screen's pixel format once, and a whole frame's worth of them is
+# submitted as one Surface.blits() batch.
+
+SPRITE_KEY = (255, 0, 255)  # colorkey for the transparent corners of ellipses
+
+# Shared by every Renderer in the process, so a game started again from
+# launcher.py finds its sprites already converted
+sprite_cache = {}
+
+
+def dirty_requested():
+    return "--dirty" in sys.argv or os.environ.get("GAMES_DIRTY") == "1"
+
+
+class Renderer:
+    def __init__(self, screen, background, dirty=None):
+        self.screen = screen
+        self.background = background
+        self.dirty = dirty_requested() if dirty is None else dirty
+        self.enabled = os.environ.get("GAMES_NO_RENDER") != "1"
+        self.full = True  # next frame repaints the whole screen
+        self.previous = []
+        self.drawn = []
+        self.erased = []
+        self.sprites = sprite_cache
+
+    def invalidate(self):
+        self.full = True
+
+    @property
+    def incremental(self):
+        return self.dirty and not self.full
+
+    def begin(self):
+        # Sprite-style frame: clear what the last frame drew, then redraw
+        if not self.enabled:
+            return
+        if self.incremental:
+            fill, background = self.screen.fill, self.background
+            for rect in self.previous:
+                fill(background, rect)
+            self.erased.extend(self.previous)
+        else:
+            self.screen.fill(self.background)
+
+    def erase(self, rect):
+        if not self.enabled:
+            return
+        self.erased.append(self.screen.fill(self.background, rect))
+
+    def mark(self, rect):
+        if not self.enabled:
+            return
+        self.drawn.append(pygame.Rect(rect))
+
+    def rect(self, color, rect, width=0):
+        if not self.enabled:
+            return
+        self.drawn.append(pygame.draw.rect(self.screen, color, rect, width))
+
+    def ellipse(self, color, rect, width=0):
+        if not self.enabled:
+            return
+        self.drawn.append(pygame.draw.ellipse(self.screen, color, rect, width))
+
+    def circle(self, color, center, radius, width=0):
+        if not self.enabled:
+            return
+        self.drawn.append(pygame.draw.circle(self.screen, color, center, radius, width))
+
+    def aaline(self, color, start, end):
+        if not self.enabled:
+            return
+        self.drawn.append(pygame.draw.aaline(self.screen, color, start, end))
+
+    def blit(self, surface, pos):
+        if not self.enabled:
+            return
+        self.drawn.append(self.screen.blit(surface, pos))
+
+    def sprite(self, color, size, shape="rect"):
+        # Solid rect or ellipse of `size`, cached and in the screen's format
+        key = (color, tuple(size), shape, self.screen.get_bitsize(), self.screen.get_masks())
+        surface = self.sprites.get(key)
+        if surface is None:
+            surface = pygame.Surface(size).convert(self.screen)
+            if shape == "ellipse":
+                surface.fill(SPRITE_KEY)
+                surface.set_colorkey(SPRITE_KEY)
+                pygame.draw.ellipse(surface, color, surface.get_rect())
+            else:
+                surface.fill(color)
+            self.sprites[key] = surface
+        return surface
+
+    def blits(self, surface, positions):
+        # One Surface.blits() call for `surface` at every position; rects
+        # are only collected when dirty mode needs them
+        if not self.enabled:
+            return
+        batch = ((surface, pos) for pos in positions)
+        if self.dirty:
+            self.drawn.extend(self.screen.blits(batch))
+        else:
+            self.screen.blits(batch, False)
+
+    def present(self):
+        if not self.enabled:
+            return
+        if self.incremental:
+            pygame.display.update(self.erased + self.drawn)
+        else:
+            pygame.display.flip()
+            self.full = False
+        self.previous = self.drawn
+        self.drawn = []
+        self.erased = []
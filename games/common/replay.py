@@ -0,0 +1,358 @@
+import atexit
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+
+import pygame
+
+# Deterministic input recording and replay.
+#
+# A game creates one Session when it starts and routes its input
+# and frame pacing through it:
+#
+#     session = replay.Session(__file__, [pygame.K_LEFT, pygame.K_RIGHT])
+#     for event in session.events():      # instead of pygame.event.get()
+#     keys = session.pressed()            # instead of pygame.key.get_pressed()
+#     session.tick(clock, 60, state)      # instead of clock.tick(60)
+#
+# The session seeds `random` and, depending on the environment, records the
+# per-tick input to a compact binary log (GAMES_RECORD=path) or plays a log
+# back without throttling (GAMES_REPLAY=path). With GAMES_VERIFY_EVERY=N a
+# CRC of the game's state tuple is stored every N ticks while recording and
+# checked while replaying. GAMES_SEED fixes the seed for a normal session.
+# GAMES_BENCH_TICKS=N swaps real input for seeded scripted presses of
+# `script_keys` (default: all keys) and runs N unthrottled ticks; see
+# common.bench. GAMES_CAPTURE=path captures every frame into a ring file
+# (see common.capture). GAMES_PRESET names a stress preset a game may apply (a
+# game can pass its own default, e.g. from a command-line flag; either way
+# it is recorded, so the replay runs with it too).
+#
+# Replay a log from the games/ directory with:
+#
+#     python3 -m common.replay session.rec [--render]
+#
+# Log format (little-endian):
+#   header  b"GREC", version u8, seed u64, verify_every u32,
+#           game path (u8 length + utf-8), key count u8, keys (u32 each),
+#           preset (u8 length + utf-8, empty for none)
+#   body    one tag byte per record:
+#           00nnnnnn            n+1 ticks without input
+#           01nnnnnn e*n        one tick with n input events (n = 63 means a
+#                               u16 count follows); each event byte is
+#                               (kind << 6) | key index, kind 0=down 1=up 2=quit
+#           10000000 crc u32    state checkpoint for the tick just finished
+#           11111111            end of log
+
+MAGIC = b"GREC"
+VERSION = 2
+
+IDLE = 0x00
+EVENTS = 0x40
+CHECKPOINT = 0x80
+END = 0xFF
+
+KEY_DOWN = 0
+KEY_UP = 1
+QUIT = 2
+
+GAMES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# record path -> the Session recording to it, closed by one exit hook
+recordings = {}
+
+
+def close_recordings():
+    for session in recordings.values():
+        session.close()
+
+
+class ReplayMismatch(RuntimeError):
+    pass
+
+
+def state_hash(state):
+    return zlib.crc32(repr(state).encode())
+
+
+class KeyState:
+    # Held keys, tracked from the session's own KEYDOWN/KEYUP stream so that
+    # recording and replay see exactly the same thing
+    def __init__(self):
+        self.held = set()
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+class Session:
+    def __init__(self, game_file, keys, script_keys=None, preset=None):
+        self.keys = list(keys)
+        self.key_index = {key: i for i, key in enumerate(self.keys)}
+        self.ticks = 0
+        self.checkpoints = 0
+        self.key_state = KeyState()
+        self.started = time.perf_counter()
+
+        self.log = None
+        self.recording = False
+        self.replaying = False
+        self.verify_every = int(os.environ.get("GAMES_VERIFY_EVERY", "0"))
+        self.idle_run = 0
+        self.pending_idle = 0
+        self.bench = None
+        self.window_closed = False  # the player closed the window (not just Esc)
+        self.preset = os.environ.get("GAMES_PRESET") or preset
+        self.capture_path = os.environ.get("GAMES_CAPTURE")
+
+        replay_path = os.environ.get("GAMES_REPLAY")
+        record_path = os.environ.get("GAMES_RECORD")
+        if replay_path:
+            self.replaying = True
+            self.log = open(replay_path, "rb")
+            self.read_header(os.path.basename(game_file))
+        else:
+            seed = os.environ.get("GAMES_SEED")
+            self.seed = int(seed) if seed else random.getrandbits(63)
+            if record_path:
+                previous = recordings.get(record_path)
+                if previous is not None:
+                    previous.close()  # the game before this one (launcher.py)
+                elif not recordings:
+                    atexit.register(close_recordings)
+                recordings[record_path] = self
+                self.recording = True
+                self.log = open(record_path, "wb")
+                self.write_header(os.path.relpath(os.path.abspath(game_file), GAMES_DIR))
+
+        random.seed(self.seed)
+
+        bench_ticks = os.environ.get("GAMES_BENCH_TICKS")
+        if bench_ticks and not self.replaying:
+            from common.bench import BenchDriver
+            self.bench = BenchDriver(os.path.basename(game_file),
+                                     self.keys if script_keys is None else script_keys,
+                                     self.seed, int(bench_ticks), self.preset,
+                                     os.environ.get("GAMES_BENCH_OUT"))
+
+    # Header
+
+    def write_header(self, game_path):
+        path = game_path.replace(os.sep, "/").encode()
+        self.log.write(MAGIC + struct.pack("<BQI", VERSION, self.seed, self.verify_every))
+        self.log.write(struct.pack("<B", len(path)) + path)
+        self.log.write(struct.pack("<B", len(self.keys)))
+        self.log.write(struct.pack(f"<{len(self.keys)}I", *self.keys))
+        preset = (self.preset or "").encode()
+        self.log.write(struct.pack("<B", len(preset)) + preset)
+
+    def read_header(self, game_name):
+        header = read_header(self.log)
+        if os.path.basename(header["game"]) != game_name:
+            raise ReplayMismatch(f"log was recorded for {header['game']}, not {game_name}")
+        if header["keys"] != self.keys:
+            raise ReplayMismatch("log was recorded with a different key set")
+        self.seed = header["seed"]
+        self.verify_every = header["verify_every"]
+        self.preset = header["preset"]
+
+    # Input
+
+    def events(self):
+        self.ticks += 1
+        if self.replaying:
+            events = self.read_tick()
+        elif self.bench:
+            pygame.event.pump()
+            events = self.bench.events()
+            if self.recording:
+                self.write_tick(events)
+        else:
+            events = []
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.window_closed = True
+                    events.append(event)
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    # Esc leaves the game (back to the launcher menu)
+                    events.append(pygame.event.Event(pygame.QUIT))
+                elif event.type in (pygame.KEYDOWN, pygame.KEYUP) and event.key in self.key_index:
+                    events.append(event)
+            if self.recording:
+                self.write_tick(events)
+
+        held = self.key_state.held
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                held.add(event.key)
+            elif event.type == pygame.KEYUP:
+                held.discard(event.key)
+        return events
+
+    def pressed(self):
+        if self.recording or self.replaying or self.bench:
+            return self.key_state
+        return pygame.key.get_pressed()
+
+    def write_tick(self, events):
+        if not events:
+            self.idle_run += 1
+            if self.idle_run == 64:
+                self.flush_idle()
+            return
+        self.flush_idle()
+        count = len(events)
+        if count < 63:
+            self.log.write(bytes([EVENTS | count]))
+        else:
+            self.log.write(struct.pack("<BH", EVENTS | 63, count))
+        self.log.write(bytes(self.encode(event) for event in events))
+
+    def flush_idle(self):
+        if self.idle_run:
+            self.log.write(bytes([IDLE | (self.idle_run - 1)]))
+            self.idle_run = 0
+
+    def encode(self, event):
+        if event.type == pygame.QUIT:
+            return QUIT << 6
+        kind = KEY_DOWN if event.type == pygame.KEYDOWN else KEY_UP
+        return (kind << 6) | self.key_index[event.key]
+
+    def read_tick(self):
+        pygame.event.pump()
+        if self.pending_idle:
+            self.pending_idle -= 1
+            return []
+        tag = self.log.read(1)
+        if not tag or tag[0] == END:
+            self.finish()
+        tag = tag[0]
+        if tag & 0xC0 == IDLE:
+            self.pending_idle = tag & 0x3F
+            return []
+        if tag & 0xC0 == EVENTS:
+            count = tag & 0x3F
+            if count == 63:
+                count, = struct.unpack("<H", self.log.read(2))
+            events = []
+            for byte in self.log.read(count):
+                kind, index = byte >> 6, byte & 0x3F
+                if kind == QUIT:
+                    events.append(pygame.event.Event(pygame.QUIT))
+                elif kind == KEY_DOWN:
+                    events.append(pygame.event.Event(pygame.KEYDOWN, key=self.keys[index]))
+                else:
+                    events.append(pygame.event.Event(pygame.KEYUP, key=self.keys[index]))
+            return events
+        raise ReplayMismatch(f"unexpected record 0x{tag:02x} at tick {self.ticks}")
+
+    # Frame pacing and verification
+
+    def tick(self, clock, fps, state=None):
+        if self.verify_every and state is not None and self.ticks % self.verify_every == 0:
+            crc = state_hash(state)
+            if self.recording:
+                self.flush_idle()
+                self.log.write(struct.pack("<BI", CHECKPOINT, crc))
+            elif self.replaying:
+                tag = self.log.read(1)
+                if not tag or tag[0] != CHECKPOINT or self.pending_idle:
+                    raise ReplayMismatch(f"missing checkpoint at tick {self.ticks}")
+                expected, = struct.unpack("<I", self.log.read(4))
+                if crc != expected:
+                    raise ReplayMismatch(f"state diverged at tick {self.ticks}: {state!r}")
+            self.checkpoints += 1
+
+        if self.capture_path:
+            self.capture_frame(fps)
+        if self.bench:
+            self.bench.frame()
+            return 0
+        if self.replaying:
+            return 0
+        return clock.tick(fps)
+
+    def capture_frame(self, fps):
+        screen = pygame.display.get_surface()
+        if screen is None:
+            return
+        from common import capture
+        frames = os.environ.get("GAMES_CAPTURE_FRAMES")
+        recorder = capture.shared_recorder(self.capture_path, screen, fps,
+                                           int(frames) if frames else capture.DEFAULT_CAPACITY)
+        recorder.capture(screen, self.ticks, wait=bool(self.replaying or self.bench))
+
+    def wait(self, milliseconds):
+        if not (self.replaying or self.bench):
+            pygame.time.wait(milliseconds)
+
+    def close(self):
+        if self.recording and not self.log.closed:
+            self.flush_idle()
+            self.log.write(bytes([END]))
+            self.log.close()
+
+    def finish(self):
+        elapsed = time.perf_counter() - self.started
+        print(f"replayed {self.ticks - 1} ticks in {elapsed:.2f}s "
+              f"({(self.ticks - 1) / max(elapsed, 1e-9):,.0f} ticks/s), "
+              f"{self.checkpoints} checkpoints verified")
+        self.log.close()
+        pygame.quit()
+        sys.exit(0)
+
+
+def read_header(log):
+    if log.read(4) != MAGIC:
+        raise ReplayMismatch("not a replay log")
+    version, seed, verify_every = struct.unpack("<BQI", log.read(13))
+    if version != VERSION:
+        raise ReplayMismatch(f"unsupported log version {version}")
+    game = log.read(log.read(1)[0]).decode()
+    count = log.read(1)[0]
+    keys = list(struct.unpack(f"<{count}I", log.read(4 * count)))
+    preset = log.read(log.read(1)[0]).decode() or None
+    return {"game": game, "seed": seed, "verify_every": verify_every, "keys": keys,
+            "preset": preset}
+
+
+def preset(default=None):
+    # The preset a Session created now would run with (the replay log's,
+    # when replaying), e.g. for sizing the display before the game starts
+    replay_path = os.environ.get("GAMES_REPLAY")
+    if replay_path:
+        with open(replay_path, "rb") as log:
+            return read_header(log)["preset"]
+    return os.environ.get("GAMES_PRESET") or default
+
+
+def main(argv):
+    if not argv or argv[0] in ("-h", "--help"):
+        print("usage: python3 -m common.replay LOG [--render]")
+        return 2
+    log_path = os.path.abspath(argv[0])
+    with open(log_path, "rb") as log:
+        header = read_header(log)
+
+    # Headless, and skip drawing unless asked for
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    if "--render" not in argv:
+        os.environ["GAMES_NO_RENDER"] = "1"
+    os.environ["GAMES_REPLAY"] = log_path
+    os.environ.pop("GAMES_RECORD", None)
+
+    import runpy
+    script = os.path.join(GAMES_DIR, header["game"])
+    sys.argv = [script]
+    sys.path.insert(0, os.path.dirname(script))
+    runpy.run_path(script, run_name="__main__")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
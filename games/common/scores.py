@@ -0,0 +1,169 @@
+import atexit
+import bisect
+import logging
+import os
+import pathlib
+import queue
+import sqlite3
+import threading
+import time
+
+# Score store shared by the games.
+#
+# One SQLite database (WAL journal, so several games can have it open at
+# once) holds a top-N leaderboard per game. It is read once at startup;
+# best() and top() answer from memory. submit() only updates memory and
+# queues the entry for a background writer thread, so the frame loop never
+# waits on the disk. Pending writes are flushed at exit.
+# GAMES_SCORES=path overrides the default ~/.pygame_scores.db.
+#
+# Games share one store per process (shared_store()), so starting a game
+# again from launcher.py doesn't read the database again.
+#
+#     scores = shared_store()
+#     scores.submit("snake_v2", 42)
+#     scores.best("snake_v2")
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".pygame_scores.db")
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS scores (game TEXT NOT NULL, score INTEGER NOT NULL, time REAL NOT NULL)"
+
+
+def rank_key(entry):
+    # Highest score first; on ties the earlier entry stays ahead
+    return (-entry[0], entry[1])
+
+
+class ScoreStore:
+    def __init__(self, path=None, top_n=10, read_only=False):
+        self.path = path or os.environ.get("GAMES_SCORES") or DEFAULT_PATH
+        self.top_n = top_n
+        self.read_only = read_only  # e.g. replays and benchmarks
+        self.boards = {}
+        self.lock = threading.Lock()
+        self.pending = queue.Queue()
+        self.thread = None
+        self.load()
+        atexit.register(self.close)
+
+    def connect(self):
+        if self.read_only:
+            # No journal mode change, no schema, nothing written. With no
+            # WAL file there's no writer, and immutable keeps SQLite from
+            # creating the -wal and -shm files it uses to coordinate with one
+            uri = pathlib.Path(os.path.abspath(self.path)).as_uri() + "?mode=ro"
+            if not os.path.exists(self.path + "-wal"):
+                uri += "&immutable=1"
+            return sqlite3.connect(uri, uri=True, timeout=10)
+        db = sqlite3.connect(self.path, timeout=10)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(SCHEMA)
+        return db
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return  # created by the first write
+        try:
+            db = self.connect()
+            try:
+                rows = db.execute("SELECT game, score, time FROM scores ORDER BY score DESC, time").fetchall()
+            finally:
+                db.close()
+        except sqlite3.Error as e:
+            log.warning("could not read the score database %s: %s", self.path, e)
+            return
+        for game, score, when in rows:
+            board = self.boards.setdefault(game, [])
+            if len(board) < self.top_n:
+                board.append((score, when))
+
+    # Reading (from memory)
+
+    def best(self, game):
+        board = self.boards.get(game)
+        return board[0][0] if board else 0
+
+    def top(self, game):
+        with self.lock:
+            return list(self.boards.get(game, ()))
+
+    # Writing
+
+    def submit(self, game, score):
+        # Returns the 0-based rank on the board, or None if it didn't place
+        entry = (score, time.time())
+        with self.lock:
+            board = self.boards.setdefault(game, [])
+            rank = bisect.bisect_right(board, rank_key(entry), key=rank_key)
+            if rank >= self.top_n:
+                return None
+            board.insert(rank, entry)
+            del board[self.top_n:]
+            if self.read_only:
+                return rank
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="score-writer", daemon=True)
+                self.thread.start()
+        self.pending.put((game,) + entry)
+        return rank
+
+    def flush(self):
+        # Block until everything submitted so far is on disk
+        if self.thread is not None:
+            self.pending.join()
+
+    def close(self):
+        if self.thread is not None and self.thread.is_alive():
+            self.pending.put(None)
+            self.thread.join(timeout=5)
+
+    # Background writer
+
+    def run(self):
+        db = None
+        while True:
+            item = self.pending.get()
+            # Whatever else is queued by now goes in the same transaction
+            items = [item]
+            while item is not None:
+                try:
+                    item = self.pending.get_nowait()
+                except queue.Empty:
+                    break
+                items.append(item)
+            entries = [entry for entry in items if entry is not None]
+            try:
+                if entries:
+                    db = db or self.connect()
+                    self.write(db, entries)
+            except sqlite3.Error as e:
+                log.warning("could not save scores to %s: %s", self.path, e)
+            for _ in items:
+                self.pending.task_done()
+            if len(entries) < len(items):
+                if db:
+                    db.close()
+                return
+
+    def write(self, db, entries):
+        with db:
+            db.executemany("INSERT INTO scores VALUES (?, ?, ?)", entries)
+            # Only the top N per game are ever shown, drop the rest
+            for game in {entry[0] for entry in entries}:
+                db.execute("DELETE FROM scores WHERE game = ? AND rowid NOT IN "
+                           "(SELECT rowid FROM scores WHERE game = ? ORDER BY score DESC, time LIMIT ?)",
+                           (game, game, self.top_n))
+
+
+# (path, read only) -> ScoreStore
+stores = {}
+
+
+def shared_store(read_only=False):
+    path = os.environ.get("GAMES_SCORES") or DEFAULT_PATH
+    store = stores.get((path, read_only))
+    if store is None:
+        store = stores[path, read_only] = ScoreStore(path, read_only=read_only)
+    return store
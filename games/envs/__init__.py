@@ -0,0 +1,22 @@
+# Gym-style environments around the headless game sims (no pygame needed).
+#
+#     from envs import make
+#     env = make("pong", seed=1)
+#     obs, info = env.reset()
+#     obs, reward, terminated, truncated, info = env.step(env.action_space.sample())
+#
+# See vector.py for running many of them in lockstep.
+
+from envs.bird_env import BirdEnv
+from envs.pong_env import PongEnv
+from envs.snake_env import SnakeEnv
+
+ENVS = {
+    "bird": BirdEnv,
+    "pong": PongEnv,
+    "snake": SnakeEnv,
+}
+
+
+def make(name, **kwargs):
+    return ENVS[name](**kwargs)
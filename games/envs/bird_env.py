@@ -0,0 +1,69 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bird"))
+from bird_sim import BirdSim
+from envs.spaces import Box, Discrete
+
+# Flappy Bird (bird.py) as a Gym-style environment.
+#
+# Actions: 0 = glide, 1 = flap. Observation: bird height and speed, then
+# the distance to the next pipe and its gap top and bottom, all scaled to
+# about 0..1. Reward +1 per pipe passed, -1 for crashing, which ends the
+# episode. Each episode carries on through the sim's gap sequence, so it
+# gets new pipes.
+
+
+class BirdEnv:
+    obs_size = 5
+
+    def __init__(self, seed=None, max_steps=10_000, width=400, height=600):
+        self.width = width
+        self.height = height
+        self.max_steps = max_steps
+        self.sim = BirdSim(width, height, seed=seed)
+        self.observation_space = Box(-2.0, 2.0, (self.obs_size,))
+        self.action_space = Discrete(2, seed=seed)
+        self.reset()
+
+    def reset(self, seed=None, options=None):
+        if seed is not None:
+            self.sim = BirdSim(self.width, self.height, seed=seed)
+        self.sim.reset()
+        self.steps = 0
+        self.score = 0
+        return self.observation(), {}
+
+    def advance(self, action):
+        # One tick without building an observation: (reward, terminated, truncated)
+        sim = self.sim
+        before = sim.score
+        self.steps += 1
+        if sim.step(action == 1):
+            self.score = sim.last_score
+            return sim.last_score - before - 1.0, True, False
+        self.score = sim.score
+        return float(sim.score - before), False, self.steps >= self.max_steps
+
+    def step(self, action):
+        reward, terminated, truncated = self.advance(action)
+        return self.observation(), reward, terminated, truncated, {"score": self.score}
+
+    def observe_into(self, out, offset):
+        sim = self.sim
+        height = self.height
+        dx, gap_top = self.width, height // 2 - sim.pipe_gap // 2
+        for x, top in sim.pipes():
+            if x + sim.pipe_width > sim.bird_x:
+                dx, gap_top = x - sim.bird_x, top
+                break
+        out[offset] = sim.bird_y / height
+        out[offset + 1] = sim.bird_velocity / 20
+        out[offset + 2] = dx / self.width
+        out[offset + 3] = gap_top / height
+        out[offset + 4] = (gap_top + sim.pipe_gap) / height
+
+    def observation(self):
+        out = [0.0] * self.obs_size
+        self.observe_into(out, 0)
+        return out
@@ -0,0 +1,80 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "pong"))
+from pong_sim import PongSim, NO_POINT
+from envs.spaces import Box, Discrete
+
+# Pong vs AI (pong2.py) as a Gym-style environment.
+#
+# The agent plays the right paddle against the built-in AI. Actions:
+# 0 = stay, 1 = up, 2 = down (6 pixels a tick, as with the arrow keys).
+# Observation: ball position and speed, then both paddles, scaled to about
+# 0..1. Reward +1 for a point won, -1 for a point lost; the episode ends
+# when either side reaches `points`. Serves go up or down at random.
+
+PADDLE_SPEED = 6
+SPEEDS = (0, -PADDLE_SPEED, PADDLE_SPEED)
+
+
+class PongEnv:
+    obs_size = 6
+
+    def __init__(self, seed=None, points=5, max_steps=20_000, ball_speed=(5, 5), ai_speed=5):
+        self.points = points
+        self.max_steps = max_steps
+        self.rng = random.Random(seed)
+        self.sim = PongSim(ball_speed=ball_speed, ai_speed=ai_speed)
+        self.speed_scale = max(abs(ball_speed[0]), abs(ball_speed[1]))
+        self.observation_space = Box(-1.0, 1.0, (self.obs_size,))
+        self.action_space = Discrete(3, seed=seed)
+        self.reset()
+
+    def reset(self, seed=None, options=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        self.sim.reset()
+        self.serve()
+        self.steps = 0
+        return self.observation(), {}
+
+    def serve(self):
+        sim = self.sim
+        sim.ball_vx = abs(sim.ball_vx) * self.rng.choice((-1, 1))
+        sim.ball_vy = abs(sim.ball_vy) * self.rng.choice((-1, 1))
+        sim.ai_target = sim.predict_ai_target()
+
+    @property
+    def score(self):
+        return self.sim.player_score - self.sim.opponent_score
+
+    def advance(self, action):
+        # One tick without building an observation: (reward, terminated, truncated)
+        sim = self.sim
+        self.steps += 1
+        point = sim.step(SPEEDS[action])
+        if point == NO_POINT:
+            return 0.0, False, self.steps >= self.max_steps
+        if max(sim.player_score, sim.opponent_score) >= self.points:
+            return float(point), True, False
+        self.serve()
+        return float(point), False, self.steps >= self.max_steps
+
+    def step(self, action):
+        reward, terminated, truncated = self.advance(action)
+        return self.observation(), reward, terminated, truncated, {"score": self.score}
+
+    def observe_into(self, out, offset):
+        sim = self.sim
+        out[offset] = sim.ball_x / sim.width
+        out[offset + 1] = sim.ball_y / sim.height
+        out[offset + 2] = sim.ball_vx / self.speed_scale
+        out[offset + 3] = sim.ball_vy / self.speed_scale
+        out[offset + 4] = sim.player_y / sim.height
+        out[offset + 5] = sim.opponent_y / sim.height
+
+    def observation(self):
+        out = [0.0] * self.obs_size
+        self.observe_into(out, 0)
+        return out
@@ -0,0 +1,83 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "snake"))
+from snake_sim import SnakeSim, LEFT, RIGHT, UP, DOWN
+from envs.spaces import Box, Discrete
+
+# Snake Game Plus (snake_v2.py) as a Gym-style environment.
+#
+# One step is one move of the snake. Actions: 0 = left, 1 = right, 2 = up,
+# 3 = down (a reversal is ignored, as with the arrow keys). Observation:
+# head position and direction, the offset to the food, whether each of the
+# four neighbouring cells is a wall, an obstacle or the body, and the
+# length, scaled to about -1..1. Reward is the change in length (food +1,
+# special food +3, poison -2) and -1 for dying, which ends the episode.
+
+ACTIONS = (LEFT, RIGHT, UP, DOWN)
+
+
+class SnakeEnv:
+    obs_size = 11
+
+    def __init__(self, seed=None, max_steps=5_000, width=600, height=400, block=10, obstacles=10):
+        self.max_steps = max_steps
+        self.sim = SnakeSim(width, height, block, obstacles=obstacles, seed=seed)
+        self.observation_space = Box(-1.0, 1.0, (self.obs_size,))
+        self.action_space = Discrete(4, seed=seed)
+        self.steps = 0
+
+    def reset(self, seed=None, options=None):
+        if seed is not None:
+            self.sim.rng.seed(seed)
+        self.sim.reset()
+        self.steps = 0
+        return self.observation(), {}
+
+    @property
+    def score(self):
+        return self.sim.score
+
+    def advance(self, action):
+        # One move without building an observation: (reward, terminated, truncated)
+        sim = self.sim
+        before = sim.length
+        self.steps += 1
+        dead = sim.step(ACTIONS[action])
+        # The sim notices a wall on the move after leaving the board; that
+        # move can only end the game, so the episode ends here
+        if dead or not (0 <= sim.x < sim.width and 0 <= sim.y < sim.height):
+            return sim.length - before - 1.0, True, False
+        return float(sim.length - before), False, self.steps >= self.max_steps
+
+    def step(self, action):
+        reward, terminated, truncated = self.advance(action)
+        return self.observation(), reward, terminated, truncated, {"score": self.score}
+
+    def blocked(self, x, y):
+        sim = self.sim
+        if not (0 <= x < sim.width and 0 <= y < sim.height):
+            return 1.0
+        cell = (x, y)
+        return 1.0 if cell in sim.occupied or cell in sim.obstacle_cells else 0.0
+
+    def observe_into(self, out, offset):
+        sim = self.sim
+        x, y, block = sim.x, sim.y, sim.block
+        food = sim.food or (x, y)
+        out[offset] = x / sim.width
+        out[offset + 1] = y / sim.height
+        out[offset + 2] = sim.dx / block
+        out[offset + 3] = sim.dy / block
+        out[offset + 4] = (food[0] - x) / sim.width
+        out[offset + 5] = (food[1] - y) / sim.height
+        out[offset + 6] = self.blocked(x - block, y)
+        out[offset + 7] = self.blocked(x + block, y)
+        out[offset + 8] = self.blocked(x, y - block)
+        out[offset + 9] = self.blocked(x, y + block)
+        out[offset + 10] = sim.length / (sim.cols * sim.rows)
+
+    def observation(self):
+        out = [0.0] * self.obs_size
+        self.observe_into(out, 0)
+        return out
@@ -0,0 +1,48 @@
+import random
+
+# Minimal observation/action spaces with the same names and attributes as
+# gymnasium.spaces (Box: low, high, shape; Discrete: n), so agents written
+# against Gym can read them. Kept dependency-free: observations here are
+# flat float arrays, not numpy arrays.
+
+
+class Discrete:
+    def __init__(self, n, seed=None):
+        self.n = n
+        self.shape = ()
+        self.rng = random.Random(seed)
+
+    def seed(self, seed=None):
+        self.rng.seed(seed)
+
+    def sample(self):
+        return self.rng.randrange(self.n)
+
+    def contains(self, x):
+        return isinstance(x, int) and 0 <= x < self.n
+
+    def __repr__(self):
+        return f"Discrete({self.n})"
+
+
+class Box:
+    def __init__(self, low, high, shape, seed=None):
+        self.low = low
+        self.high = high
+        self.shape = shape
+        self.size = 1
+        for n in shape:
+            self.size *= n
+        self.rng = random.Random(seed)
+
+    def seed(self, seed=None):
+        self.rng.seed(seed)
+
+    def sample(self):
+        return [self.rng.uniform(self.low, self.high) for _ in range(self.size)]
+
+    def contains(self, x):
+        return len(x) == self.size and all(self.low <= v <= self.high for v in x)
+
+    def __repr__(self):
+        return f"Box({self.low}, {self.high}, {self.shape})"
@@ -0,0 +1,223 @@
+import multiprocessing as mp
+import os
+import traceback
+from array import array
+from multiprocessing import shared_memory
+
+from envs import make
+
+# N environments stepped in lockstep.
+#
+#     envs = SyncVectorEnv("bird", 16, seed=1)        # all in this process
+#     envs = ProcVectorEnv("bird", 16, workers=4, seed=1)  # 4 worker processes
+#     obs, info = envs.reset()
+#     obs, rewards, terminated, truncated, info = envs.step(actions)
+#
+# Results come back as flat buffers that are overwritten by the next step:
+# `obs` holds num_envs * obs_size floats (env i starts at i * obs_size),
+# `rewards` one float and `terminated`/`truncated` one byte per env (numpy
+# users can wrap them with np.frombuffer without copying). An env that
+# finishes is reset at once, so its row already shows the next episode;
+# info["episodes"] lists (env index, return, length, score) of every
+# episode that ended on this step.
+#
+# ProcVectorEnv gives each worker a contiguous slice of the envs. Actions,
+# observations, rewards and flags live in one shared memory block; the
+# pipes only carry a "step" per worker and the finished episodes back.
+
+
+class EnvSlice:
+    # envs[first:first + count] of a vector env, plus their running returns
+    def __init__(self, name, first, count, seed, kwargs):
+        self.envs = [make(name, seed=None if seed is None else seed + i, **kwargs)
+                     for i in range(first, first + count)]
+        self.first = first
+        self.obs_size = self.envs[0].obs_size
+        self.returns = [0.0] * count
+        self.lengths = [0] * count
+
+    def reset(self, obs, seed=None):
+        size = self.obs_size
+        for j, env in enumerate(self.envs):
+            i = self.first + j
+            env.reset(seed=None if seed is None else seed + i)
+            env.observe_into(obs, i * size)
+            self.returns[j] = 0.0
+            self.lengths[j] = 0
+
+    def step(self, actions, obs, rewards, terminated, truncated):
+        size = self.obs_size
+        returns, lengths = self.returns, self.lengths
+        finished = []
+        for j, env in enumerate(self.envs):
+            i = self.first + j
+            reward, done, cut = env.advance(actions[i])
+            rewards[i] = reward
+            terminated[i] = done
+            truncated[i] = cut
+            returns[j] += reward
+            lengths[j] += 1
+            if done or cut:
+                finished.append((i, returns[j], lengths[j], env.score))
+                returns[j] = 0.0
+                lengths[j] = 0
+                env.reset()
+            env.observe_into(obs, i * size)
+        return finished
+
+
+class SyncVectorEnv:
+    def __init__(self, name, num_envs, seed=None, **kwargs):
+        self.num_envs = num_envs
+        self.slice = EnvSlice(name, 0, num_envs, seed, kwargs)
+        self.obs_size = self.slice.obs_size
+        self.observation_space = self.slice.envs[0].observation_space
+        self.action_space = self.slice.envs[0].action_space
+
+        self.obs = array("f", bytes(4 * num_envs * self.obs_size))
+        self.rewards = array("f", bytes(4 * num_envs))
+        self.terminated = array("B", bytes(num_envs))
+        self.truncated = array("B", bytes(num_envs))
+
+    def reset(self, seed=None, options=None):
+        self.slice.reset(self.obs, seed)
+        return self.obs, {}
+
+    def step(self, actions):
+        finished = self.slice.step(actions, self.obs, self.rewards, self.terminated, self.truncated)
+        return self.obs, self.rewards, self.terminated, self.truncated, {"episodes": finished}
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def views(buf, num_envs, obs_size):
+    # (actions, obs, rewards, terminated, truncated) over the shared block
+    n = num_envs
+    layout = (("i", 4 * n), ("f", 4 * n * obs_size), ("f", 4 * n), ("B", n), ("B", n))
+    result = []
+    start = 0
+    for fmt, size in layout:
+        result.append(buf[start:start + size].cast(fmt))
+        start += size
+    return result
+
+
+def block_size(num_envs, obs_size):
+    return 4 * num_envs * (obs_size + 2) + 2 * num_envs
+
+
+def worker(conn, shm, name, first, count, num_envs, seed, kwargs):
+    buf = memoryview(shm.buf)
+    arrays = []
+    try:
+        env_slice = EnvSlice(name, first, count, seed, kwargs)
+        arrays = views(buf, num_envs, env_slice.obs_size)
+        actions, obs, rewards, terminated, truncated = arrays
+        conn.send(("ok", None))
+        while True:
+            command, arg = conn.recv()
+            if command == "step":
+                conn.send(("ok", env_slice.step(actions, obs, rewards, terminated, truncated)))
+            elif command == "reset":
+                env_slice.reset(obs, arg)
+                conn.send(("ok", None))
+            else:
+                break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        # Only our own views: a forked worker also inherits the parent's,
+        # so the mapping itself is left to go away with the process
+        for view in arrays:
+            view.release()
+        buf.release()
+
+
+class ProcVectorEnv:
+    def __init__(self, name, num_envs, workers=None, seed=None, **kwargs):
+        self.num_envs = num_envs
+        workers = max(1, min(workers or os.cpu_count() or 1, num_envs))
+        probe = make(name, **kwargs)
+        self.obs_size = probe.obs_size
+        self.observation_space = probe.observation_space
+        self.action_space = probe.action_space
+
+        self.shm = shared_memory.SharedMemory(create=True, size=block_size(num_envs, self.obs_size))
+        self.buf = memoryview(self.shm.buf)
+        self.actions, self.obs, self.rewards, self.terminated, self.truncated = \
+            views(self.buf, num_envs, self.obs_size)
+
+        # Contiguous slices, the first `extra` workers get one env more
+        self.conns = []
+        self.processes = []
+        per_worker, extra = divmod(num_envs, workers)
+        first = 0
+        for w in range(workers):
+            count = per_worker + (w < extra)
+            parent_conn, child_conn = mp.Pipe()
+            process = mp.Process(target=worker, daemon=True,
+                                 args=(child_conn, self.shm, name, first, count, num_envs, seed, kwargs))
+            process.start()
+            child_conn.close()
+            self.conns.append(parent_conn)
+            self.processes.append(process)
+            first += count
+        self.gather()
+
+    def gather(self):
+        results = []
+        for conn in self.conns:
+            status, payload = conn.recv()
+            if status == "error":
+                self.close()
+                raise RuntimeError("environment worker failed:\n" + payload)
+            results.append(payload)
+        return results
+
+    def reset(self, seed=None, options=None):
+        for conn in self.conns:
+            conn.send(("reset", seed))
+        self.gather()
+        return self.obs, {}
+
+    def step(self, actions):
+        self.actions[:] = array("i", actions)
+        for conn in self.conns:
+            conn.send(("step", None))
+        finished = []
+        for episodes in self.gather():
+            finished.extend(episodes)
+        return self.obs, self.rewards, self.terminated, self.truncated, {"episodes": finished}
+
+    def close(self):
+        if self.shm is None:
+            return
+        for conn in self.conns:
+            try:
+                conn.send(("close", None))
+            except OSError:
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for view in (self.actions, self.obs, self.rewards, self.terminated, self.truncated, self.buf):
+            view.release()
+        self.shm.close()
+        self.shm.unlink()
+        self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,125 @@
+import importlib
+import os
+import sys
+import time
+
+import pygame
+
+GAMES_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, GAMES_DIR)
+from common import game
+from common.fonts import fonts
+from common.hud import text_cache
+
+# One-process launcher for every game.
+#
+# pygame is initialised once and the same display window is kept for the
+# whole session (resized per game). Game modules are imported on first
+# use and stay imported; fonts, rendered text and converted sprites live in
+# process-wide caches, so starting a game again costs only its own setup.
+# Esc in a game comes back here, closing the window quits.
+#
+#     python3 launcher.py
+
+# (folder, module, title)
+GAMES = [
+    ("snake", "snake", "Snake"),
+    ("snake", "snake_v2", "Snake Plus"),
+    ("pong", "pong", "Pong (2 players)"),
+    ("pong", "pong2", "Pong vs AI"),
+    ("space", "space", "Space Invaders"),
+    ("space", "space2", "Space Invaders Plus"),
+    ("bird", "bird", "Flappy Bird"),
+]
+
+MENU_SIZE = (600, 400)
+MENU_CAPTION = "Games"
+
+# Colors
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+GREY = (140, 140, 140)
+YELLOW = (255, 255, 0)
+
+
+def load(folder, module):
+    # Game scripts import their neighbours (snake_sim, formation, ...)
+    path = os.path.join(GAMES_DIR, folder)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return importlib.import_module(module)
+
+
+def start(index, screen):
+    # Returns (game, display, milliseconds from request to ready)
+    started = time.perf_counter()
+    folder, module, _ = GAMES[index]
+    game_class = load(folder, module).Game
+    screen = game.open_display(game_class, screen)
+    instance = game_class(screen)
+    return instance, screen, (time.perf_counter() - started) * 1000
+
+
+def draw_menu(screen, selected, status):
+    title_font = fonts.get(None, 48)
+    font = fonts.get(None, 32)
+    small_font = fonts.get(None, 22)
+    screen.fill(BLACK)
+    screen.blit(text_cache.render(title_font, "Games", WHITE), (40, 30))
+    for i, (_, _, title) in enumerate(GAMES):
+        color = YELLOW if i == selected else WHITE
+        screen.blit(text_cache.render(font, f"{i + 1}  {title}", color), (60, 90 + i * 36))
+    screen.blit(text_cache.render(small_font, "Up/Down + Enter or 1-7 to play, Esc in a game to come back",
+                                  GREY), (40, MENU_SIZE[1] - 50))
+    if status:
+        screen.blit(text_cache.render(small_font, status, GREY), (40, MENU_SIZE[1] - 28))
+    pygame.display.flip()
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode(MENU_SIZE)
+    pygame.display.set_caption(MENU_CAPTION)
+    clock = pygame.time.Clock()
+    selected = 0
+    status = ""
+
+    while True:
+        draw_menu(screen, selected, status)
+        choice = None
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    pygame.quit()
+                    return
+                if event.key == pygame.K_UP:
+                    selected = (selected - 1) % len(GAMES)
+                elif event.key == pygame.K_DOWN:
+                    selected = (selected + 1) % len(GAMES)
+                elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER, pygame.K_SPACE):
+                    choice = selected
+                elif pygame.K_1 <= event.key < pygame.K_1 + len(GAMES):
+                    choice = selected = event.key - pygame.K_1
+        clock.tick(30)
+        if choice is None:
+            continue
+
+        instance, screen, ready_ms = start(choice, screen)
+        print(f"{GAMES[choice][2]}: ready in {ready_ms:.1f} ms")
+        game.run(instance, clock)
+        if instance.session.window_closed:
+            pygame.quit()
+            return
+
+        # Back to the menu
+        status = f"{GAMES[choice][2]} started in {ready_ms:.1f} ms"
+        screen = pygame.display.set_mode(MENU_SIZE)
+        pygame.display.set_caption(MENU_CAPTION)
+        pygame.event.clear()
+
+
+if __name__ == "__main__":
+    main()
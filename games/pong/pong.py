@@ -1,8 +1,13 @@
 import pygame
 import random
+import sys
+import os
 
-# Initialize pygame
-pygame.init()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.fonts import fonts
+from common import game, replay
+from common.hud import DigitAtlas
+from common.render import Renderer
 
 # Screen size
 WIDTH = 800
@@ -12,13 +17,6 @@ HEIGHT = 600
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 
-# Create screen
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("🏓 Pong Game")
-
-# Clock
-clock = pygame.time.Clock()
-
 # Paddle settings
 PADDLE_WIDTH = 10
 PADDLE_HEIGHT = 100
@@ -26,59 +24,60 @@ PADDLE_SPEED = 7
 
 # Ball settings
 BALL_SIZE = 15
-ball_speed_x = 5 * random.choice((1, -1))
-ball_speed_y = 5 * random.choice((1, -1))
 
-# Fonts
-score_font = pygame.font.SysFont("comicsansms", 40)
 
-# Paddles
-left_paddle = pygame.Rect(20, HEIGHT // 2 - PADDLE_HEIGHT // 2, PADDLE_WIDTH, PADDLE_HEIGHT)
-right_paddle = pygame.Rect(WIDTH - 20 - PADDLE_WIDTH, HEIGHT // 2 - PADDLE_HEIGHT // 2, PADDLE_WIDTH, PADDLE_HEIGHT)
+class Game:
+    size = (WIDTH, HEIGHT)
+    caption = "🏓 Pong Game"
+    fps = 60
 
-# Ball
-ball = pygame.Rect(WIDTH // 2 - BALL_SIZE // 2, HEIGHT // 2 - BALL_SIZE // 2, BALL_SIZE, BALL_SIZE)
+    def __init__(self, screen):
+        self.screen = screen
 
-# Scores
-left_score = 0
-right_score = 0
+        # Input session (seeded RNG, optional recording / replay)
+        self.session = replay.Session(__file__, [pygame.K_w, pygame.K_s, pygame.K_UP, pygame.K_DOWN])
 
+        # Renderer (full frames by default, `--dirty` for dirty rectangles)
+        self.renderer = Renderer(screen, BLACK)
 
-def draw_objects():
-    screen.fill(BLACK)
-    pygame.draw.rect(screen, WHITE, left_paddle)
-    pygame.draw.rect(screen, WHITE, right_paddle)
-    pygame.draw.ellipse(screen, WHITE, ball)
-    pygame.draw.aaline(screen, WHITE, (WIDTH // 2, 0), (WIDTH // 2, HEIGHT))
+        # Ball speed
+        self.ball_speed_x = 5 * random.choice((1, -1))
+        self.ball_speed_y = 5 * random.choice((1, -1))
 
-    # Draw scores
-    left_text = score_font.render(str(left_score), True, WHITE)
-    right_text = score_font.render(str(right_score), True, WHITE)
-    screen.blit(left_text, (WIDTH // 4, 20))
-    screen.blit(right_text, (WIDTH * 3 // 4, 20))
+        # Fonts
+        self.score_digits = DigitAtlas(fonts.get("comicsansms", 40), WHITE)
 
-    pygame.display.flip()
+        # Paddles
+        self.left_paddle = pygame.Rect(20, HEIGHT // 2 - PADDLE_HEIGHT // 2, PADDLE_WIDTH, PADDLE_HEIGHT)
+        self.right_paddle = pygame.Rect(WIDTH - 20 - PADDLE_WIDTH, HEIGHT // 2 - PADDLE_HEIGHT // 2,
+                                        PADDLE_WIDTH, PADDLE_HEIGHT)
 
+        # Ball
+        self.ball = pygame.Rect(WIDTH // 2 - BALL_SIZE // 2, HEIGHT // 2 - BALL_SIZE // 2, BALL_SIZE, BALL_SIZE)
 
-def reset_ball():
-    global ball_speed_x, ball_speed_y
-    ball.center = (WIDTH // 2, HEIGHT // 2)
-    ball_speed_x *= random.choice((1, -1))
-    ball_speed_y *= random.choice((1, -1))
+        # Scores
+        self.left_score = 0
+        self.right_score = 0
 
+    def state(self):
+        return (self.ball.topleft, self.ball_speed_x, self.ball_speed_y, self.left_paddle.y,
+                self.right_paddle.y, self.left_score, self.right_score)
 
-def game_loop():
-    global ball_speed_x, ball_speed_y, left_score, right_score
+    def reset_ball(self):
+        self.ball.center = (WIDTH // 2, HEIGHT // 2)
+        self.ball_speed_x *= random.choice((1, -1))
+        self.ball_speed_y *= random.choice((1, -1))
+
+    def step(self):
+        left_paddle, right_paddle, ball = self.left_paddle, self.right_paddle, self.ball
 
-    running = True
-    while running:
         # Handle events
-        for event in pygame.event.get():
+        for event in self.session.events():
             if event.type == pygame.QUIT:
-                running = False
+                return False
 
         # Key presses
-        keys = pygame.key.get_pressed()
+        keys = self.session.pressed()
         if keys[pygame.K_w] and left_paddle.top > 0:
             left_paddle.y -= PADDLE_SPEED
         if keys[pygame.K_s] and left_paddle.bottom < HEIGHT:
@@ -89,31 +88,42 @@ def game_loop():
             right_paddle.y += PADDLE_SPEED
 
         # Ball movement
-        ball.x += ball_speed_x
-        ball.y += ball_speed_y
+        ball.x += self.ball_speed_x
+        ball.y += self.ball_speed_y
 
         # Ball collision with top/bottom
         if ball.top <= 0 or ball.bottom >= HEIGHT:
-            ball_speed_y *= -1
+            self.ball_speed_y *= -1
 
         # Ball collision with paddles
         if ball.colliderect(left_paddle) or ball.colliderect(right_paddle):
-            ball_speed_x *= -1
-            ball_speed_x *= 1.1  # speed up slightly
-            ball_speed_y *= 1.1
+            self.ball_speed_x *= -1
+            self.ball_speed_x *= 1.1  # speed up slightly
+            self.ball_speed_y *= 1.1
 
         # Scoring
         if ball.left <= 0:
-            right_score += 1
-            reset_ball()
+            self.right_score += 1
+            self.reset_ball()
         if ball.right >= WIDTH:
-            left_score += 1
-            reset_ball()
+            self.left_score += 1
+            self.reset_ball()
+        return True
+
+    def render(self):
+        renderer = self.renderer
+        renderer.begin()
+        renderer.rect(WHITE, self.left_paddle)
+        renderer.rect(WHITE, self.right_paddle)
+        renderer.ellipse(WHITE, self.ball)
+        renderer.aaline(WHITE, (WIDTH // 2, 0), (WIDTH // 2, HEIGHT))
 
-        draw_objects()
-        clock.tick(60)
+        # Draw scores
+        renderer.mark(self.score_digits.blit(self.screen, self.left_score, (WIDTH // 4, 20)))
+        renderer.mark(self.score_digits.blit(self.screen, self.right_score, (WIDTH * 3 // 4, 20)))
 
-    pygame.quit()
+        renderer.present()
 
 
-game_loop()
+if __name__ == "__main__":
+    game.main(Game)
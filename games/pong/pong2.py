@@ -1,129 +1,121 @@
 import pygame
 import sys
+import os
 
-# Initialize pygame
-pygame.init()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.fonts import fonts
+from common import game, replay
+from common.hud import DigitAtlas
+from common.profiler import FrameProfiler
+from common.render import Renderer
+from pong_sim import PongSim
 
 # Screen settings
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Pong Game")
 
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 
-# Game mode (True = AI opponent, False = 2-player mode)
-ai_enabled = True  
-
-# Paddle settings
-PADDLE_WIDTH, PADDLE_HEIGHT = 10, 100
-player = pygame.Rect(WIDTH - 20, HEIGHT // 2 - 50, PADDLE_WIDTH, PADDLE_HEIGHT)
-opponent = pygame.Rect(10, HEIGHT // 2 - 50, PADDLE_WIDTH, PADDLE_HEIGHT)
-
-# Ball settings
-BALL_SIZE = 20
-ball = pygame.Rect(WIDTH // 2 - BALL_SIZE // 2, HEIGHT // 2 - BALL_SIZE // 2, BALL_SIZE, BALL_SIZE)
-ball_speed_x = 5
-ball_speed_y = 5
-
-# Speeds
-player_speed = 0
-opponent_speed = 0
-opponent_ai_speed = 5
-
-# Score
-player_score = 0
-opponent_score = 0
-font = pygame.font.Font(None, 50)
-
-clock = pygame.time.Clock()
-
-# Game loop
-while True:
-    # Event handling
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        
-        # Keydown
-        if event.type == pygame.KEYDOWN:
-            # Player 1 (Right paddle)
-            if event.key == pygame.K_UP:
-                player_speed = -6
-            if event.key == pygame.K_DOWN:
-                player_speed = 6
-            
-            # Player 2 (Left paddle) - only in 2-player mode
-            if not ai_enabled:
-                if event.key == pygame.K_w:
-                    opponent_speed = -6
-                if event.key == pygame.K_s:
-                    opponent_speed = 6
-
-        # Keyup
-        if event.type == pygame.KEYUP:
-            # Player 1
-            if event.key in (pygame.K_UP, pygame.K_DOWN):
-                player_speed = 0
-            # Player 2
-            if not ai_enabled and event.key in (pygame.K_w, pygame.K_s):
-                opponent_speed = 0
-
-    # Move paddles
-    player.y += player_speed
-    
-    if ai_enabled:
-        # AI opponent: follow the ball
-        if opponent.centery < ball.centery:
-            opponent.y += opponent_ai_speed
-        elif opponent.centery > ball.centery:
-            opponent.y -= opponent_ai_speed
-    else:
-        # Human-controlled opponent
-        opponent.y += opponent_speed
-
-    # Keep paddles inside screen
-    player.y = max(0, min(HEIGHT - PADDLE_HEIGHT, player.y))
-    opponent.y = max(0, min(HEIGHT - PADDLE_HEIGHT, opponent.y))
-
-    # Move ball
-    ball.x += ball_speed_x
-    ball.y += ball_speed_y
-
-    # Ball collision with top/bottom
-    if ball.top <= 0 or ball.bottom >= HEIGHT:
-        ball_speed_y *= -1
-
-    # Ball collision with paddles
-    if ball.colliderect(player) or ball.colliderect(opponent):
-        ball_speed_x *= -1
-
-    # Score system
-    if ball.left <= 0:
-        player_score += 1
-        ball.center = (WIDTH // 2, HEIGHT // 2)
-        ball_speed_x *= -1
-
-    if ball.right >= WIDTH:
-        opponent_score += 1
-        ball.center = (WIDTH // 2, HEIGHT // 2)
-        ball_speed_x *= -1
-
-    # Drawing
-    screen.fill(BLACK)
-    pygame.draw.rect(screen, WHITE, player)
-    pygame.draw.rect(screen, WHITE, opponent)
-    pygame.draw.ellipse(screen, WHITE, ball)
-    pygame.draw.aaline(screen, WHITE, (WIDTH // 2, 0), (WIDTH // 2, HEIGHT))
-
-    # Render scores
-    player_text = font.render(f"{player_score}", True, WHITE)
-    opponent_text = font.render(f"{opponent_score}", True, WHITE)
-    screen.blit(player_text, (WIDTH - 50, 20))
-    screen.blit(opponent_text, (30, 20))
-
-    # Update
-    pygame.display.flip()
-    clock.tick(60)
+
+class Game:
+    size = (WIDTH, HEIGHT)
+    caption = "Pong Game"
+    fps = 60
+
+    def __init__(self, screen):
+        self.screen = screen
+
+        # Input session (seeded RNG, optional recording / replay)
+        self.session = replay.Session(__file__, [pygame.K_UP, pygame.K_DOWN, pygame.K_w, pygame.K_s])
+
+        # Simulation (paddles, ball physics, AI opponent, score).
+        # Game mode: ai_enabled True = AI opponent, False = 2-player mode
+        sim_options = {}
+        # Stress preset (benchmarks/run_benchmarks.py): a much faster ball
+        if self.session.preset == "fast_pong":
+            sim_options = {"ball_speed": (18, 14), "ai_speed": 16}
+        self.sim = PongSim(WIDTH, HEIGHT, ai_enabled=True, **sim_options)
+
+        # Paddle speeds from the keys
+        self.player_speed = 0
+        self.opponent_speed = 0
+
+        # Score
+        self.digits = DigitAtlas(fonts.get(None, 50), WHITE)
+
+        # Per-phase frame timings (F3 shows the overlay)
+        self.profiler = FrameProfiler()
+        self.small_font = fonts.get(None, 22)
+
+        # Renderer (full frames by default, `--dirty` for dirty rectangles)
+        self.renderer = Renderer(screen, BLACK)
+
+    def state(self):
+        return self.sim.state()
+
+    def step(self):
+        profiler = self.profiler
+        profiler.begin()
+        sim = self.sim
+
+        # Event handling
+        for event in self.session.events():
+            if event.type == pygame.QUIT:
+                return False
+
+            # Keydown
+            if event.type == pygame.KEYDOWN:
+                # Player 1 (Right paddle)
+                if event.key == pygame.K_UP:
+                    self.player_speed = -6
+                if event.key == pygame.K_DOWN:
+                    self.player_speed = 6
+
+                # Player 2 (Left paddle) - only in 2-player mode
+                if not sim.ai_enabled:
+                    if event.key == pygame.K_w:
+                        self.opponent_speed = -6
+                    if event.key == pygame.K_s:
+                        self.opponent_speed = 6
+
+            # Keyup
+            if event.type == pygame.KEYUP:
+                # Player 1
+                if event.key in (pygame.K_UP, pygame.K_DOWN):
+                    self.player_speed = 0
+                # Player 2
+                if not sim.ai_enabled and event.key in (pygame.K_w, pygame.K_s):
+                    self.opponent_speed = 0
+        profiler.mark("events")
+
+        # Move paddles and ball, AI opponent, score system
+        sim.step(self.player_speed, self.opponent_speed)
+        profiler.mark("movement")
+        return True
+
+    def render(self):
+        renderer, profiler = self.renderer, self.profiler
+
+        # Drawing
+        sim = self.sim
+        renderer.begin()
+        renderer.blits(renderer.sprite(WHITE, (sim.paddle_width, sim.paddle_height)),
+                       ((sim.player_x, sim.player_y), (sim.opponent_x, sim.opponent_y)))
+        renderer.blit(renderer.sprite(WHITE, (sim.ball_size, sim.ball_size), "ellipse"), (sim.ball_x, sim.ball_y))
+        renderer.aaline(WHITE, (WIDTH // 2, 0), (WIDTH // 2, HEIGHT))
+
+        # Render scores
+        renderer.mark(self.digits.blit(self.screen, sim.player_score, (WIDTH - 50, 20)))
+        renderer.mark(self.digits.blit(self.screen, sim.opponent_score, (30, 20)))
+        profiler.draw(renderer, self.small_font)
+        profiler.mark("drawing")
+
+        # Update
+        renderer.present()
+        profiler.mark("flip")
+        profiler.end()
+
+
+if __name__ == "__main__":
+    game.main(Game)
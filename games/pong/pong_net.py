@@ -0,0 +1,539 @@
+import argparse
+import asyncio
+import bisect
+import os
+import random
+import struct
+import sys
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from pong_sim import PongSim
+
+# UDP netcode for two-player Pong (no pygame in here; pong_online.py is the
+# window). The server owns the only real PongSim and runs it at TICK_RATE;
+# clients only send input and draw what the server tells them.
+#
+# Input: every local frame a client makes one command (paddle direction
+# -1/0/+1) with a sequence number and moves its own paddle at once
+# (prediction). Input packets carry every command the server hasn't
+# confirmed yet (up to MAX_COMMANDS), so a lost packet costs nothing; one
+# goes out as soon as the direction changes and otherwise with every
+# snapshot interval. The server applies each command once, in order, as it
+# arrives, but no faster than one per tick: a client earns one command per
+# tick and can bank up to CATCH_UP more for a late packet, so sending more
+# commands doesn't move a paddle faster. Past MAX_COMMANDS queued, the
+# oldest are dropped. Malformed packets are ignored. Every snapshot says
+# which command was applied last; the client then replays its newer
+# commands on the server's paddle position (reconciliation), so a
+# prediction that went wrong is fixed quietly.
+#
+# Snapshots go out at SNAPSHOT_RATE. Each one is a delta against the
+# newest snapshot that client has acknowledged (its input packets carry the
+# ack): a bitmask of the fields that changed, then each change as a zigzag
+# varint. A typical one is 15-20 bytes. Clients show the ball and the other
+# paddle interpolated between snapshots, about two snapshots in the past.
+#
+# Packets (little-endian, first byte is the type):
+#   HELLO     u8 version
+#   WELCOME   u8 side (0 left / 1 right), u8 tick rate, u8 snapshot rate
+#   FULL      (both sides taken)
+#   INPUT     u32 acked snapshot tick, u32 first command seq, u8 count,
+#             count * i8 directions
+#   SNAPSHOT  u32 tick, u8 ticks back to the base (0 = no base), u32 last
+#             applied command seq of this client, u8 changed-field mask,
+#             one zigzag varint delta per changed field
+#   BYE
+#
+# Run a server:
+#
+#     python3 pong_net.py [--host 0.0.0.0] [--port 50007] [--loss 0.05 --latency 20 --jitter 30]
+
+VERSION = 1
+
+# Packet types
+HELLO = 1
+WELCOME = 2
+FULL = 3
+INPUT = 4
+SNAPSHOT = 5
+BYE = 6
+
+# Sides (pong2's W/S paddle is the sim's opponent, the arrow one its player)
+LEFT = 0
+RIGHT = 1
+
+# Snapshot fields
+BALL_X, BALL_Y, BALL_VX, BALL_VY, LEFT_Y, RIGHT_Y, LEFT_SCORE, RIGHT_SCORE = range(8)
+NO_BASE = (0,) * 8
+
+PORT = 50007
+TICK_RATE = 60
+SNAPSHOT_RATE = 20
+PADDLE_SPEED = 6
+MAX_COMMANDS = 16   # most commands in one input packet, and queued per client
+CATCH_UP = 3        # commands a client can bank beyond one per tick
+HISTORY = 255       # ticks of snapshots kept as delta bases
+TIMEOUT = 3.0       # seconds of silence before a player's side is freed
+UDP_OVERHEAD = 28   # IPv4 + UDP header bytes per datagram, for bandwidth reports
+
+
+def put_varint(out, value):
+    value = (value << 1) ^ (value >> 63)  # zigzag: small negatives stay small
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def get_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return (result >> 1) ^ -(result & 1), pos
+        shift += 7
+
+
+def encode_snapshot(tick, state, base_tick, base, input_ack):
+    back = tick - base_tick if base is not None else 0
+    out = bytearray(struct.pack("<BIBIB", SNAPSHOT, tick, back, input_ack, 0))
+    mask = 0
+    for i, (value, old) in enumerate(zip(state, base or NO_BASE)):
+        if value != old:
+            mask |= 1 << i
+            put_varint(out, value - old)
+    out[10] = mask
+    return bytes(out)
+
+
+def decode_snapshot(data, bases):
+    # (tick, state, input_ack), or None while the base is unknown
+    _, tick, back, input_ack, mask = struct.unpack_from("<BIBIB", data)
+    base = bases.get(tick - back) if back else NO_BASE
+    if base is None:
+        return None
+    state = list(base)
+    pos = 11
+    for i in range(8):
+        if mask & (1 << i):
+            delta, pos = get_varint(data, pos)
+            state[i] += delta
+    return tick, tuple(state), input_ack
+
+
+def snapshot_state(sim):
+    return (int(sim.ball_x), int(sim.ball_y), int(sim.ball_vx), int(sim.ball_vy),
+            sim.opponent_y, sim.player_y, sim.opponent_score, sim.player_score)
+
+
+def move_paddle(y, direction, sim):
+    # One input command; the server and the client's prediction share this
+    return max(0, min(sim.height - sim.paddle_height, y + direction * PADDLE_SPEED))
+
+
+class NetConditions:
+    # Simulated bad network: drop `loss` of the packets, delay the rest by
+    # latency + uniform(0, jitter) milliseconds (so they can also reorder)
+    def __init__(self, loss=0.0, latency=0.0, jitter=0.0, seed=None):
+        self.loss = loss
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+
+    def __bool__(self):
+        return bool(self.loss or self.latency or self.jitter)
+
+
+class LossyTransport:
+    # Datagram transport wrapper applying NetConditions to everything sent
+    def __init__(self, transport, conditions):
+        self.transport = transport
+        self.conditions = conditions
+        self.dropped = 0
+
+    def sendto(self, data, addr=None):
+        conditions = self.conditions
+        if conditions.loss and conditions.rng.random() < conditions.loss:
+            self.dropped += 1
+            return
+        delay = (conditions.latency + conditions.rng.uniform(0, conditions.jitter)) / 1000
+        if delay <= 0:
+            self.transport.sendto(data, addr)
+        else:
+            asyncio.get_running_loop().call_later(delay, self.send_late, data, addr)
+
+    def send_late(self, data, addr):
+        if not self.transport.is_closing():
+            self.transport.sendto(data, addr)
+
+    def close(self):
+        self.transport.close()
+
+
+class Player:
+    def __init__(self, side, addr, now):
+        self.side = side
+        self.addr = addr
+        self.last_heard = now
+        self.commands = deque()  # (seq, direction) waiting for a server tick
+        self.next_seq = 1        # older commands are repeats
+        self.applied_seq = 0
+        self.budget = 1          # commands it may apply before the next tick earns another
+        self.dropped = 0         # commands thrown away (queue full)
+        self.acked_tick = 0      # newest snapshot the client has (0 = none)
+        self.bytes_sent = self.packets_sent = 0
+        self.bytes_received = self.packets_received = 0
+
+
+class PongServer(asyncio.DatagramProtocol):
+    def __init__(self, conditions=None, tick_rate=TICK_RATE, snapshot_rate=SNAPSHOT_RATE, ball_speed=(5, 5)):
+        self.conditions = conditions
+        self.tick_rate = tick_rate
+        self.snapshot_rate = snapshot_rate
+        self.sim = PongSim(ball_speed=ball_speed, ai_enabled=False)
+        self.players = {}  # addr -> Player
+        self.sides = [None, None]
+        self.tick = 1
+        self.history = {1: snapshot_state(self.sim)}
+        self.transport = None
+        self.running = True
+        self.on_apply = None  # optional callback(player, seq), for latency measurements
+
+    def connection_made(self, transport):
+        self.transport = LossyTransport(transport, self.conditions) if self.conditions else transport
+
+    def send(self, player, data):
+        player.bytes_sent += len(data)
+        player.packets_sent += 1
+        self.transport.sendto(data, player.addr)
+
+    def datagram_received(self, data, addr):
+        if not data:
+            return
+        kind = data[0]
+        player = self.players.get(addr)
+        if kind == HELLO:
+            if len(data) < 2 or data[1] != VERSION:
+                return
+            if player is None:
+                player = self.join(addr)
+                if player is None:
+                    self.transport.sendto(bytes((FULL,)), addr)
+                    return
+            self.send(player, struct.pack("<BBBB", WELCOME, player.side, self.tick_rate, self.snapshot_rate))
+            return
+        if player is None:
+            return
+        player.last_heard = asyncio.get_running_loop().time()
+        player.bytes_received += len(data)
+        player.packets_received += 1
+        if kind == INPUT:
+            if len(data) < 10:
+                return
+            _, acked, first, count = struct.unpack_from("<BIIB", data)
+            if count > MAX_COMMANDS or len(data) < 10 + count:
+                return
+            if acked > player.acked_tick:
+                player.acked_tick = acked
+            directions = struct.unpack_from(f"<{count}b", data, 10)
+            commands = player.commands
+            for seq, direction in enumerate(directions, first):
+                if seq >= player.next_seq:
+                    commands.append((seq, max(-1, min(1, direction))))
+                    player.next_seq = seq + 1
+            while len(commands) > MAX_COMMANDS:
+                commands.popleft()
+                player.dropped += 1
+            self.apply(player)
+        elif kind == BYE:
+            self.leave(player)
+
+    def join(self, addr):
+        for side in (LEFT, RIGHT):
+            if self.sides[side] is None:
+                player = self.sides[side] = self.players[addr] = \
+                    Player(side, addr, asyncio.get_running_loop().time())
+                if all(self.sides):
+                    self.sim.reset()  # both sides taken: a new match
+                return player
+        return None
+
+    def leave(self, player):
+        del self.players[player.addr]
+        self.sides[player.side] = None
+
+    def apply(self, player):
+        # Each command at most once, in order, as far as the budget goes; a
+        # late burst is spread over a few ticks rather than teleporting the
+        # paddle
+        sim = self.sim
+        commands = player.commands
+        while commands and player.budget:
+            seq, direction = commands.popleft()
+            if player.side == LEFT:
+                sim.opponent_y = move_paddle(sim.opponent_y, direction, sim)
+            else:
+                sim.player_y = move_paddle(sim.player_y, direction, sim)
+            player.applied_seq = seq
+            player.budget -= 1
+            if self.on_apply:
+                self.on_apply(player, seq)
+
+    def update(self, now):
+        sim = self.sim
+        for player in list(self.players.values()):
+            if now - player.last_heard > TIMEOUT:
+                self.leave(player)
+                continue
+            player.budget = min(player.budget + 1, 1 + CATCH_UP)
+            self.apply(player)
+
+        # The ball only moves while both sides are taken
+        if all(self.sides):
+            sim.step(0, 0)
+        self.tick += 1
+        state = self.history[self.tick] = snapshot_state(sim)
+        self.history.pop(self.tick - HISTORY - 1, None)
+
+        if self.tick % (self.tick_rate // self.snapshot_rate) == 0:
+            for player in self.players.values():
+                base = self.history.get(player.acked_tick)
+                self.send(player, encode_snapshot(self.tick, state, player.acked_tick, base, player.applied_seq))
+
+    async def serve(self):
+        # Fixed-rate ticks until stop()
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        next_tick = loop.time()
+        while self.running:
+            self.update(loop.time())
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < -0.25:
+                next_tick = loop.time()  # fell far behind: don't try to catch up
+            await asyncio.sleep(max(0.0, delay))
+
+    def stop(self):
+        self.running = False
+        self.transport.close()
+
+
+class PongClient(asyncio.DatagramProtocol):
+    def __init__(self, conditions=None, interp_ms=100):
+        self.conditions = conditions
+        self.interp_ms = interp_ms
+        self.geometry = PongSim(ai_enabled=False)  # field and paddle sizes, for prediction and drawing
+        self.transport = None
+        self.side = None
+        self.tick_rate = TICK_RATE
+        self.send_every = TICK_RATE // SNAPSHOT_RATE  # frames between input packets while nothing changes
+        self.full = False
+        self.welcomed = asyncio.Event()
+
+        self.seq = 0
+        self.pending = deque(maxlen=4 * TICK_RATE)  # commands the server hasn't applied yet
+        self.predicted_y = None
+        self.direction = 0
+        self.unsent = 0  # frames since the last input packet
+
+        self.bases = {}        # tick -> state, for decoding deltas
+        self.latest_tick = 0
+        self.latest = None
+        self.ticks = []        # received snapshots in tick order, for interpolation
+        self.states = []
+        self.tick_offset = None  # server tick = loop time * tick rate + offset
+        self.view_tick = 0.0
+
+        self.bytes_received = self.packets_received = 0
+        self.bytes_sent = self.packets_sent = 0
+        self.full_snapshots = self.late_snapshots = 0
+        self.corrections = 0
+        self.correction_px = 0
+
+    def connection_made(self, transport):
+        self.transport = LossyTransport(transport, self.conditions) if self.conditions else transport
+
+    def send(self, data):
+        self.bytes_sent += len(data)
+        self.packets_sent += 1
+        self.transport.sendto(data)
+
+    async def connect(self, timeout=5.0):
+        # HELLO until WELCOME (it may get lost too)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not self.welcomed.is_set():
+            if self.full:
+                raise ConnectionError("server full")
+            if loop.time() > deadline:
+                raise ConnectionError("no answer from the server")
+            self.send(struct.pack("<BB", HELLO, VERSION))
+            try:
+                await asyncio.wait_for(self.welcomed.wait(), 0.25)
+            except asyncio.TimeoutError:
+                pass
+
+    def datagram_received(self, data, addr):
+        if not data:
+            return
+        self.bytes_received += len(data)
+        self.packets_received += 1
+        kind = data[0]
+        if kind == SNAPSHOT:
+            self.receive_snapshot(data)
+        elif kind == WELCOME:
+            _, self.side, self.tick_rate, snapshot_rate = struct.unpack_from("<BBBB", data)
+            self.send_every = max(1, self.tick_rate // snapshot_rate)
+            self.welcomed.set()
+        elif kind == FULL:
+            self.full = True
+
+    def receive_snapshot(self, data):
+        if self.side is None:
+            return  # overtook the WELCOME
+        decoded = decode_snapshot(data, self.bases)
+        if decoded is None:
+            return
+        tick, state, input_ack = decoded
+        if data[5] == 0:
+            self.full_snapshots += 1
+        if tick in self.bases:
+            return
+        self.bases[tick] = state
+        if tick <= self.latest_tick:
+            self.late_snapshots += 1  # still a delta base, and goes in the interpolation buffer
+        else:
+            self.latest_tick = tick
+            self.latest = state
+            for old in [t for t in self.bases if t < tick - HISTORY]:
+                del self.bases[old]
+            self.reconcile(state, input_ack)
+            self.sync_clock(tick)
+
+        i = bisect.bisect(self.ticks, tick)
+        self.ticks.insert(i, tick)
+        self.states.insert(i, state)
+        if len(self.ticks) > 64:
+            del self.ticks[0], self.states[0]
+
+    def reconcile(self, state, input_ack):
+        # Server's paddle plus our commands it hasn't applied yet
+        pending = self.pending
+        while pending and pending[0][0] <= input_ack:
+            pending.popleft()
+        y = state[LEFT_Y + self.side]
+        for _, direction in pending:
+            y = move_paddle(y, direction, self.geometry)
+        if self.predicted_y is not None and y != self.predicted_y:
+            self.corrections += 1
+            self.correction_px += abs(y - self.predicted_y)
+        self.predicted_y = y
+
+    def sync_clock(self, tick):
+        now = asyncio.get_running_loop().time() * self.tick_rate
+        offset = tick - now
+        if self.tick_offset is None or abs(offset - self.tick_offset) > self.tick_rate:
+            self.tick_offset = offset
+        else:
+            self.tick_offset += (offset - self.tick_offset) * 0.1
+
+    def frame(self, direction):
+        # Once per local frame: one command, applied locally right away
+        self.seq += 1
+        self.pending.append((self.seq, direction))
+        if self.predicted_y is not None:
+            self.predicted_y = move_paddle(self.predicted_y, direction, self.geometry)
+        self.unsent += 1
+        if direction == self.direction and self.unsent < self.send_every:
+            return
+        self.direction = direction
+        self.unsent = 0
+        commands = list(self.pending)[-MAX_COMMANDS:]
+        first = commands[0][0] if commands else self.seq
+        packet = struct.pack(f"<BIIB{len(commands)}b", INPUT, self.latest_tick, first, len(commands),
+                             *(d for _, d in commands))
+        self.send(packet)
+
+    def view(self, now):
+        # (ball x, ball y, left y, right y, left score, right score) to draw
+        # at loop time `now`, or None before the first snapshot
+        if self.latest is None:
+            return None
+        self.view_tick = target = now * self.tick_rate + self.tick_offset - self.interp_ms * self.tick_rate / 1000
+        ball_x, ball_y, left_y, right_y = self.interpolate(target)
+        if self.side == LEFT:
+            left_y = self.predicted_y
+        else:
+            right_y = self.predicted_y
+        return ball_x, ball_y, left_y, right_y, self.latest[LEFT_SCORE], self.latest[RIGHT_SCORE]
+
+    def interpolate(self, target):
+        ticks, states = self.ticks, self.states
+        i = bisect.bisect(ticks, target)
+        if i == 0:
+            s = states[0]
+            return s[BALL_X], s[BALL_Y], s[LEFT_Y], s[RIGHT_Y]
+        if i == len(ticks):
+            # Past the newest snapshot (late packets): carry the ball on a little
+            s = states[-1]
+            ahead = min(target - ticks[-1], self.tick_rate / 10)
+            g = self.geometry
+            x = max(0, min(g.width - g.ball_size, s[BALL_X] + s[BALL_VX] * ahead))
+            y = max(0, min(g.height - g.ball_size, s[BALL_Y] + s[BALL_VY] * ahead))
+            return x, y, s[LEFT_Y], s[RIGHT_Y]
+        t0, t1 = ticks[i - 1], ticks[i]
+        s0, s1 = states[i - 1], states[i]
+        if s0[LEFT_SCORE:] != s1[LEFT_SCORE:]:
+            return s0[BALL_X], s0[BALL_Y], s0[LEFT_Y], s0[RIGHT_Y]  # a serve: no sliding across the field
+        a = (target - t0) / (t1 - t0)
+        return tuple(s0[f] + (s1[f] - s0[f]) * a for f in (BALL_X, BALL_Y, LEFT_Y, RIGHT_Y))
+
+    def close(self):
+        if self.transport:
+            self.send(bytes((BYE,)))
+            self.transport.close()
+
+
+async def start_server(host="127.0.0.1", port=PORT, **options):
+    loop = asyncio.get_running_loop()
+    transport, server = await loop.create_datagram_endpoint(lambda: PongServer(**options), local_addr=(host, port))
+    server.address = transport.get_extra_info("sockname")  # port 0 picks a free port
+    return server
+
+
+async def start_client(host="127.0.0.1", port=PORT, **options):
+    loop = asyncio.get_running_loop()
+    _, client = await loop.create_datagram_endpoint(lambda: PongClient(**options), remote_addr=(host, port))
+    try:
+        await client.connect()
+    except ConnectionError:
+        client.transport.close()
+        raise
+    return client
+
+
+def add_condition_args(parser):
+    parser.add_argument("--loss", type=float, default=0.0, help="fraction of sent packets to drop")
+    parser.add_argument("--latency", type=float, default=0.0, help="extra delay per packet, ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra delay up to this, ms")
+
+
+async def main(args):
+    conditions = NetConditions(args.loss, args.latency, args.jitter)
+    server = await start_server(args.host, args.port, conditions=conditions or None)
+    print(f"Pong server on {args.host}:{args.port}")
+    await server.serve()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Authoritative UDP server for two-player Pong")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=PORT)
+    add_condition_args(parser)
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
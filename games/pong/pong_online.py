@@ -0,0 +1,98 @@
+import argparse
+import asyncio
+import os
+import sys
+
+import pygame
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.fonts import fonts
+from common.hud import DigitAtlas, text_cache
+from common.render import Renderer
+from pong_net import LEFT, PORT, NetConditions, add_condition_args, start_client, start_server
+
+# Two-player Pong over the network: a window on a pong_net client.
+# Start a server (python3 pong_net.py) and one of these per player, or
+# let the first player's window host the game:
+#
+#     python3 pong_online.py --host-game            # player 1
+#     python3 pong_online.py --host 192.168.1.20    # player 2
+#
+# W/S or Up/Down move your own paddle, Esc quits. --loss, --latency and
+# --jitter simulate a bad connection (applied to everything this process
+# sends, the server's packets too when it hosts).
+
+# Colors
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+GREY = (140, 140, 140)
+
+
+async def play(args):
+    conditions = NetConditions(args.loss, args.latency, args.jitter) or None
+    server = serving = None
+    if args.host_game:
+        server = await start_server("0.0.0.0", args.port, conditions=conditions)
+        serving = asyncio.create_task(server.serve())
+    client = await start_client(args.host, args.port, conditions=conditions, interp_ms=args.interp_ms)
+    field = client.geometry
+
+    pygame.init()
+    screen = pygame.display.set_mode((field.width, field.height))
+    pygame.display.set_caption(f"Pong Online ({'left' if client.side == LEFT else 'right'} paddle)")
+    renderer = Renderer(screen, BLACK)
+    digits = DigitAtlas(fonts.get(None, 50), WHITE)
+    small_font = fonts.get(None, 22)
+    paddle = renderer.sprite(WHITE, (field.paddle_width, field.paddle_height))
+    ball = renderer.sprite(WHITE, (field.ball_size, field.ball_size), "ellipse")
+
+    loop = asyncio.get_running_loop()
+    interval = 1 / client.tick_rate
+    next_frame = loop.time()
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                running = False
+
+        # Own paddle moves this frame (prediction), the server catches up
+        keys = pygame.key.get_pressed()
+        client.frame((keys[pygame.K_DOWN] or keys[pygame.K_s]) - (keys[pygame.K_UP] or keys[pygame.K_w]))
+
+        renderer.begin()
+        view = client.view(loop.time())
+        if view is None:
+            renderer.mark(screen.blit(text_cache.render(small_font, "Waiting for the server...", GREY), (20, 20)))
+        else:
+            ball_x, ball_y, left_y, right_y, left_score, right_score = view
+            renderer.blits(paddle, ((field.opponent_x, round(left_y)), (field.player_x, round(right_y))))
+            renderer.blit(ball, (round(ball_x), round(ball_y)))
+            renderer.aaline(WHITE, (field.width // 2, 0), (field.width // 2, field.height))
+            renderer.mark(digits.blit(screen, right_score, (field.width - 50, 20)))
+            renderer.mark(digits.blit(screen, left_score, (30, 20)))
+        renderer.present()
+
+        next_frame += interval
+        await asyncio.sleep(max(0.0, next_frame - loop.time()))
+
+    client.close()
+    if server:
+        server.stop()
+        serving.cancel()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Two-player Pong over UDP")
+    parser.add_argument("--host", default="127.0.0.1", help="server to join")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--host-game", action="store_true", help="also run the server in this process")
+    parser.add_argument("--interp-ms", type=float, default=100, help="how far behind the server the ball is drawn")
+    parser.add_argument("--dirty", action="store_true", help="dirty-rect rendering (see common/render.py)")
+    add_condition_args(parser)
+    try:
+        asyncio.run(play(parser.parse_args()))
+    except ConnectionError as e:
+        sys.exit(f"Pong Online: {e}")
@@ -0,0 +1,82 @@
+# Ball physics for pong2.py. No pygame in here.
+#
+# sweep() moves the ball along its path for one step and resolves wall and
+# paddle hits in the order they happen (continuous collision), so a fast
+# ball can't tunnel through a paddle or bounce back and forth inside one.
+# intercept() folds the straight-line path over the walls to find where the
+# ball will meet a paddle's plane, so an AI only has to predict once per hit.
+#
+# Positions are the ball's top-left corner; paddles are (x, y, w, h).
+
+WALL = 1
+PADDLE = 2
+
+MAX_BOUNCES = 8  # per step; only reachable with absurd speeds
+
+
+def sweep(x, y, vx, vy, size, height, paddles, dt=1.0):
+    # Returns the new (x, y, vx, vy) and a WALL | PADDLE mask of what was hit
+    bottom = height - size
+    hits = 0
+    remaining = dt
+    for _ in range(MAX_BOUNCES):
+        t = remaining
+        event = None
+
+        # Top / bottom wall
+        if vy < 0:
+            t_wall = max(0.0, -y / vy)
+        elif vy > 0:
+            t_wall = max(0.0, (bottom - y) / vy)
+        else:
+            t_wall = remaining
+        if t_wall < t:
+            t = t_wall
+            event = WALL
+
+        # Paddle faces the ball is heading toward (only from the outside,
+        # so a ball already inside a paddle just leaves it)
+        for px, py, pw, ph in paddles:
+            if vx > 0 and x + size <= px:
+                face = px - size
+            elif vx < 0 and x >= px + pw:
+                face = px + pw
+            else:
+                continue
+            t_paddle = (face - x) / vx
+            if t_paddle < t:
+                y_hit = y + vy * t_paddle
+                if y_hit + size > py and y_hit < py + ph:
+                    t = t_paddle
+                    event = PADDLE
+                    hit_x = face
+
+        x += vx * t
+        y += vy * t
+        remaining -= t
+        if event is None:
+            break
+        if event == WALL:
+            y = 0 if vy < 0 else bottom
+            vy = -vy
+            hits |= WALL
+        else:
+            x = hit_x
+            vx = -vx
+            hits |= PADDLE
+    return x, y, vx, vy, hits
+
+
+def intercept(x, y, vx, vy, size, height, plane_x):
+    # Ball y (top) when its x reaches plane_x, walls included; None if it
+    # is moving away from that plane
+    if vx == 0:
+        return None
+    t = (plane_x - x) / vx
+    if t < 0:
+        return None
+    span = height - size
+    if span <= 0:
+        return 0
+    folded = (y + vy * t) % (2 * span)
+    return folded if folded <= span else 2 * span - folded
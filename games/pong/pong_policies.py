@@ -0,0 +1,97 @@
+from pong_physics import intercept
+
+# Paddle policies for a PongSim with ai_enabled=False (pong_tournament.py).
+#
+# A policy is created for one side of one match, Policy(sim, side, rng,
+# **params), and called once per tick before sim.step(); it returns that
+# paddle's speed for the tick in pixels (negative = up). rng is the
+# match's seeded random.Random, for policies that make mistakes.
+#
+# Intercept(speed=5) plays exactly like pong2.py's built-in AI.
+
+LEFT = "left"    # pong2's opponent
+RIGHT = "right"  # pong2's player
+
+
+class Policy:
+    def __init__(self, sim, side, rng):
+        self.sim = sim
+        self.side = side
+        self.rng = rng
+        self.left = side == LEFT
+        # x of the ball's top-left corner when it touches this paddle
+        self.plane = sim.opponent_x + sim.paddle_width if self.left else sim.player_x - sim.ball_size
+
+    def paddle_center(self):
+        sim = self.sim
+        return (sim.opponent_y if self.left else sim.player_y) + sim.paddle_height // 2
+
+    def move_to(self, target, speed):
+        # Called every tick, so plain comparisons rather than max(min())
+        gap = target - self.paddle_center()
+        if gap > speed:
+            return speed
+        if gap < -speed:
+            return -speed
+        return gap
+
+
+class Intercept(Policy):
+    # Heads for where the ball will reach this paddle, predicted once each
+    # time the ball changes direction (a hit or a serve); `error` adds a
+    # gaussian aiming error of that many pixels to every prediction
+    def __init__(self, sim, side, rng, speed=5, error=0):
+        super().__init__(sim, side, rng)
+        self.speed = speed
+        self.error = error
+        self.vx = None
+        self.target = sim.height // 2
+
+    def predict(self):
+        sim = self.sim
+        y = intercept(sim.ball_x, sim.ball_y, sim.ball_vx, sim.ball_vy, sim.ball_size, sim.height, self.plane)
+        if y is None:
+            return sim.height // 2  # ball heading away: wait in the middle
+        target = round(y) + sim.ball_size // 2
+        if self.error:
+            target += round(self.rng.gauss(0, self.error))
+        return target
+
+    def __call__(self):
+        if self.sim.ball_vx != self.vx:
+            self.vx = self.sim.ball_vx
+            self.target = self.predict()
+        return self.move_to(self.target, self.speed)
+
+
+class Track(Policy):
+    # Follows the ball's height as it is now (the classic Pong AI), idle
+    # while the ball is within `deadzone` pixels of the paddle's centre
+    def __init__(self, sim, side, rng, speed=5, deadzone=0):
+        super().__init__(sim, side, rng)
+        self.speed = speed
+        self.deadzone = deadzone
+
+    def __call__(self):
+        sim = self.sim
+        target = sim.ball_y + sim.ball_size // 2
+        if abs(target - self.paddle_center()) <= self.deadzone:
+            return 0
+        return self.move_to(target, self.speed)
+
+
+class Center(Policy):
+    # Stays in the middle (a baseline that only returns lucky balls)
+    def __init__(self, sim, side, rng, speed=5):
+        super().__init__(sim, side, rng)
+        self.speed = speed
+
+    def __call__(self):
+        return self.move_to(self.sim.height // 2, self.speed)
+
+
+POLICIES = {
+    "intercept": Intercept,
+    "track": Track,
+    "center": Center,
+}
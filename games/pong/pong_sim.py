@@ -0,0 +1,118 @@
+from pong_physics import sweep, intercept, PADDLE
+
+# Headless simulation core for pong2.py. No pygame in here: pong2.py draws
+# a PongSim, bots, environments and tournaments can call step() as fast as
+# they like.
+#
+# The player is the right paddle, the opponent the left one. Each step
+# takes both paddles' speeds in pixels per tick; with ai_enabled the
+# opponent's speed comes from the built-in AI instead. Positions are
+# integers and top-left corners, as pygame.Rect keeps them.
+
+# Results of a step
+NO_POINT = 0
+PLAYER_POINT = 1
+OPPONENT_POINT = -1
+
+
+class PongSim:
+    def __init__(self, width=800, height=600, ball_speed=(5, 5), ai_speed=5, ai_enabled=True, speedup=1.0):
+        self.width = width
+        self.height = height
+
+        # Paddle settings
+        self.paddle_width = 10
+        self.paddle_height = 100
+        self.player_x = width - 20
+        self.opponent_x = 10
+
+        # Ball settings
+        self.ball_size = 20
+        self.serve_speed = ball_speed
+        self.speedup = speedup  # ball speed factor per paddle hit (pong2 plays 1.0)
+
+        # Opponent AI (heads for the intercept predicted on every hit)
+        self.ai_enabled = ai_enabled
+        self.ai_speed = ai_speed
+        self.reset()
+
+    def reset(self):
+        self.player_y = self.height // 2 - 50
+        self.opponent_y = self.height // 2 - 50
+        self.ball_x = self.width // 2 - self.ball_size // 2
+        self.ball_y = self.height // 2 - self.ball_size // 2
+        self.ball_vx, self.ball_vy = self.serve_speed
+        self.player_score = 0
+        self.opponent_score = 0
+        self.hits = 0     # WALL | PADDLE mask of the last step
+        self.rally = 0    # paddle hits since the last point
+        self.ticks = 0
+        self.ai_target = self.predict_ai_target()
+
+    def state(self):
+        # Everything that decides the next tick, for replay checkpoints
+        return ((self.ball_x, self.ball_y), self.ball_vx, self.ball_vy, self.player_y, self.opponent_y,
+                self.player_score, self.opponent_score)
+
+    def paddles(self):
+        # (x, y, w, h) of the player's and the opponent's paddle
+        return ((self.player_x, self.player_y, self.paddle_width, self.paddle_height),
+                (self.opponent_x, self.opponent_y, self.paddle_width, self.paddle_height))
+
+    def predict_ai_target(self):
+        # Where the ball will reach the opponent's paddle (its centre y)
+        y = intercept(self.ball_x, self.ball_y, self.ball_vx, self.ball_vy, self.ball_size, self.height,
+                      self.opponent_x + self.paddle_width)
+        if y is None:
+            return self.height // 2  # ball heading away: wait in the middle
+        return round(y) + self.ball_size // 2
+
+    def ai_move(self):
+        gap = self.ai_target - (self.opponent_y + self.paddle_height // 2)
+        return max(-self.ai_speed, min(self.ai_speed, gap))
+
+    def serve(self):
+        # Ball back to the centre, heading the other way
+        self.ball_x = self.width // 2 - self.ball_size // 2
+        self.ball_y = self.height // 2 - self.ball_size // 2
+        self.ball_vx *= -1
+        if self.speedup != 1.0:
+            # Back to the serve speed, keeping the directions
+            self.ball_vx = abs(self.serve_speed[0]) * (1 if self.ball_vx > 0 else -1)
+            self.ball_vy = abs(self.serve_speed[1]) * (1 if self.ball_vy > 0 else -1)
+        self.rally = 0
+        self.ai_target = self.predict_ai_target()
+
+    def step(self, player_speed=0, opponent_speed=0):
+        # One tick; returns PLAYER_POINT, OPPONENT_POINT or NO_POINT
+        self.ticks += 1
+
+        # Move paddles, kept inside the screen
+        if self.ai_enabled:
+            opponent_speed = self.ai_move()
+        bottom = self.height - self.paddle_height
+        self.player_y = max(0, min(bottom, self.player_y + player_speed))
+        self.opponent_y = max(0, min(bottom, self.opponent_y + opponent_speed))
+
+        # Move ball (swept against walls and paddles, so it never tunnels)
+        x, y, self.ball_vx, self.ball_vy, self.hits = sweep(
+            self.ball_x, self.ball_y, self.ball_vx, self.ball_vy, self.ball_size, self.height, self.paddles())
+        self.ball_x, self.ball_y = round(x), round(y)
+
+        if self.hits & PADDLE:
+            self.rally += 1
+            if self.speedup != 1.0:
+                self.ball_vx *= self.speedup
+                self.ball_vy *= self.speedup
+            self.ai_target = self.predict_ai_target()
+
+        # Score system
+        if self.ball_x <= 0:
+            self.player_score += 1
+            self.serve()
+            return PLAYER_POINT
+        if self.ball_x + self.ball_size >= self.width:
+            self.opponent_score += 1
+            self.serve()
+            return OPPONENT_POINT
+        return NO_POINT
@@ -0,0 +1,258 @@
+import argparse
+import itertools
+import json
+import multiprocessing as mp
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from pong_sim import PongSim, NO_POINT
+from pong_policies import POLICIES, LEFT, RIGHT
+
+# Headless Pong tournaments between paddle policies (pong_policies.py).
+#
+# Every match is a PongSim with both paddles driven by policies and is
+# fully determined by its seed (serve directions and any policy noise
+# come from one random.Random), so results don't depend on which worker
+# played it. The two contenders of a pairing swap sides every match.
+# Matches run on a process pool and only their totals come back.
+#
+# The ball keeps pong2's constant speed by default, so parameters tuned
+# here carry over to the game. Two policies that never miss would then
+# play forever: once a rally reaches max_rally paddle hits it goes to
+# overtime, and the ball speeds up with every hit (as in pong.py) until
+# one side misses. The point counts as usual and the next serve is back
+# at the normal speed. max_ticks still ends a match as it stands. For
+# quick sweeps, fewer points and a lower rally cap trade precision for
+# combinations per minute; the summary projects that rate for the worker
+# pool in use.
+#
+# A contender is written "name:param=value,...", e.g. "intercept:speed=6".
+# --sweep expands "a..b" (integers) and "x|y|z" into every combination:
+#
+#     python3 pong_tournament.py                                  # default round robin
+#     python3 pong_tournament.py intercept:speed=5 track:speed=6,deadzone=10 center
+#     python3 pong_tournament.py --sweep "intercept:speed=2..9,error=0|20|40" \
+#         --against intercept:speed=5 --matches 20 --ball-speed 8,6
+#     python3 pong_tournament.py --sweep "intercept:speed=1..20,error=0..40" \
+#         --matches 4 --points 3 --max-rally 10
+
+DEFAULT_CONTENDERS = ["intercept:speed=5", "track:speed=5", "center"]
+OVERTIME_SPEEDUP = 1.1  # ball speed factor per hit once a rally reaches max_rally
+
+
+def parse_value(text):
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_spec(text):
+    # "intercept:speed=5,error=10" -> ("intercept", {"speed": 5, "error": 10})
+    name, _, args = text.partition(":")
+    if name not in POLICIES:
+        raise SystemExit(f"unknown policy {name!r} (have: {', '.join(POLICIES)})")
+    params = {}
+    for arg in filter(None, args.split(",")):
+        key, _, value = arg.partition("=")
+        params[key] = parse_value(value)
+    return name, params
+
+
+def expand_sweep(text):
+    # Every combination of "a..b" ranges and "x|y" lists in a spec
+    name, _, args = text.partition(":")
+    parse_spec(name)  # checks the policy name
+    keys, choices = [], []
+    for arg in filter(None, args.split(",")):
+        key, _, value = arg.partition("=")
+        if ".." in value:
+            low, high = value.split("..")
+            values = list(range(int(low), int(high) + 1))
+        else:
+            values = [parse_value(v) for v in value.split("|")]
+        keys.append(key)
+        choices.append(values)
+    return [(name, dict(zip(keys, combo))) for combo in itertools.product(*choices)]
+
+
+def spec_label(spec):
+    name, params = spec
+    if not params:
+        return name
+    return name + ":" + ",".join(f"{k}={v}" for k, v in params.items())
+
+
+def play_match(left, right, seed, points=5, max_ticks=100_000, ball_speed=(5, 5), speedup=1.0, max_rally=50):
+    # Returns (left score, right score, ticks, rallies, rally hits, longest rally).
+    # max_rally=0 lets rallies run on at the match speed (up to max_ticks).
+    rng = random.Random(seed)
+    sim = PongSim(ball_speed=ball_speed, ai_enabled=False, speedup=speedup)
+    sim.ball_vx *= rng.choice((-1, 1))
+    sim.ball_vy *= rng.choice((-1, 1))
+    left_policy = POLICIES[left[0]](sim, LEFT, rng, **left[1])
+    right_policy = POLICIES[right[0]](sim, RIGHT, rng, **right[1])
+
+    rallies = rally_hits = longest = 0
+    overtime = False
+    step = sim.step
+    while sim.ticks < max_ticks:
+        rally = sim.rally
+        if step(right_policy(), left_policy()) != NO_POINT:
+            # serve() ran at the overtime speedup, so the ball is back at
+            # the serve speed
+            if overtime:
+                sim.speedup = speedup
+                overtime = False
+            rallies += 1
+            rally_hits += rally
+            longest = max(longest, rally)
+            if sim.player_score >= points or sim.opponent_score >= points:
+                break
+            sim.ball_vy = abs(sim.ball_vy) * rng.choice((-1, 1))
+        elif max_rally and sim.rally >= max_rally and not overtime:
+            # Neither side is missing at this speed: speed up until one does
+            sim.speedup = max(speedup, OVERTIME_SPEEDUP)
+            overtime = True
+    return sim.opponent_score, sim.player_score, sim.ticks, rallies, rally_hits, longest
+
+
+def play_task(task):
+    pairing, a_left, left, right, seed, options = task
+    return (pairing, a_left) + play_match(left, right, seed, **options)
+
+
+class PairingStats:
+    def __init__(self, a, b):
+        self.a = a
+        self.b = b
+        self.matches = self.a_wins = self.b_wins = self.draws = 0
+        self.a_points = self.b_points = 0
+        self.ticks = self.rallies = self.rally_hits = self.longest = 0
+
+    def add(self, a_left, left_score, right_score, ticks, rallies, rally_hits, longest):
+        a_score, b_score = (left_score, right_score) if a_left else (right_score, left_score)
+        self.matches += 1
+        if a_score > b_score:
+            self.a_wins += 1
+        elif b_score > a_score:
+            self.b_wins += 1
+        else:
+            self.draws += 1
+        self.a_points += a_score
+        self.b_points += b_score
+        self.ticks += ticks
+        self.rallies += rallies
+        self.rally_hits += rally_hits
+        self.longest = max(self.longest, longest)
+
+    @property
+    def win_rate(self):
+        # Draws count half
+        return (self.a_wins + 0.5 * self.draws) / self.matches if self.matches else 0.0
+
+    @property
+    def mean_rally(self):
+        return self.rally_hits / self.rallies if self.rallies else 0.0
+
+    def as_dict(self):
+        return {"a": spec_label(self.a), "b": spec_label(self.b), "matches": self.matches,
+                "a_wins": self.a_wins, "b_wins": self.b_wins, "draws": self.draws,
+                "a_points": self.a_points, "b_points": self.b_points, "win_rate": self.win_rate,
+                "mean_rally": self.mean_rally, "longest_rally": self.longest, "ticks": self.ticks}
+
+
+def run_tournament(pairings, matches, seed=1, workers=None, **options):
+    # pairings: [(spec a, spec b)]; returns ([PairingStats], seconds)
+    stats = [PairingStats(a, b) for a, b in pairings]
+    tasks = []
+    for i, (a, b) in enumerate(pairings):
+        for k in range(matches):
+            a_left = k % 2 == 0
+            left, right = (a, b) if a_left else (b, a)
+            tasks.append((i, a_left, left, right, seed + i * matches + k, options))
+
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    if workers == 1:
+        results = map(play_task, tasks)
+        for pairing, *result in results:
+            stats[pairing].add(*result)
+    else:
+        chunksize = max(1, len(tasks) // (workers * 8))
+        with mp.Pool(workers) as pool:
+            for pairing, *result in pool.imap_unordered(play_task, tasks, chunksize):
+                stats[pairing].add(*result)
+    return stats, time.perf_counter() - started
+
+
+def print_table(stats, top=None):
+    rows = sorted(stats, key=lambda s: s.win_rate, reverse=True)[:top]
+    width = max(len(spec_label(s.a)) for s in rows)
+    against = max(len(spec_label(s.b)) for s in rows)
+    print(f"{'contender':{width}}  {'vs':{against}}  {'W-L-D':>10} {'win %':>6} {'points':>9} "
+          f"{'rally':>6} {'max':>5}")
+    for s in rows:
+        record = f"{s.a_wins}-{s.b_wins}-{s.draws}"
+        print(f"{spec_label(s.a):{width}}  {spec_label(s.b):{against}}  {record:>10} "
+              f"{100 * s.win_rate:>6.1f} {f'{s.a_points}:{s.b_points}':>9} {s.mean_rally:>6.1f} "
+              f"{s.longest:>5}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless Pong tournaments between paddle policies")
+    parser.add_argument("contenders", nargs="*", help='round robin between these, e.g. "track:speed=6"')
+    parser.add_argument("--sweep", help="spec with ranges, every combination plays --against")
+    parser.add_argument("--against", default="intercept:speed=5", help="opponent for --sweep")
+    parser.add_argument("--matches", type=int, default=10, help="matches per pairing")
+    parser.add_argument("--points", type=int, default=5, help="points to win a match")
+    parser.add_argument("--speedup", type=float, default=1.0,
+                        help="ball speed factor per paddle hit (default: pong2's constant speed; pong.py uses 1.1)")
+    parser.add_argument("--max-rally", type=int, default=50,
+                        help="after this many paddle hits in a rally the ball speeds up with every hit "
+                             "until a side misses (0: no limit)")
+    parser.add_argument("--max-ticks", type=int, default=100_000,
+                        help="a match still open after this many ticks is scored as it stands")
+    parser.add_argument("--ball-speed", default="5,5", help="serve speed x,y")
+    parser.add_argument("--workers", type=int, help="processes (default: one per core)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--top", type=int, help="only print the best N rows")
+    parser.add_argument("--out", help="write every pairing's totals to this JSON file")
+    args = parser.parse_args()
+
+    if args.sweep:
+        opponent = parse_spec(args.against)
+        pairings = [(spec, opponent) for spec in expand_sweep(args.sweep)]
+    else:
+        contenders = [parse_spec(text) for text in args.contenders or DEFAULT_CONTENDERS]
+        pairings = list(itertools.combinations(contenders, 2))
+
+    ball_speed = tuple(int(v) for v in args.ball_speed.split(","))
+    workers = args.workers or os.cpu_count() or 1
+    stats, elapsed = run_tournament(pairings, args.matches, args.seed, workers, points=args.points,
+                                    max_ticks=args.max_ticks, ball_speed=ball_speed, speedup=args.speedup,
+                                    max_rally=args.max_rally)
+    print_table(stats, args.top)
+
+    matches = sum(s.matches for s in stats)
+    ticks = sum(s.ticks for s in stats)
+    # Pairings (parameter combinations, for a sweep) this pool gets through
+    # per minute at these match settings
+    per_minute = len(pairings) / elapsed * 60
+    print(f"\n{len(pairings)} pairings, {matches} matches in {elapsed:.2f}s on {workers} worker(s): "
+          f"{matches / elapsed:,.1f} matches/s, {ticks / elapsed:,.0f} ticks/s")
+    print(f"projected: {per_minute:,.0f} {'combinations' if args.sweep else 'pairings'}/min "
+          f"at {args.matches} matches each ({ticks / matches:,.0f} ticks per match)")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"matches_per_sec": matches / elapsed, "pairings_per_min": per_minute,
+                       "workers": workers, "seconds": elapsed,
+                       "options": {"matches": args.matches, "points": args.points, "max_ticks": args.max_ticks,
+                                   "max_rally": args.max_rally, "ball_speed": ball_speed,
+                                   "speedup": args.speedup, "seed": args.seed},
+                       "pairings": [s.as_dict() for s in stats]}, f, indent=2)
@@ -1,9 +1,17 @@
 import pygame
-import time
 import random
-
-# Initialize pygame
-pygame.init()
+import os
+import sys
+from collections import deque
+from itertools import islice
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.fonts import fonts
+from common import game, replay
+from common.hud import Hud
+from common.render import Renderer
+from snake_sim import PLAYING, GAME_OVER, RESTARTING, QUIT
+from snake_view import lerp
 
 # Screen size
 width = 600
@@ -16,127 +24,233 @@ red = (213, 50, 80)
 green = (0, 255, 0)
 blue = (50, 153, 213)
 
-# Create screen
-dis = pygame.display.set_mode((width, height))
-pygame.display.set_caption("🐍 Snake Game")
-
-# Clock
-clock = pygame.time.Clock()
-
 # Snake block size
 snake_block = 10
 
-# Initial speed
+# Initial speed (steps per second)
 snake_speed = 15
 
-# Font
-font_style = pygame.font.SysFont("bahnschrift", 25)
-score_font = pygame.font.SysFont("comicsansms", 35)
-
-
-def our_snake(snake_block, snake_list):
-    for x in snake_list:
-        pygame.draw.rect(dis, black, [x[0], x[1], snake_block, snake_block])
-
-
-def your_score(score):
-    value = score_font.render("Score: " + str(score), True, red)
-    dis.blit(value, [10, 10])
-
-
-def message(msg, color, y_offset=0):
-    mesg = font_style.render(msg, True, color)
-    dis.blit(mesg, [width / 6, height / 3 + y_offset])
-
-
-def game_loop():
-    game_over = False
-    game_close = False
-
-    x1 = width / 2
-    y1 = height / 2
-
-    x1_change = 0
-    y1_change = 0
-
-    snake_list = []
-    length_of_snake = 1
-
-    foodx = round(random.randrange(0, width - snake_block) / 10.0) * 10.0
-    foody = round(random.randrange(0, height - snake_block) / 10.0) * 10.0
-
-    global snake_speed
-
-    while not game_over:
-
-        while game_close:
-            dis.fill(blue)
-            message("You Lost! Press C-Play Again or Q-Quit", red)
-            your_score(length_of_snake - 1)
-            pygame.display.update()
-
-            for event in pygame.event.get():
+# Display rate; the snake moves at snake_speed on top of it
+DISPLAY_FPS = 60
+
+TURN_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+
+
+class Game:
+    size = (width, height)
+    caption = "🐍 Snake Game"
+    fps = DISPLAY_FPS
+
+    def __init__(self, screen):
+        self.dis = screen
+
+        # Input session (seeded RNG, optional recording / replay)
+        self.session = replay.Session(__file__, [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+                                                 pygame.K_c, pygame.K_q],
+                                      script_keys=[pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+                                                   pygame.K_c])
+
+        # Font
+        self.font_style = fonts.get("bahnschrift", 25)
+        self.score_hud = Hud(fonts.get("comicsansms", 35), red)
+
+        # Renderer (full frames by default, `--dirty` for dirty rectangles)
+        self.renderer = Renderer(screen, blue)
+        self.score_area = pygame.Rect(10, 10, 0, 0)
+        self.shown_score = None
+
+        # Deque body plus a set of occupied cells: O(1) move and self-collision.
+        # Both are cleared and reused on every restart.
+        self.snake_list = deque()
+        self.occupied = set()
+        self.turns = deque(maxlen=3)  # key presses wait for their step, one turn per step
+
+        self.state_name = RESTARTING
+        self.over = False  # this frame shows the game over screen
+
+    def our_snake(self, snake_block, snake_list, prev_head=None, tail=None, alpha=1.0):
+        # Between steps the head slides in from prev_head and the tail slides out
+        renderer = self.renderer
+        if alpha >= 1.0 or prev_head is None or not snake_list:
+            for x in snake_list:
+                renderer.rect(black, [x[0], x[1], snake_block, snake_block])
+            return
+        for x in islice(snake_list, len(snake_list) - 1):
+            renderer.rect(black, [x[0], x[1], snake_block, snake_block])
+        head = lerp(prev_head, snake_list[-1], alpha)
+        renderer.rect(black, [head[0], head[1], snake_block, snake_block])
+        if tail is not None:
+            end = lerp(tail, snake_list[0], alpha)
+            renderer.rect(black, [end[0], end[1], snake_block, snake_block])
+
+    def your_score(self, score):
+        return self.score_hud.draw(self.dis, [10, 10], "Score: ", score)
+
+    def draw_score(self, score):
+        self.score_area = self.your_score(score)
+        self.shown_score = score
+        self.renderer.mark(self.score_area)
+
+    def draw_changes(self, tail, snake_head, occupied, foodx, foody, score):
+        # Dirty-rect frame: erase the old tail, draw the new head and food,
+        # and repaint the score only when it changed or the snake crossed it
+        renderer = self.renderer
+        score_area = self.score_area
+        touched = False
+        if tail is not None and tail not in occupied:
+            tail_rect = pygame.Rect(tail[0], tail[1], snake_block, snake_block)
+            renderer.erase(tail_rect)
+            touched = score_area.colliderect(tail_rect)
+
+        food_rect = pygame.Rect(foodx, foody, snake_block, snake_block)
+        if score_area.colliderect(food_rect):
+            touched = True
+        elif (foodx, foody) not in occupied:
+            renderer.rect(green, food_rect)
+
+        head_rect = pygame.Rect(snake_head[0], snake_head[1], snake_block, snake_block)
+        renderer.rect(black, head_rect)
+        touched = touched or score_area.colliderect(head_rect)
+
+        if touched or score != self.shown_score:
+            area = score_area
+            renderer.erase(area)
+            if area.colliderect(food_rect) and (foodx, foody) not in occupied:
+                renderer.rect(green, food_rect)
+            for y in range(area.top - area.top % snake_block, area.bottom, snake_block):
+                for x in range(area.left - area.left % snake_block, area.right, snake_block):
+                    if (x, y) in occupied:
+                        renderer.rect(black, [x, y, snake_block, snake_block])
+            self.draw_score(score)
+
+    def message(self, msg, color, y_offset=0):
+        mesg = self.font_style.render(msg, True, color)
+        self.dis.blit(mesg, [width / 6, height / 3 + y_offset])
+
+    def restart(self):
+        self.x1 = width / 2
+        self.y1 = height / 2
+
+        self.x1_change = 0
+        self.y1_change = 0
+
+        self.snake_list.clear()
+        self.occupied.clear()
+        self.length_of_snake = 1
+
+        self.foodx = round(random.randrange(0, width - snake_block) / 10.0) * 10.0
+        self.foody = round(random.randrange(0, height - snake_block) / 10.0) * 10.0
+
+        self.snake_speed = snake_speed
+        self.prev_head = (self.x1, self.y1)
+        self.tail = None
+        self.accumulator = 0
+        self.turns.clear()
+        self.renderer.invalidate()
+        self.state_name = PLAYING
+
+    def state(self):
+        if self.over:
+            return None
+        return (self.x1, self.y1, self.length_of_snake, self.foodx, self.foody, self.snake_speed)
+
+    def step(self):
+        if self.state_name == RESTARTING:
+            self.restart()
+
+        self.over = self.state_name == GAME_OVER
+        if self.over:
+            for event in self.session.events():
+                if event.type == pygame.QUIT:
+                    self.state_name = QUIT
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_q:
-                        game_over = True
-                        game_close = False
+                        self.state_name = QUIT
                     if event.key == pygame.K_c:
-                        snake_speed = 15
-                        game_loop()
+                        self.state_name = RESTARTING
+            return self.state_name != QUIT
 
-        for event in pygame.event.get():
+        for event in self.session.events():
             if event.type == pygame.QUIT:
-                game_over = True
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_LEFT and x1_change == 0:
-                    x1_change = -snake_block
-                    y1_change = 0
-                elif event.key == pygame.K_RIGHT and x1_change == 0:
-                    x1_change = snake_block
-                    y1_change = 0
-                elif event.key == pygame.K_UP and y1_change == 0:
-                    y1_change = -snake_block
-                    x1_change = 0
-                elif event.key == pygame.K_DOWN and y1_change == 0:
-                    y1_change = snake_block
-                    x1_change = 0
-
-        # Check wall collision
-        if x1 >= width or x1 < 0 or y1 >= height or y1 < 0:
-            game_close = True
-
-        x1 += x1_change
-        y1 += y1_change
-        dis.fill(blue)
-        pygame.draw.rect(dis, green, [foodx, foody, snake_block, snake_block])
-        snake_head = []
-        snake_head.append(x1)
-        snake_head.append(y1)
-        snake_list.append(snake_head)
-        if len(snake_list) > length_of_snake:
-            del snake_list[0]
-
-        # Check self collision
-        for x in snake_list[:-1]:
-            if x == snake_head:
-                game_close = True
-
-        our_snake(snake_block, snake_list)
-        your_score(length_of_snake - 1)
-
-        pygame.display.update()
-
-        # Check if snake eats food
-        if x1 == foodx and y1 == foody:
-            foodx = round(random.randrange(0, width - snake_block) / 10.0) * 10.0
-            foody = round(random.randrange(0, height - snake_block) / 10.0) * 10.0
-            length_of_snake += 1
-            snake_speed += 1  # Increase speed
-
-        clock.tick(snake_speed)
-
-    pygame.quit()
-    quit()
-
-
-game_loop()
+                self.state_name = QUIT
+                return False
+            if event.type == pygame.KEYDOWN and event.key in TURN_KEYS:
+                self.turns.append(event.key)
+
+        # Fixed timestep: every display frame adds snake_speed / DISPLAY_FPS
+        # of a step (counted in frames so recordings replay exactly)
+        snake_list, occupied, turns = self.snake_list, self.occupied, self.turns
+        self.accumulator += self.snake_speed
+        while self.accumulator >= DISPLAY_FPS and self.state_name == PLAYING:
+            self.accumulator -= DISPLAY_FPS
+            if turns:
+                key = turns.popleft()
+                if key == pygame.K_LEFT and self.x1_change == 0:
+                    self.x1_change = -snake_block
+                    self.y1_change = 0
+                elif key == pygame.K_RIGHT and self.x1_change == 0:
+                    self.x1_change = snake_block
+                    self.y1_change = 0
+                elif key == pygame.K_UP and self.y1_change == 0:
+                    self.y1_change = -snake_block
+                    self.x1_change = 0
+                elif key == pygame.K_DOWN and self.y1_change == 0:
+                    self.y1_change = snake_block
+                    self.x1_change = 0
+
+            # Check wall collision
+            if self.x1 >= width or self.x1 < 0 or self.y1 >= height or self.y1 < 0:
+                self.state_name = GAME_OVER
+
+            self.prev_head = (self.x1, self.y1)
+            self.x1 += self.x1_change
+            self.y1 += self.y1_change
+            snake_head = (self.x1, self.y1)
+            self.tail = None
+            if len(snake_list) >= self.length_of_snake:
+                self.tail = snake_list.popleft()
+                occupied.discard(self.tail)
+
+            # Check self collision
+            if self.state_name == PLAYING and snake_head in occupied:
+                self.state_name = GAME_OVER
+
+            snake_list.append(snake_head)
+            occupied.add(snake_head)
+
+            # Check if snake eats food
+            if self.x1 == self.foodx and self.y1 == self.foody:
+                self.foodx = round(random.randrange(0, width - snake_block) / 10.0) * 10.0
+                self.foody = round(random.randrange(0, height - snake_block) / 10.0) * 10.0
+                self.length_of_snake += 1
+                self.snake_speed += 1  # Increase speed
+
+            # After the food check, so respawned food and the new score
+            # show on the same step as in full frames
+            if self.renderer.incremental:
+                self.draw_changes(self.tail, snake_head, occupied, self.foodx, self.foody,
+                                  self.length_of_snake - 1)
+        return True
+
+    def render(self):
+        renderer = self.renderer
+        if self.over:
+            self.dis.fill(blue)
+            self.message("You Lost! Press C-Play Again or Q-Quit", red)
+            self.your_score(self.length_of_snake - 1)
+            pygame.display.update()
+            renderer.invalidate()
+            return
+
+        if not renderer.incremental:
+            renderer.begin()
+            renderer.rect(green, [self.foodx, self.foody, snake_block, snake_block])
+            self.our_snake(snake_block, self.snake_list, self.prev_head, self.tail,
+                           1.0 if renderer.dirty else self.accumulator / DISPLAY_FPS)
+            self.draw_score(self.length_of_snake - 1)
+
+        renderer.present()
+
+
+if __name__ == "__main__":
+    game.main(Game)
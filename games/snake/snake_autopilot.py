@@ -0,0 +1,482 @@
+from itertools import chain
+
+from snake_sim import LEFT, RIGHT, UP, DOWN
+
+# Autopilot for a SnakeSim (snake_v2.py --autopilot, benchmarks/bench_snake_autopilot.py).
+#
+#     pilot = Autopilot(sim)
+#     while not sim.step(pilot()):
+#         ...
+#
+# The board is a bitboard: one Python int with a bit per cell, rows
+# `cols + 1` bits apart so the spare bit keeps a shifted row from wrapping
+# into the next. A breadth-first search expands its whole frontier at once
+# (four shifts, masked by the open cells), so each step of the search is a
+# handful of big-int operations however wide the board is. Body cells open
+# up as the search gets further out, in the order the tail will leave them,
+# and poison food counts as a wall.
+#
+# Search results are reused: a planned path is followed tick after tick and
+# only checked against the board (one cell, O(1)), and the body bitboard is
+# updated from each step's head and vacated cells instead of rebuilt.
+#
+# A path to food is only taken if, once there, the snake could still reach
+# its own tail (so it won't eat its way into a dead end); the way to the
+# tail is kept as the rest of the route. Otherwise it follows its tail,
+# which keeps it alive while the body moves, and tries the food again after
+# a while, backing off while the food stays out of reach.
+#
+# Searching the whole board in one tick blows the 1 ms tick budget on big
+# boards (up to about 7 ms at 200x200), so a new plan is spread over ticks
+# instead: searches are generators that stop after each layer, and a
+# planning job runs a few of those steps per tick (SEARCH_BUDGET cells'
+# worth, as a step costs about the board's size). Meanwhile the snake keeps
+# to the first cells of the route it already has (the bridge, e.g. the way
+# to the tail after eating), and the job plans from where the bridge ends,
+# on the board as it will be by then. Once it has a way to the food the
+# snake starts along it, and the check that it can reach its tail from
+# there carries on; it has to be done before the food is eaten. The budget
+# is counted in steps rather than time, so replays make the same moves.
+# A tick still plans in one go when there is no route to follow (a new
+# round, a blocked path) or the head gets to the end of what has been
+# planned first. max_depth still caps a search, at the cost of not seeing
+# food further away.
+
+RETRY_TICKS = 16           # first wait before looking for food again while chasing the tail
+MAX_RETRY_TICKS = 512      # longest wait
+SEARCH_BUDGET = 1_250_000  # board cells searched per tick (about 0.6 ms)
+BRIDGE_STEPS = 32          # most of the current route kept to while planning from its end
+BRIDGE_MARGIN = 2          # a bridge long enough for this many times the food search's ticks
+WALK_CELLS = 8             # path cells traced back per search step (cheaper than a layer)
+
+
+def finish(steps):
+    # Runs a search generator to the end and returns its result
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+
+class Autopilot:
+    def __init__(self, sim, max_depth=None):
+        self.sim = sim
+        self.cols = sim.cols
+        self.rows = sim.rows
+        self.stride = sim.cols + 1
+        # Searches give up past this many steps (bounds their time and memory)
+        self.max_depth = max_depth or 4 * (self.cols + self.rows)
+        self.budget = max(1, SEARCH_BUDGET // (self.rows * self.stride))  # search steps per tick
+        row = (1 << self.cols) - 1
+        self.board = sum(row << (r * self.stride) for r in range(self.rows))
+        self.moves = {1: RIGHT, -1: LEFT, self.stride: DOWN, -self.stride: UP}
+
+        self.synced = None  # sim.ticks the bitboards were last brought up to
+        self.path = []      # cells still to visit, next one last
+        self.path_tick = 0  # sim.ticks when it was planned
+        self.chasing = False  # following the tail rather than heading for food
+        self.goal = None    # (food, special food) the path was planned for
+        self.retry_at = 0
+        self.retry_wait = RETRY_TICKS
+        self.job = None     # planning from the end of the path, a few steps a tick
+        self.unchecked = False  # the path leads to food not yet known to be safe to eat
+        self.worked = None  # sim.ticks the job last ran
+        # Counters for benchmarks
+        self.searches = 0
+        self.search_layers = 0
+        self.tail_chases = 0
+        self.stuck = 0
+        self.jobs = 0
+        self.overruns = 0  # ticks that searched past the budget (the path ran out first)
+
+    def bit(self, pos):
+        # Bit index of a pixel position (None off the board)
+        block = self.sim.block
+        col = int(pos[0] // block)
+        row = int(pos[1] // block)
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.stride + col
+        return None
+
+    def mask(self, positions):
+        return self.cell_mask(map(self.bit, positions))
+
+    def cell_mask(self, cells):
+        # Builds in a bytearray: setting bits on an int one by one copies it every time
+        buf = bytearray((self.rows * self.stride + 7) // 8)
+        for cell in cells:
+            if cell is not None:
+                buf[cell >> 3] |= 1 << (cell & 7)
+        return int.from_bytes(buf, "little")
+
+    def sync(self):
+        sim = self.sim
+        if self.synced is not None and sim.ticks == self.synced + 1:
+            # One step since last time: the new head and the cells it left
+            head = self.bit((sim.x, sim.y))
+            if head is not None:
+                self.body |= 1 << head
+            if self.path:
+                if self.path[-1] == head:
+                    self.path.pop()
+                else:
+                    self.path = []  # steered off it (a key press)
+                    self.job = None
+                    self.unchecked = False
+            occupied = sim.occupied
+            for pos in sim.vacated:
+                cell = self.bit(pos)
+                if cell is not None and pos not in occupied:
+                    self.body &= ~(1 << cell)
+        elif sim.ticks != self.synced:
+            # New round (or a sim we haven't seen every step of): start over
+            self.walls = self.mask(sim.obstacle_cells)
+            self.body = self.mask(sim.snake_list)
+            self.path = []
+            self.job = None
+            self.unchecked = False
+            self.worked = None
+            self.chasing = False
+            self.retry_wait = RETRY_TICKS
+            self.retry_at = 0
+        self.synced = sim.ticks
+
+    def __call__(self):
+        # The action for the sim's next step (None: keep going). Calling
+        # it again before the sim steps gives the same answer.
+        sim = self.sim
+        self.sync()
+        head = self.bit((sim.x, sim.y))
+        if head is None:
+            return None
+        goal = (sim.food, sim.special_food)
+
+        if self.job is not None and (goal != self.goal or self.path and not self.safe(self.path[-1])):
+            self.job = None  # planned for a board that has changed since
+            self.unchecked = False
+        if self.path and goal != self.goal:
+            # Food eaten or new food that may lie on the path
+            if self.chasing and sim.ticks < self.retry_at:
+                self.path = []
+            else:
+                self.start_job(head, goal)
+        if self.path and self.chasing and self.job is None and self.path_tick != sim.ticks:
+            # The tail has moved on: aim for where it is now (the way to
+            # where it was can run over the cells it is about to free)
+            self.path = []
+        if self.path and not self.safe(self.path[-1]):
+            self.path = []
+        if not self.path and self.job is None:
+            self.plan(head, goal)
+            self.path_tick = sim.ticks
+        if self.job is not None and self.worked != sim.ticks:
+            self.worked = sim.ticks
+            self.work(head, goal)
+        if not self.path:
+            self.stuck += 1
+            return self.last_resort(head)
+        return self.moves[self.path[-1] - head]
+
+    def safe(self, cell):
+        # Can the head move into `cell` on the next step?
+        sim = self.sim
+        block = sim.block
+        row, col = divmod(cell, self.stride)
+        pos = (float(col * block), float(row * block))
+        if pos in sim.obstacle_cells:
+            return False
+        poison = sim.poison_food
+        if poison and pos[0] == poison[0] and pos[1] == poison[1]:
+            return False
+        count = sim.occupied.get(pos, 0)
+        if not count:
+            return True
+        # Only the tail, and only if it moves this step
+        body = sim.snake_list
+        return count == 1 and body[0] == pos and len(body) >= sim.length
+
+    def blocked(self):
+        # Walls for a search from here: obstacles, poison and the body
+        sim = self.sim
+        blocked = self.walls | self.body
+        if sim.poison_food:
+            cell = self.bit(sim.poison_food)
+            if cell is not None:
+                blocked |= 1 << cell
+        return blocked
+
+    def body_cells(self):
+        # Body cells, tail first, as bits (lazily: searches rarely need them all)
+        bit = self.bit
+        return (bit(pos) for pos in self.sim.snake_list)
+
+    def reverse(self, head):
+        # The cell behind the head, which steer() won't turn back into
+        sim = self.sim
+        if not (sim.dx or sim.dy):
+            return None
+        return self.bit((sim.x - sim.dx, sim.y - sim.dy))
+
+    def goal_cells(self, goal):
+        # Bits of the food cells
+        cells = 0
+        for item in goal:
+            cell = item and self.bit(item)
+            if cell is not None:
+                cells |= 1 << cell
+        return cells
+
+    def plan(self, head, goal):
+        # Nothing to follow: plan from here (this tick searches at least
+        # as far as a way to the food). While chasing the tail, the food is
+        # looked for again from along the way to the tail instead.
+        sim = self.sim
+        self.goal = goal
+        if self.chasing:
+            retry = sim.ticks >= self.retry_at
+            self.chase(head, goal)
+            if not retry:
+                return
+            if self.path:
+                self.start_job(head, goal)
+            if self.job is not None:
+                return
+        self.job = self.planner(head, [], goal)
+        self.unchecked = False
+        self.jobs += 1
+
+    def start_job(self, head, goal):
+        # Keep to the first cells of the path (short of any food on it) and
+        # plan from where they end
+        self.goal = goal
+        items = self.goal_cells(goal)
+        bridge = []
+        for cell in reversed(self.path[len(self.path) - self.bridge_length(goal):]):
+            if items >> cell & 1:
+                break
+            bridge.append(cell)
+        self.path = bridge[::-1]
+        self.unchecked = False
+        self.job = None
+        if bridge:
+            self.job = self.planner(head, bridge, goal)
+            self.jobs += 1
+
+    def bridge_length(self, goal):
+        # Enough cells for the food search to be done before the head gets
+        # to the end of them, most of the time: it takes about a step per
+        # cell of the distance (more around walls and body). Every cell of
+        # the bridge is a detour, so none if it should be done this tick.
+        sim = self.sim
+        distance = int(min((abs(item[0] - sim.x) + abs(item[1] - sim.y) for item in goal if item),
+                           default=0) // sim.block)
+        ticks = BRIDGE_MARGIN * distance // self.budget
+        return min(BRIDGE_STEPS, ticks + 2) if ticks else 0
+
+    def work(self, head, goal):
+        # Runs the job for this tick's budget, and on past it if the head
+        # would otherwise get beyond what has been planned: the end of the
+        # bridge, or the food before it is known to be safe
+        job = self.job
+        steps = 0
+        while steps < self.budget or len(self.path) <= self.unchecked:
+            if steps == self.budget:
+                self.overruns += 1
+            steps += 1
+            try:
+                found = next(job)
+            except StopIteration as done:
+                self.job = None
+                self.adopt(done.value, head, goal)
+                return
+            if found:
+                # The way to the food: start along it while the job checks it
+                self.path = found + self.path
+                self.unchecked = True
+
+    def adopt(self, route, head, goal):
+        # A finished job: the way on from the food to the tail (None if the
+        # food can't be reached safely)
+        sim = self.sim
+        self.path_tick = sim.ticks
+        if route is not None:
+            self.path = route + self.path
+            self.unchecked = False
+            self.chasing = False
+            self.retry_wait = RETRY_TICKS
+            return
+        self.retry_at = sim.ticks + self.retry_wait
+        self.retry_wait = min(MAX_RETRY_TICKS, self.retry_wait * 2)
+        if self.unchecked:
+            self.path = []  # not to that food, then
+            self.unchecked = False
+        if self.path:
+            self.chasing = True  # the rest of the path, then after the tail
+        else:
+            self.chase(head, goal)
+
+    def chase(self, head, goal):
+        # No safe way to the food: follow the tail, around the food (eating
+        # would hold the tail back and break the path's timing)
+        sim = self.sim
+        self.chasing = True
+        self.tail_chases += 1
+        self.path = []
+        tail = self.bit(sim.snake_list[0])
+        if tail is not None and tail != head:
+            blocked = self.blocked() | self.goal_cells(goal)
+            growing = sim.length - len(sim.snake_list)  # steps before the tail moves again
+            self.path = self.search(head, self.reverse(head), blocked, self.body_cells(), growing, 1 << tail)
+
+    def planner(self, head, bridge, goal):
+        # Planning job, one search step per next(). Finds a way to food
+        # from the end of `bridge` (the cells the head walks first, first
+        # move first; [] to start from the head) and yields it, next cell
+        # last, as soon as it has it; then checks that once there the snake
+        # could still reach its own tail. Returns the way on to where the
+        # tail will be, or None if there is no safe way to the food.
+        sim = self.sim
+        body = list(sim.snake_list)  # the sim moves on while this runs
+        growing = sim.length - len(body)
+        walls = self.blocked()
+        if bridge:
+            start = bridge[-1]
+            reverse = bridge[-2] if len(bridge) > 1 else head
+        else:
+            start, reverse = head, self.reverse(head)
+        blocked, cells, delay = self.after(bridge, walls, body, growing)
+        path = yield from self.search_steps(start, reverse, blocked, cells, delay, self.goal_cells(goal))
+        if not path:
+            return None
+        yield path
+
+        route = bridge + path[::-1]
+        blocked, cells, delay = self.after(route, walls, body, growing)
+        tail = next(cells, None)
+        if tail is None:
+            return []
+        special = goal[1]
+        eaten = 3 if special and self.bit(special) == path[0] else 1
+        before = route[-2] if len(route) > 1 else head
+        escape = yield from self.search_steps(path[0], before, blocked, chain([tail], cells),
+                                              delay + eaten, 1 << tail)
+        return escape or None
+
+    def after(self, route, blocked, body, growing):
+        # The board once the head has walked `route` (cells, first move
+        # first) from `body` (positions, tail first) with `growing` steps
+        # before the tail moves: the blocked cells, the body cells tail
+        # first, and the steps before the tail moves again. The body is
+        # the old one and the route, less what the tail has pulled off the
+        # front of that on the way.
+        steps = len(route)
+        popped = max(0, steps - growing)
+        left = min(popped, len(body))
+        kept = route[popped - left:]
+        blocked = blocked & ~self.mask(body[:left]) | self.cell_mask(kept)
+        return blocked, chain(map(self.bit, body[left:]), kept), max(0, growing - steps)
+
+    def search(self, start, reverse, blocked, body, delay, targets):
+        return finish(self.search_steps(start, reverse, blocked, body, delay, targets))
+
+    def search_steps(self, start, reverse, blocked, body, delay, targets):
+        # Shortest path from `start` to any cell in `targets`, next cell
+        # last ([] if none within max_depth), returned by a generator that
+        # stops after each layer and each WALK_CELLS cells of the walk
+        # back. `body` yields the blocked body cells tail first; after
+        # `delay` steps one of them opens per step.
+        stride = self.stride
+        walls = self.walls
+        open_cells = self.board & ~blocked
+        frontier = 1 << start
+        layers = []
+        step = 0
+        self.searches += 1
+        while frontier and step < self.max_depth:
+            if step:
+                yield
+            step += 1
+            self.search_layers += 1
+            if step > delay:
+                cell = next(body, None)
+                if cell is not None and not walls >> cell & 1:
+                    open_cells |= 1 << cell
+            reached = (frontier << 1 | frontier >> 1 | frontier << stride | frontier >> stride) & open_cells
+            if step == 1 and reverse is not None:
+                reached &= ~(1 << reverse)
+            layers.append(reached)
+            if reached & targets:
+                break
+            open_cells ^= reached
+            frontier = reached
+        hit = layers[-1] & targets if layers else 0
+        if not hit:
+            return []
+
+        # Walk back through the layers
+        cell = (hit & -hit).bit_length() - 1
+        path = [cell]
+        for layer in reversed(layers[:-1]):
+            if len(path) % WALK_CELLS == 0:
+                yield
+            for neighbour in (cell - 1, cell + 1, cell - stride, cell + stride):
+                if neighbour >= 0 and layer >> neighbour & 1:
+                    cell = neighbour
+                    break
+            path.append(cell)
+        return path
+
+    def flood(self, start, blocked, body, delay, targets=0):
+        # Cells the head could get to from `start` if it loops around while
+        # the body moves off (search() only goes straight). Looping takes
+        # room: the head can't cross its own trail, so reaching a target k
+        # steps away needs k cells to walk through. Returns (reached a
+        # target with room to spare, number of cells reached).
+        stride = self.stride
+        walls = self.walls
+        open_cells = self.board & ~blocked & ~(1 << start)
+        seen = 1 << start
+        step = 0
+        while step < self.max_depth:
+            step += 1
+            opened = False
+            if step > delay:
+                cell = next(body, None)
+                if cell is not None and not walls >> cell & 1:
+                    open_cells |= 1 << cell
+                    opened = True
+            reached = (seen << 1 | seen >> 1 | seen << stride | seen >> stride) & open_cells
+            if reached & targets:
+                self.search_layers += step
+                room = seen.bit_count()
+                return room >= step, room
+            if not reached and not opened and step > delay:
+                break
+            open_cells ^= reached
+            seen |= reached
+        self.search_layers += step
+        return False, seen.bit_count()
+
+    def last_resort(self, head):
+        # No straight path to food or tail: a move from which the tail can
+        # still be reached, hugging walls and body to leave open space in
+        # one piece; failing that, the move with the most room
+        sim = self.sim
+        best, best_score = None, None
+        reverse = self.reverse(head)
+        blocked = self.blocked()
+        growing = sim.length - len(sim.snake_list)
+        tail = self.bit(sim.snake_list[0])
+        for delta, action in self.moves.items():
+            cell = head + delta
+            if cell < 0 or cell == reverse or not self.board >> cell & 1 or not self.safe(cell):
+                continue
+            escaped, room = self.flood(cell, blocked, self.body_cells(), growing - 1,
+                                       0 if tail is None else 1 << tail)
+            open_cells = self.board & ~blocked
+            hugged = sum(1 for d in self.moves if cell + d < 0 or not open_cells >> (cell + d) & 1)
+            score = (escaped, hugged if escaped else room)
+            if best_score is None or score > best_score:
+                best, best_score = action, score
+        return best
@@ -0,0 +1,340 @@
+import random
+from array import array
+from collections import deque
+
+# Headless simulation core for Snake Game Plus.
+# No pygame in here: snake_v2.py draws a SnakeSim, bots and soak tests
+# can call step() as fast as they like.
+
+# Actions
+LEFT = "left"
+RIGHT = "right"
+UP = "up"
+DOWN = "down"
+
+POWER_UPS = ["slow", "double", "invincible"]
+
+
+# Free cells of the board as a dense array of cell ids plus each id's slot
+# in that array (-1 when taken). Taking a cell swaps the last free id into
+# its slot, so take, give back and a uniform random pick are all O(1) no
+# matter how full the board is.
+class FreeCells:
+    def __init__(self, size):
+        self.size = size
+        self.all_ids = array("i", range(size))
+        self.ids = array("i", self.all_ids)
+        self.slot = array("i", self.all_ids)
+        self.count = size
+
+    def fill(self):
+        self.ids[:] = self.all_ids
+        self.slot[:] = self.all_ids
+        self.count = self.size
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, cell):
+        return self.slot[cell] >= 0
+
+    def take(self, cell):
+        slot = self.slot
+        i = slot[cell]
+        if i < 0:
+            return
+        last = self.count - 1
+        moved = self.ids[last]
+        self.ids[i] = moved
+        slot[moved] = i
+        self.ids[last] = cell
+        slot[cell] = -1
+        self.count = last
+
+    def give(self, cell):
+        if self.slot[cell] >= 0:
+            return
+        self.ids[self.count] = cell
+        self.slot[cell] = self.count
+        self.count += 1
+
+    def pick(self, rng):
+        if not self.count:
+            return None
+        return self.ids[rng.randrange(self.count)]
+
+
+class SnakeSim:
+    def __init__(self, width=600, height=400, block=10, speed=15, obstacles=10, seed=None,
+                 start_length=1, invincible=False):
+        self.width = width
+        self.height = height
+        self.block = block
+        self.start_speed = speed
+        self.num_obstacles = obstacles
+        self.start_length = start_length
+        self.invincible = invincible  # ignore self/obstacle hits (stress runs)
+        self.rng = random.Random(seed)
+        self.profiler = None  # optional common.profiler.FrameProfiler
+
+        # Body is a deque (head at the right) plus a cell -> count occupancy
+        # map, so moving, growing, shrinking and self-collision are all O(1).
+        # reset() clears these in place, so restarts reuse the same objects.
+        self.snake_list = deque()
+        self.occupied = {}
+        self.obstacles = []
+        self.obstacle_cells = set()
+
+        # Cells not under the body, an obstacle or an item; every spawn
+        # picks from here, so nothing lands on anything else
+        self.cols = int(width // block)
+        self.rows = int(height // block)
+        self.free = FreeCells(self.cols * self.rows)
+        self.reset()
+
+    def reset(self):
+        rng = self.rng
+        block = self.block
+
+        self.x = self.width / 2
+        self.y = self.height / 2
+        self.dx = 0
+        self.dy = 0
+
+        self.snake_list.clear()
+        self.occupied.clear()
+        self.vacated = []  # tail cells freed by the last step (for dirty redraws)
+        self.length = self.start_length
+        self.speed = self.start_speed
+        self.game_close = False
+        self.ticks = 0
+
+        self.free.fill()
+        self.lay_body()
+        self.prev_head = (self.x, self.y)  # head before the last step (for interpolation)
+
+        # Obstacles
+        self.obstacles[:] = []
+        for _ in range(self.num_obstacles):
+            cell = self.spawn()
+            if cell is None:
+                break
+            self.obstacles.append(cell)
+        self.obstacle_cells.clear()
+        self.obstacle_cells.update((obs[0], obs[1]) for obs in self.obstacles)
+
+        self.food = self.spawn()
+
+        # Special foods
+        self.special_food = None
+        self.poison_food = None
+
+        # Power-up
+        self.power_up = None
+        self.power_up_timer = 0
+        self.power_active = None
+
+    def lay_body(self):
+        body = self.snake_list
+        occupied = self.occupied
+        if self.length == 1:
+            cells = [(self.x, self.y)]
+        else:
+            # Start with the whole body on the board: serpentine rows from
+            # the top-left, head last, heading down into the free space below
+            block = self.block
+            cols = self.cols
+            cells = []
+            for i in range(self.length):
+                row, col = divmod(i, cols)
+                if row % 2:
+                    col = cols - 1 - col
+                cells.append((float(col * block), float(row * block)))
+            self.dx, self.dy = 0, block
+        for cell in cells:
+            body.append(cell)
+            occupied[cell] = occupied.get(cell, 0) + 1
+            cell_id = self.cell_id(cell)
+            if cell_id is not None:
+                self.free.take(cell_id)
+        self.x, self.y = body[-1]
+
+    def cell_id(self, pos):
+        col = int(pos[0] // self.block)
+        row = int(pos[1] // self.block)
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+        return None
+
+    def spawn(self):
+        # A random free cell, taken for the caller; None when the board is full
+        cell = self.free.pick(self.rng)
+        if cell is None:
+            return None
+        self.free.take(cell)
+        row, col = divmod(cell, self.cols)
+        return [col * self.block, row * self.block]
+
+    @property
+    def head(self):
+        return [self.x, self.y]
+
+    @property
+    def score(self):
+        score = self.length - 1
+        if self.power_active == "double":
+            score *= 2
+        return score
+
+    def state(self):
+        # Everything that decides the next tick, for replay checkpoints
+        return (self.x, self.y, self.dx, self.dy, self.length, self.speed, self.food,
+                self.special_food, self.poison_food, self.power_up, self.power_active,
+                self.power_up_timer, self.game_close)
+
+    def steer(self, action):
+        block = self.block
+        if action == LEFT and self.dx == 0:
+            self.dx, self.dy = -block, 0
+        elif action == RIGHT and self.dx == 0:
+            self.dx, self.dy = block, 0
+        elif action == UP and self.dy == 0:
+            self.dx, self.dy = 0, -block
+        elif action == DOWN and self.dy == 0:
+            self.dx, self.dy = 0, block
+
+    def step(self, action=None):
+        rng = self.rng
+        profiler = self.profiler
+        self.ticks += 1
+        vacated = self.vacated = []
+
+        if action is not None:
+            self.steer(action)
+        self.prev_head = (self.x, self.y)
+
+        # Check wall collision
+        if self.x >= self.width or self.x < 0 or self.y >= self.height or self.y < 0:
+            self.game_close = True
+
+        self.x += self.dx
+        self.y += self.dy
+        x1, y1 = self.x, self.y
+        if profiler:
+            profiler.mark("movement")
+
+        # Randomly spawn special food, poison food and power-up
+        if self.special_food is None and rng.randint(0, 100) < 2:
+            self.special_food = self.spawn()
+        if self.poison_food is None and rng.randint(0, 100) < 2:
+            self.poison_food = self.spawn()
+        if self.power_up is None and rng.randint(0, 200) < 1:
+            self.power_up = self.spawn()
+        if profiler:
+            profiler.mark("spawning")
+
+        # Snake mechanics
+        snake_head = (x1, y1)
+        body = self.snake_list
+        occupied = self.occupied
+        free = self.free
+        body.append(snake_head)
+        occupied[snake_head] = occupied.get(snake_head, 0) + 1
+        cell = self.cell_id(snake_head)
+        if cell is not None:
+            free.take(cell)
+        while len(body) > self.length:
+            tail = body.popleft()
+            vacated.append(tail)
+            if occupied[tail] == 1:
+                del occupied[tail]
+                # Items are eaten when the head arrives, so only an
+                # obstacle (run over while invincible) can still be there
+                cell = self.cell_id(tail)
+                if cell is not None and tail not in self.obstacle_cells:
+                    free.give(cell)
+            else:
+                occupied[tail] -= 1
+        if profiler:
+            profiler.mark("movement")
+
+        # Check collisions
+        if not self.invincible and self.power_active != "invincible":
+            if occupied[snake_head] > 1 or snake_head in self.obstacle_cells:
+                self.game_close = True
+
+        # Check food eaten (its cell now belongs to the head)
+        food = self.food
+        if food and x1 == food[0] and y1 == food[1]:
+            self.food = self.spawn()
+            self.length += 1
+            self.speed += 1
+
+        special = self.special_food
+        if special and x1 == special[0] and y1 == special[1]:
+            self.length += 3  # bonus
+            self.speed += 2
+            self.special_food = None
+
+        poison = self.poison_food
+        if poison and x1 == poison[0] and y1 == poison[1]:
+            self.length = max(1, self.length - 2)
+            self.poison_food = None
+
+        power = self.power_up
+        if power and x1 == power[0] and y1 == power[1]:
+            self.power_active = rng.choice(POWER_UPS)
+            self.power_up = None
+            self.power_up_timer = 100  # lasts for some ticks
+
+        # Power-up effects ("double" is applied in score, "invincible" above)
+        if self.power_active == "slow":
+            self.speed = max(10, self.speed - 5)
+
+        if self.power_active:
+            self.power_up_timer -= 1
+            if self.power_up_timer <= 0:
+                self.power_active = None
+        if profiler:
+            profiler.mark("collision")
+
+        return self.game_close
+
+
+# Session states
+PLAYING = "playing"
+GAME_OVER = "game_over"
+RESTARTING = "restarting"
+QUIT = "quit"
+
+
+# Round-to-round state machine around one SnakeSim.
+# Restarting resets the same sim in place instead of starting a new game
+# loop, so a session can run for any number of rounds in constant memory.
+class SnakeSession:
+    def __init__(self, sim):
+        self.sim = sim
+        self.state = PLAYING
+        self.rounds = 1
+
+    def step(self, action=None):
+        if self.state == RESTARTING:
+            self.new_round()
+        if self.state == PLAYING:
+            if self.sim.step(action):
+                self.state = GAME_OVER
+        return self.state
+
+    def restart(self):
+        if self.state == GAME_OVER:
+            self.state = RESTARTING
+
+    def new_round(self):
+        # What the next step() does after restart(), for a caller that
+        # draws the new round before stepping it
+        self.sim.reset()
+        self.rounds += 1
+        self.state = PLAYING
+
+    def quit(self):
+        self.state = QUIT
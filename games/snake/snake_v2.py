@@ -1,236 +1,198 @@
 import pygame
-import time
-import random
 import os
-
-# Initialize pygame
-pygame.init()
+import sys
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.fonts import fonts
+from common import game, replay
+from common.hud import Hud
+from common.profiler import FrameProfiler
+from common.render import Renderer
+from common.scores import shared_store
+from snake_sim import SnakeSim, SnakeSession, LEFT, RIGHT, UP, DOWN, PLAYING, GAME_OVER, QUIT
+from snake_autopilot import Autopilot
+from snake_view import SnakeView, red, blue
 
 # Screen size
 width = 600
 height = 400
 
-# Colors
-white = (255, 255, 255)
-black = (0, 0, 0)
-red = (213, 50, 80)
-green = (0, 255, 0)
-blue = (50, 153, 213)
-yellow = (255, 255, 0)
-purple = (160, 32, 240)
-
-# Create screen
-dis = pygame.display.set_mode((width, height))
-pygame.display.set_caption("🐍 Snake Game Plus")
-
-# Clock
-clock = pygame.time.Clock()
-
 # Snake block size
 snake_block = 10
 
-# Initial speed
+# Initial speed (sim steps per second)
 snake_speed = 15
 
-# Font
-font_style = pygame.font.SysFont("bahnschrift", 25)
-score_font = pygame.font.SysFont("comicsansms", 30)
-
-# High score file
-HIGH_SCORE_FILE = "highscore.txt"
-
-
-def load_high_score():
-    if os.path.exists(HIGH_SCORE_FILE):
-        with open(HIGH_SCORE_FILE, "r") as f:
-            return int(f.read().strip() or 0)
-    return 0
-
-
-def save_high_score(score):
-    high_score = load_high_score()
-    if score > high_score:
-        with open(HIGH_SCORE_FILE, "w") as f:
-            f.write(str(score))
-
-
-def our_snake(snake_block, snake_list):
-    for x in snake_list:
-        pygame.draw.rect(dis, black, [x[0], x[1], snake_block, snake_block])
-
-
-def your_score(score, high_score):
-    value = score_font.render(f"Score: {score}  High: {high_score}", True, red)
-    dis.blit(value, [10, 10])
-
-
-def message(msg, color, y_offset=0):
-    mesg = font_style.render(msg, True, color)
-    dis.blit(mesg, [width / 6, height / 3 + y_offset])
-
-
-def game_loop():
-    game_over = False
-    game_close = False
-
-    x1 = width / 2
-    y1 = height / 2
-
-    x1_change = 0
-    y1_change = 0
-
-    snake_list = []
-    length_of_snake = 1
-
-    foodx = round(random.randrange(0, width - snake_block) / 10.0) * 10.0
-    foody = round(random.randrange(0, height - snake_block) / 10.0) * 10.0
-
-    # Obstacles
-    obstacles = [[random.randrange(0, width, 10), random.randrange(0, height, 10)] for _ in range(10)]
-
-    # Special foods
-    special_food = None
-    poison_food = None
-
-    # Power-up
-    power_up = None
-    power_up_timer = 0
-    power_active = None
-
-    global snake_speed
-    high_score = load_high_score()
-
-    while not game_over:
-
-        while game_close:
-            dis.fill(blue)
-            message("You Lost! Press C-Play Again or Q-Quit", red)
-            your_score(length_of_snake - 1, high_score)
-            pygame.display.update()
-
-            for event in pygame.event.get():
+# Display rate; the sim runs at its own speed on top of it
+DISPLAY_FPS = 60
+
+# Leaderboard name, and the old per-directory high score file (imported once)
+GAME_NAME = "snake_v2"
+LEGACY_HIGH_SCORE_FILE = "highscore.txt"
+
+# Presets where snake_autopilot.py plays (`--autopilot` is the first one)
+AUTOPILOT_PRESETS = ("autopilot", "autopilot_200")
+
+KEY_ACTIONS = {
+    pygame.K_LEFT: LEFT,
+    pygame.K_RIGHT: RIGHT,
+    pygame.K_UP: UP,
+    pygame.K_DOWN: DOWN,
+}
+
+
+class Game:
+    size = (width, height)
+    # Stress presets (benchmarks/run_benchmarks.py) play on bigger boards
+    preset_sizes = {"long_snake": (1200, 1200), "autopilot_200": (2000, 2000)}
+    caption = "🐍 Snake Game Plus"
+    fps = DISPLAY_FPS
+
+    def __init__(self, screen):
+        self.screen = screen
+
+        # Input session (seeded RNG, optional recording / replay)
+        self.session = replay.Session(__file__, [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+                                                 pygame.K_c, pygame.K_q],
+                                      script_keys=[pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+                                                   pygame.K_c],
+                                      preset="autopilot" if "--autopilot" in sys.argv else None)
+
+        # Stress presets (benchmarks/run_benchmarks.py): a 5,000 segment snake,
+        # or the autopilot on a 200x200 board (the preset may come from a
+        # replay log). The board is the display, sized from preset_sizes.
+        sim_options = {}
+        if self.session.preset == "long_snake":
+            sim_options = {"start_length": 5000, "invincible": True}
+        elif self.session.preset == "autopilot_200":
+            sim_options = {"obstacles": 400}
+        board = screen.get_size()
+
+        # Font
+        self.font_style = fonts.get("bahnschrift", 25)
+        self.score_hud = Hud(fonts.get("comicsansms", 30), red)
+
+        # Renderer (full frames by default, `--dirty` for dirty rectangles)
+        self.renderer = Renderer(screen, blue)
+        self.view = SnakeView(self.renderer, self.score_hud, snake_block)
+
+        # Per-phase frame timings (F3 shows the overlay)
+        self.profiler = FrameProfiler()
+        self.small_font = fonts.get(None, 22)
+
+        # Autopilot: plays by itself and starts a new round when it dies
+        # (arrow keys do nothing)
+        autopilot = self.session.preset in AUTOPILOT_PRESETS
+
+        # Leaderboard (shared with the other games, saved in the background);
+        # replays, benchmarks and the autopilot don't post scores
+        self.scores = shared_store(read_only=bool(self.session.replaying or self.session.bench or autopilot))
+        if not self.scores.top(GAME_NAME) and not self.scores.read_only and os.path.exists(LEGACY_HIGH_SCORE_FILE):
+            with open(LEGACY_HIGH_SCORE_FILE) as f:
+                legacy_score = int(f.read().strip() or 0)
+            if legacy_score:
+                self.scores.submit(GAME_NAME, legacy_score)
+
+        self.play = SnakeSession(SnakeSim(board[0], board[1], snake_block, speed=snake_speed,
+                                          seed=self.session.seed, **sim_options))
+        self.sim = self.play.sim
+        self.sim.profiler = self.profiler
+        self.autopilot = Autopilot(self.sim) if autopilot else None
+        self.high_score = self.scores.best(GAME_NAME)
+        self.submitted = False  # this round's score is on the board
+        self.accumulator = 0
+        self.stepped = False
+        self.over = False  # this frame shows the game over screen
+        self.turns = deque(maxlen=3)  # key presses wait for their step, one turn per step
+
+    def your_score(self, score, high_score):
+        return self.score_hud.draw(self.screen, [10, 10], "Score: ", score, "  High: ", high_score)
+
+    def message(self, msg, color, y_offset=0):
+        mesg = self.font_style.render(msg, True, color)
+        w, h = self.screen.get_size()
+        self.screen.blit(mesg, [w / 6, h / 3 + y_offset])
+
+    def state(self):
+        return None if self.over else self.sim.state()
+
+    def restart(self):
+        # The new round starts now rather than at its first sim step, so
+        # the frames until then show it (not the dead snake interpolated)
+        # and the step timing runs at its starting speed
+        self.play.restart()
+        self.play.new_round()
+        self.submitted = False
+        self.accumulator = 0
+        self.stepped = False
+        self.turns.clear()
+
+    def step(self):
+        play, sim = self.play, self.sim
+
+        self.over = play.state == GAME_OVER
+        if self.over:
+            self.accumulator = 0
+            self.turns.clear()
+            if not self.submitted:
+                self.scores.submit(GAME_NAME, sim.length - 1)
+                self.high_score = self.scores.best(GAME_NAME)
+                self.submitted = True
+
+            for event in self.session.events():
+                if event.type == pygame.QUIT:
+                    play.quit()
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_q:
-                        save_high_score(length_of_snake - 1)
-                        game_over = True
-                        game_close = False
+                        play.quit()
                     if event.key == pygame.K_c:
-                        save_high_score(length_of_snake - 1)
-                        snake_speed = 15
-                        game_loop()
+                        self.restart()
+            if self.autopilot and play.state == GAME_OVER:
+                self.restart()
+            return play.state != QUIT
 
-        for event in pygame.event.get():
+        self.profiler.begin()
+        for event in self.session.events():
             if event.type == pygame.QUIT:
-                save_high_score(length_of_snake - 1)
-                game_over = True
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_LEFT and x1_change == 0:
-                    x1_change = -snake_block
-                    y1_change = 0
-                elif event.key == pygame.K_RIGHT and x1_change == 0:
-                    x1_change = snake_block
-                    y1_change = 0
-                elif event.key == pygame.K_UP and y1_change == 0:
-                    y1_change = -snake_block
-                    x1_change = 0
-                elif event.key == pygame.K_DOWN and y1_change == 0:
-                    y1_change = snake_block
-                    x1_change = 0
-
-        # Check wall collision
-        if x1 >= width or x1 < 0 or y1 >= height or y1 < 0:
-            game_close = True
-
-        x1 += x1_change
-        y1 += y1_change
-        dis.fill(blue)
-
-        # Draw regular food
-        pygame.draw.rect(dis, green, [foodx, foody, snake_block, snake_block])
-
-        # Draw obstacles
-        for obs in obstacles:
-            pygame.draw.rect(dis, purple, [obs[0], obs[1], snake_block, snake_block])
-
-        # Randomly spawn special food
-        if special_food is None and random.randint(0, 100) < 2:
-            special_food = [random.randrange(0, width, 10), random.randrange(0, height, 10)]
-        if special_food:
-            pygame.draw.rect(dis, yellow, [special_food[0], special_food[1], snake_block, snake_block])
-
-        # Randomly spawn poison food
-        if poison_food is None and random.randint(0, 100) < 2:
-            poison_food = [random.randrange(0, width, 10), random.randrange(0, height, 10)]
-        if poison_food:
-            pygame.draw.rect(dis, red, [poison_food[0], poison_food[1], snake_block, snake_block])
-
-        # Randomly spawn power-up
-        if power_up is None and random.randint(0, 200) < 1:
-            power_up = [random.randrange(0, width, 10), random.randrange(0, height, 10)]
-        if power_up:
-            pygame.draw.rect(dis, white, [power_up[0], power_up[1], snake_block, snake_block])
-
-        # Snake mechanics
-        snake_head = [x1, y1]
-        snake_list.append(snake_head)
-        if len(snake_list) > length_of_snake:
-            del snake_list[0]
-
-        # Check collisions
-        for x in snake_list[:-1]:
-            if x == snake_head and power_active != "invincible":
-                game_close = True
-
-        for obs in obstacles:
-            if snake_head == obs and power_active != "invincible":
-                game_close = True
-
-        # Check food eaten
-        if x1 == foodx and y1 == foody:
-            foodx = round(random.randrange(0, width - snake_block) / 10.0) * 10.0
-            foody = round(random.randrange(0, height - snake_block) / 10.0) * 10.0
-            length_of_snake += 1
-            snake_speed += 1
-
-        if special_food and x1 == special_food[0] and y1 == special_food[1]:
-            length_of_snake += 3  # bonus
-            snake_speed += 2
-            special_food = None
-
-        if poison_food and x1 == poison_food[0] and y1 == poison_food[1]:
-            length_of_snake = max(1, length_of_snake - 2)
-            poison_food = None
-
-        if power_up and x1 == power_up[0] and y1 == power_up[1]:
-            power_active = random.choice(["slow", "double", "invincible"])
-            power_up = None
-            power_up_timer = 100  # lasts for some ticks
-
-        # Power-up effects
-        if power_active == "slow":
-            snake_speed = max(10, snake_speed - 5)
-        elif power_active == "double":
-            pass  # applied on score display
-        elif power_active == "invincible":
-            pass
-
-        if power_active:
-            power_up_timer -= 1
-            if power_up_timer <= 0:
-                power_active = None
-
-        our_snake(snake_block, snake_list)
-        score_value = length_of_snake - 1
-        if power_active == "double":
-            score_value *= 2
-        your_score(score_value, high_score)
-
-        pygame.display.update()
-
-        clock.tick(snake_speed)
-
-    pygame.quit()
-    quit()
-
-
-game_loop()
+                self.scores.submit(GAME_NAME, sim.length - 1)
+                play.quit()
+                return False
+            if event.type == pygame.KEYDOWN and event.key in KEY_ACTIONS and not self.autopilot:
+                self.turns.append(KEY_ACTIONS[event.key])
+        self.profiler.mark("events")
+
+        # Fixed timestep: every display frame adds sim.speed / DISPLAY_FPS of
+        # a step. Time is counted in frames, not wall-clock, so recordings
+        # replay step for step.
+        self.accumulator += sim.speed
+        self.stepped = False
+        while self.accumulator >= DISPLAY_FPS and play.state == PLAYING:
+            self.accumulator -= DISPLAY_FPS
+            if self.autopilot:
+                play.step(self.autopilot())
+            else:
+                play.step(self.turns.popleft() if self.turns else None)
+            self.stepped = True
+        return True
+
+    def render(self):
+        if self.over:
+            self.screen.fill(blue)
+            self.message("You Lost! Press C-Play Again or Q-Quit", red)
+            self.your_score(self.sim.length - 1, self.high_score)
+            pygame.display.update()
+            self.renderer.invalidate()
+            return
+
+        renderer, profiler = self.renderer, self.profiler
+        self.view.draw(self.sim, self.high_score, self.accumulator / DISPLAY_FPS, self.stepped)
+        profiler.draw(renderer, self.small_font)
+        profiler.mark("drawing")
+        renderer.present()
+        profiler.mark("flip")
+        profiler.end()
+
+
+if __name__ == "__main__":
+    game.main(Game)
@@ -0,0 +1,133 @@
+from itertools import islice
+
+# Colors
+white = (255, 255, 255)
+black = (0, 0, 0)
+red = (213, 50, 80)
+green = (0, 255, 0)
+blue = (50, 153, 213)
+yellow = (255, 255, 0)
+purple = (160, 32, 240)
+
+
+def lerp(a, b, t):
+    return (a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t)
+
+
+# Draws a SnakeSim through a common.render.Renderer.
+# Full frames repaint everything, with the head and tail slid `alpha` of
+# the way from the previous step to the current one. Dirty frames only
+# touch what a step can change: the vacated tail cells, the new head, the
+# items, and the score overlay when its text changes or the snake passes
+# underneath it; frames without a step draw nothing.
+class SnakeView:
+    def __init__(self, renderer, score_hud, block=10):
+        self.renderer = renderer
+        self.score_hud = score_hud
+        self.block = block
+        self.score_value = None
+        self.score_rect = None
+        self.items_under_score = []
+
+    def cell(self, pos):
+        return (pos[0], pos[1], self.block, self.block)
+
+    def items(self, sim):
+        if sim.food:
+            yield green, sim.food
+        for obs in sim.obstacles:
+            yield purple, obs
+        if sim.special_food:
+            yield yellow, sim.special_food
+        if sim.poison_food:
+            yield red, sim.poison_food
+        if sim.power_up:
+            yield white, sim.power_up
+
+    def draw(self, sim, high_score, alpha=1.0, stepped=True):
+        score = (sim.score, high_score)
+        renderer = self.renderer
+        if renderer.incremental:
+            if stepped:
+                self.draw_changes(sim, score)
+        else:
+            # Dirty mode builds on this frame cell by cell: keep it exact
+            self.draw_full(sim, score, 1.0 if renderer.dirty else alpha)
+
+    def draw_full(self, sim, score, alpha=1.0):
+        renderer = self.renderer
+        size = (self.block, self.block)
+        renderer.begin()
+        renderer.blits(renderer.sprite(purple, size), sim.obstacles)
+        for color, pos in self.items(sim):
+            if color != purple:
+                renderer.rect(color, self.cell(pos))
+
+        # The body is one batch of pre-rendered cells
+        body = sim.snake_list
+        segment = renderer.sprite(black, size)
+        if alpha >= 1.0 or not body:
+            renderer.blits(segment, body)
+        else:
+            renderer.blits(segment, islice(body, len(body) - 1))
+            renderer.blit(segment, lerp(sim.prev_head, body[-1], alpha))
+            if sim.vacated:
+                renderer.blit(segment, lerp(sim.vacated[-1], body[0], alpha))
+        self.draw_score(score)
+
+    def draw_changes(self, sim, score):
+        renderer = self.renderer
+        occupied = sim.occupied
+        score_rect = self.score_rect
+        touched = False
+
+        # Erase the tail (unless another segment still sits on that cell)
+        for segment in sim.vacated:
+            if segment not in occupied:
+                cell = self.cell(segment)
+                renderer.erase(cell)
+                touched = touched or score_rect.colliderect(cell)
+
+        # Items are cheap to redraw; the body and the score overlay win
+        under_score = []
+        for color, pos in self.items(sim):
+            cell = self.cell(pos)
+            if score_rect.colliderect(cell):
+                under_score.append((color, pos[0], pos[1]))
+            elif (pos[0], pos[1]) not in occupied:
+                renderer.rect(color, cell)
+        if under_score != self.items_under_score:
+            self.items_under_score = under_score
+            touched = True
+
+        if sim.snake_list:
+            cell = self.cell(sim.snake_list[-1])
+            renderer.rect(black, cell)
+            touched = touched or score_rect.colliderect(cell)
+
+        if touched or score != self.score_value:
+            self.repaint_score_area(sim)
+            self.draw_score(score)
+
+    def repaint_score_area(self, sim):
+        # Clear the old overlay and put back whatever was underneath it
+        renderer = self.renderer
+        area = self.score_rect
+        block = self.block
+        occupied = sim.occupied
+        renderer.erase(area)
+        for color, pos in self.items(sim):
+            cell = self.cell(pos)
+            if area.colliderect(cell) and (pos[0], pos[1]) not in occupied:
+                renderer.rect(color, cell)
+        for y in range(area.top - area.top % block, area.bottom, block):
+            for x in range(area.left - area.left % block, area.right, block):
+                if (x, y) in occupied:
+                    renderer.rect(black, self.cell((x, y)))
+
+    def draw_score(self, score):
+        renderer = self.renderer
+        rect = self.score_hud.draw(renderer.screen, [10, 10], "Score: ", score[0], "  High: ", score[1])
+        renderer.mark(rect)
+        self.score_value = score
+        self.score_rect = rect
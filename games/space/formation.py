@@ -0,0 +1,157 @@
+from array import array
+
+# Invader formation for space2.py. No pygame in here.
+#
+# The whole grid moves as one: a member's position is its grid cell plus a
+# shared offset, so moving the formation is one addition. Who is alive is
+# a bitmask (any size), mirrored in a dense array for O(1) random picks,
+# and per-row / per-column alive counts keep the bounding box current, so
+# edge checks are O(1). Rects are (x, y, w, h) tuples; member i sits at
+# row i // cols, column i % cols.
+
+BINOMIAL_CHUNK = 512  # keeps q ** n far from underflow in binomial()
+
+
+def binomial(rng, n, p):
+    # Number of successes in n trials of probability p, from a few uniform
+    # draws (inversion), instead of one draw per trial
+    if p <= 0 or n <= 0:
+        return 0
+    if p >= 1:
+        return n
+    total = 0
+    q = 1 - p
+    s = p / q
+    while n > 0:
+        trials = min(n, BINOMIAL_CHUNK)
+        n -= trials
+        a = (trials + 1) * s
+        r = q ** trials
+        u = rng.random()
+        x = 0
+        while u > r and x < trials:
+            u -= r
+            x += 1
+            r *= a / x - s
+        total += x
+    return total
+
+
+class Formation:
+    def __init__(self, rows, cols, width, height, origin=(100, 50), gap=(20, 20)):
+        self.rows = rows
+        self.cols = cols
+        self.width = width
+        self.height = height
+        self.origin_x, self.origin_y = origin
+        self.pitch_x = width + gap[0]
+        self.pitch_y = height + gap[1]
+        self.offset_x = 0
+        self.offset_y = 0
+
+        size = rows * cols
+        self.alive = (1 << size) - 1
+        self.members = array("i", range(size))  # alive ids, dense
+        self.slot = array("i", range(size))     # id -> index in members
+        self.count = size
+        self.row_alive = array("i", [cols] * rows)
+        self.col_alive = array("i", [rows] * cols)
+        self.min_row, self.max_row = 0, rows - 1
+        self.min_col, self.max_col = 0, cols - 1
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, i):
+        return self.alive >> i & 1
+
+    def state(self):
+        return (self.offset_x, self.offset_y, self.alive)
+
+    # Geometry
+
+    def rect(self, i):
+        row, col = divmod(i, self.cols)
+        return (self.origin_x + self.offset_x + col * self.pitch_x,
+                self.origin_y + self.offset_y + row * self.pitch_y, self.width, self.height)
+
+    def rects(self):
+        rect = self.rect
+        return [rect(i) for i in self.members[:self.count]]
+
+    def positions(self):
+        # Top-left corners of the alive members (for Renderer.blits)
+        x0 = self.origin_x + self.offset_x
+        y0 = self.origin_y + self.offset_y
+        cols, pitch_x, pitch_y = self.cols, self.pitch_x, self.pitch_y
+        return [(x0 + i % cols * pitch_x, y0 + i // cols * pitch_y) for i in self.members[:self.count]]
+
+    def bbox(self):
+        left = self.origin_x + self.offset_x + self.min_col * self.pitch_x
+        top = self.origin_y + self.offset_y + self.min_row * self.pitch_y
+        right = self.origin_x + self.offset_x + self.max_col * self.pitch_x + self.width
+        bottom = self.origin_y + self.offset_y + self.max_row * self.pitch_y + self.height
+        return (left, top, right - left, bottom - top)
+
+    def move(self, dx, dy=0):
+        self.offset_x += dx
+        self.offset_y += dy
+
+    def query(self, rect):
+        # Alive members overlapping rect, lowest id first (float coordinates
+        # are truncated, as pygame.Rect does)
+        x, y, w, h = map(int, rect)
+        local_x = x - self.origin_x - self.offset_x
+        local_y = y - self.origin_y - self.offset_y
+        col_lo = max(self.min_col, (local_x - self.width) // self.pitch_x + 1)
+        col_hi = min(self.max_col, -(-(local_x + w) // self.pitch_x) - 1)
+        row_lo = max(self.min_row, (local_y - self.height) // self.pitch_y + 1)
+        row_hi = min(self.max_row, -(-(local_y + h) // self.pitch_y) - 1)
+        hits = []
+        alive = self.alive
+        for row in range(row_lo, row_hi + 1):
+            base = row * self.cols
+            for col in range(col_lo, col_hi + 1):
+                if alive >> (base + col) & 1:
+                    hits.append(base + col)
+        return hits
+
+    # Membership
+
+    def kill(self, i):
+        if not self.alive >> i & 1:
+            return
+        self.alive &= ~(1 << i)
+
+        # Swap-remove from the dense member array
+        last = self.count - 1
+        moved = self.members[last]
+        index = self.slot[i]
+        self.members[index] = moved
+        self.slot[moved] = index
+        self.members[last] = i
+        self.count = last
+
+        row, col = divmod(i, self.cols)
+        self.row_alive[row] -= 1
+        self.col_alive[col] -= 1
+        if not self.count:
+            return
+        # Shrink the bounding box past emptied edge rows / columns
+        while not self.row_alive[self.min_row]:
+            self.min_row += 1
+        while not self.row_alive[self.max_row]:
+            self.max_row -= 1
+        while not self.col_alive[self.min_col]:
+            self.min_col += 1
+        while not self.col_alive[self.max_col]:
+            self.max_col -= 1
+
+    def shooters(self, rng, chance):
+        # Members that fire this frame, each with probability `chance`:
+        # one binomial draw for how many, then that many distinct picks
+        shots = binomial(rng, self.count, chance)
+        if not shots:
+            return []
+        members = self.members
+        return [members[j] for j in rng.sample(range(self.count), shots)]
@@ -1,14 +1,18 @@
 import pygame
 import random
 import sys
+import os
 
-# Initialize pygame
-pygame.init()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.broadphase import SpatialHash
+from common.fonts import fonts
+from common.render import Renderer
+from common import game, replay
+from common.hud import Hud
+from common.pool import ProjectilePool
 
 # Screen settings
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Space Invaders")
 
 # Colors
 BLACK = (0, 0, 0)
@@ -16,115 +20,151 @@ WHITE = (255, 255, 255)
 GREEN = (0, 255, 0)
 RED = (255, 0, 0)
 
-# Clock
-clock = pygame.time.Clock()
-
 # Player settings
 player_width, player_height = 60, 20
-player_x = WIDTH // 2 - player_width // 2
 player_y = HEIGHT - 40
 player_speed = 6
 
 # Bullet settings
 bullet_width, bullet_height = 5, 10
-bullets = []
 bullet_speed = -8
 
 # Enemy settings
 enemy_width, enemy_height = 40, 20
-enemies = []
 enemy_rows = 4
 enemy_cols = 8
 enemy_speed_x = 2
-enemy_direction = 1  # 1 = right, -1 = left
-
-# Score
-score = 0
-font = pygame.font.Font(None, 36)
-
-# Create enemies
-def create_enemies():
-    enemies.clear()
-    for row in range(enemy_rows):
-        for col in range(enemy_cols):
-            x = 100 + col * (enemy_width + 20)
-            y = 50 + row * (enemy_height + 20)
-            enemies.append(pygame.Rect(x, y, enemy_width, enemy_height))
-
-create_enemies()
-
-# Game loop
-while True:
-    # Event handling
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        
-        # Shooting
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_SPACE:
-                bullet = pygame.Rect(player_x + player_width // 2 - bullet_width // 2,
-                                     player_y, bullet_width, bullet_height)
-                bullets.append(bullet)
-
-    # Keys pressed
-    keys = pygame.key.get_pressed()
-    if keys[pygame.K_LEFT] and player_x > 0:
-        player_x -= player_speed
-    if keys[pygame.K_RIGHT] and player_x < WIDTH - player_width:
-        player_x += player_speed
-
-    # Move bullets
-    for bullet in bullets[:]:
-        bullet.y += bullet_speed
-        if bullet.y < 0:
-            bullets.remove(bullet)
-
-    # Move enemies
-    move_down = False
-    for enemy in enemies:
-        enemy.x += enemy_speed_x * enemy_direction
-        if enemy.right >= WIDTH - 10 or enemy.left <= 10:
-            move_down = True
-
-    if move_down:
-        enemy_direction *= -1
-        for enemy in enemies:
-            enemy.y += 20
-
-    # Collision detection
-    for bullet in bullets[:]:
-        for enemy in enemies[:]:
-            if bullet.colliderect(enemy):
-                bullets.remove(bullet)
-                enemies.remove(enemy)
-                score += 10
-                break
-
-    # Check if enemies reach bottom
-    for enemy in enemies:
-        if enemy.bottom >= HEIGHT:
-            pygame.quit()
-            sys.exit()
-
-    # Drawing
-    screen.fill(BLACK)
-
-    # Draw player
-    pygame.draw.rect(screen, GREEN, (player_x, player_y, player_width, player_height))
-
-    # Draw bullets
-    for bullet in bullets:
-        pygame.draw.rect(screen, WHITE, bullet)
-
-    # Draw enemies
-    for enemy in enemies:
-        pygame.draw.rect(screen, RED, enemy)
-
-    # Draw score
-    score_text = font.render(f"Score: {score}", True, WHITE)
-    screen.blit(score_text, (10, 10))
-
-    pygame.display.flip()
-    clock.tick(60)
+
+
+class Game:
+    size = (WIDTH, HEIGHT)
+    caption = "Space Invaders"
+    fps = 60
+
+    def __init__(self, screen):
+        self.screen = screen
+
+        # Input session (seeded RNG, optional recording / replay)
+        self.session = replay.Session(__file__, [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_SPACE])
+
+        # Renderer (full frames by default, `--dirty` for dirty rectangles)
+        self.renderer = Renderer(screen, BLACK)
+
+        self.player_x = WIDTH // 2 - player_width // 2
+        self.bullets = ProjectilePool(512, bullet_width, bullet_height)
+        self.enemies = {}  # id -> Rect, in creation order
+        self.enemy_direction = 1  # 1 = right, -1 = left
+
+        # Score
+        self.score = 0
+        self.hud = Hud(fonts.get(None, 36), WHITE)
+
+        # Collision broad-phase. The enemies only ever move together, so the
+        # grid keeps them where they started and bullets are looked up
+        # shifted back by the distance moved; a kill removes one entry.
+        self.enemy_grid = SpatialHash(64)
+        self.enemy_offset = (0, 0)
+
+        self.create_enemies()
+
+    # Create enemies
+    def create_enemies(self):
+        self.enemies.clear()
+        self.enemy_grid.clear()
+        self.enemy_offset = (0, 0)
+        for row in range(enemy_rows):
+            for col in range(enemy_cols):
+                x = 100 + col * (enemy_width + 20)
+                y = 50 + row * (enemy_height + 20)
+                enemy = self.enemies[row * enemy_cols + col] = pygame.Rect(x, y, enemy_width, enemy_height)
+                self.enemy_grid.insert(row * enemy_cols + col, enemy)
+
+    def state(self):
+        return (self.player_x, self.score, self.enemy_direction, self.bullets.count,
+                [enemy.topleft for enemy in self.enemies.values()])
+
+    def step(self):
+        bullets, enemies = self.bullets, self.enemies
+
+        # Event handling
+        for event in self.session.events():
+            if event.type == pygame.QUIT:
+                return False
+
+            # Shooting
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    bullets.spawn(self.player_x + player_width // 2 - bullet_width // 2,
+                                  player_y, bullet_speed)
+
+        # Keys pressed
+        keys = self.session.pressed()
+        if keys[pygame.K_LEFT] and self.player_x > 0:
+            self.player_x -= player_speed
+        if keys[pygame.K_RIGHT] and self.player_x < WIDTH - player_width:
+            self.player_x += player_speed
+
+        # Move bullets (off-screen ones are recycled)
+        bullets.update(0, HEIGHT)
+
+        # Move enemies
+        dx = enemy_speed_x * self.enemy_direction
+        move_down = False
+        for enemy in enemies.values():
+            enemy.x += dx
+            if enemy.right >= WIDTH - 10 or enemy.left <= 10:
+                move_down = True
+        offset_x, offset_y = self.enemy_offset
+        offset_x += dx
+
+        if move_down:
+            self.enemy_direction *= -1
+            for enemy in enemies.values():
+                enemy.y += 20
+            offset_y += 20
+        self.enemy_offset = (offset_x, offset_y)
+
+        # Collision detection (bullets looked up in the enemies' starting frame)
+        enemy_grid = self.enemy_grid
+        spent = set()
+        for b in range(bullets.count):
+            x, y, w, h = bullets.rect(b)
+            hits = enemy_grid.query((x - offset_x, y - offset_y, w, h))
+            if hits:
+                i = min(hits)
+                enemy = enemies.pop(i)
+                enemy_grid.remove(i, (enemy.x - offset_x, enemy.y - offset_y, enemy.w, enemy.h))
+                spent.add(bullets.ids[b])
+                self.score += 10
+        if spent:
+            bullets.kill_many(spent)
+
+        # Check if enemies reach bottom
+        for enemy in enemies.values():
+            if enemy.bottom >= HEIGHT:
+                return False
+        return True
+
+    def render(self):
+        renderer = self.renderer
+        renderer.begin()
+
+        # Draw player
+        renderer.rect(GREEN, (self.player_x, player_y, player_width, player_height))
+
+        # Draw bullets
+        for bullet in self.bullets.rects():
+            renderer.rect(WHITE, bullet)
+
+        # Draw enemies
+        for enemy in self.enemies.values():
+            renderer.rect(RED, enemy)
+
+        # Draw score
+        renderer.mark(self.hud.draw(self.screen, (10, 10), "Score: ", self.score))
+
+        renderer.present()
+
+
+if __name__ == "__main__":
+    game.main(Game)
@@ -1,14 +1,20 @@
 import pygame
 import random
 import sys
+import os
 
-# Initialize pygame
-pygame.init()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.fonts import fonts
+from common import game, replay
+from common.hud import Hud, text_cache
+from common.pool import ProjectilePool
+from common.profiler import FrameProfiler
+from common.render import Renderer
+from common.scores import shared_store
+from formation import Formation
 
 # Screen settings
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Space Invaders Plus")
 
 # Colors
 BLACK = (0, 0, 0)
@@ -17,185 +23,250 @@ GREEN = (0, 255, 0)
 RED = (255, 0, 0)
 YELLOW = (255, 255, 0)
 
-# Clock
-clock = pygame.time.Clock()
-
-# Fonts
-font = pygame.font.Font(None, 36)
-big_font = pygame.font.Font(None, 72)
-
 # Player
 player_width, player_height = 60, 20
-player_x = WIDTH // 2 - player_width // 2
 player_y = HEIGHT - 50
 player_speed = 6
-player_lives = 3
-shield_active = False
-shield_timer = 0
 
 # Player bullets
 bullet_width, bullet_height = 5, 10
-bullets = []
 bullet_speed = -8
-multi_shot = False
-multi_timer = 0
-
-# Enemy
-enemy_width, enemy_height = 40, 20
-enemy_rows = 4
-enemy_cols = 8
-enemies = []
-enemy_speed_x = 2
-enemy_direction = 1
 
-# Enemy bullets
-enemy_bullets = []
+# Enemies
+enemy_speed_x = 2
 enemy_bullet_speed = 5
 enemy_fire_rate = 0.01  # Probability each frame
 
-# Score & wave
-score = 0
-wave = 1
-
-# Create enemies
-def create_enemies():
-    enemies.clear()
-    for row in range(enemy_rows):
-        for col in range(enemy_cols):
-            x = 100 + col * (enemy_width + 20)
-            y = 50 + row * (enemy_height + 20)
-            enemies.append(pygame.Rect(x, y, enemy_width, enemy_height))
-
-create_enemies()
-
-def draw_text(text, font, color, x, y):
-    screen.blit(font.render(text, True, color), (x, y))
-
-def game_over():
-    screen.fill(BLACK)
-    draw_text("GAME OVER", big_font, RED, WIDTH//2 - 150, HEIGHT//2 - 50)
-    draw_text(f"Score: {score}", font, WHITE, WIDTH//2 - 50, HEIGHT//2 + 50)
-    pygame.display.flip()
-    pygame.time.wait(3000)
-    pygame.quit()
-    sys.exit()
-
-# Game loop
-while True:
-    # Event handling
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_SPACE:
-                if multi_shot:
-                    # Shoot 3 bullets
-                    bullets.append(pygame.Rect(player_x + player_width//2 - 15, player_y, bullet_width, bullet_height))
-                    bullets.append(pygame.Rect(player_x + player_width//2, player_y, bullet_width, bullet_height))
-                    bullets.append(pygame.Rect(player_x + player_width//2 + 15, player_y, bullet_width, bullet_height))
-                else:
-                    bullets.append(pygame.Rect(player_x + player_width//2 - bullet_width//2, player_y, bullet_width, bullet_height))
-
-    # Keys pressed
-    keys = pygame.key.get_pressed()
-    if keys[pygame.K_LEFT] and player_x > 0:
-        player_x -= player_speed
-    if keys[pygame.K_RIGHT] and player_x < WIDTH - player_width:
-        player_x += player_speed
-
-    # Move bullets
-    for bullet in bullets[:]:
-        bullet.y += bullet_speed
-        if bullet.y < 0:
-            bullets.remove(bullet)
-
-    # Move enemy bullets
-    for e_bullet in enemy_bullets[:]:
-        e_bullet.y += enemy_bullet_speed
-        if e_bullet.y > HEIGHT:
-            enemy_bullets.remove(e_bullet)
-        # Check collision with player
-        if pygame.Rect(player_x, player_y, player_width, player_height).colliderect(e_bullet):
-            if shield_active:
-                enemy_bullets.remove(e_bullet)
-            else:
-                enemy_bullets.remove(e_bullet)
-                player_lives -= 1
-                if player_lives <= 0:
-                    game_over()
-
-    # Move enemies
-    move_down = False
-    for enemy in enemies:
-        enemy.x += enemy_speed_x * enemy_direction
-        if enemy.right >= WIDTH - 10 or enemy.left <= 10:
-            move_down = True
-        # Randomly fire bullets
-        if random.random() < enemy_fire_rate:
-            enemy_bullets.append(pygame.Rect(enemy.x + enemy_width//2, enemy.y + enemy_height, 5, 10))
-
-    if move_down:
-        enemy_direction *= -1
-        for enemy in enemies:
-            enemy.y += 20
-
-    # Collision: player bullets & enemies
-    for bullet in bullets[:]:
-        for enemy in enemies[:]:
-            if bullet.colliderect(enemy):
-                bullets.remove(bullet)
-                enemies.remove(enemy)
-                score += 10
-                # Random powerup
-                if random.random() < 0.1:
-                    # 50% chance shield or multi-shot
-                    if random.random() < 0.5:
-                        shield_active = True
-                        shield_timer = 300  # lasts 5 seconds (assuming 60 FPS)
+
+class Game:
+    size = (WIDTH, HEIGHT)
+    caption = "Space Invaders Plus"
+    fps = 60
+
+    def __init__(self, screen):
+        self.screen = screen
+
+        # Input session (seeded RNG, optional recording / replay)
+        self.session = replay.Session(__file__, [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_SPACE])
+
+        # Renderer (full frames by default, `--dirty` for dirty rectangles)
+        self.renderer = Renderer(screen, BLACK)
+
+        # Fonts
+        self.font = fonts.get(None, 36)
+        self.big_font = fonts.get(None, 72)
+        self.hud = Hud(self.font, WHITE)
+
+        # Per-phase frame timings (F3 shows the overlay)
+        self.profiler = FrameProfiler()
+        self.small_font = fonts.get(None, 22)
+
+        # Player
+        self.player_x = WIDTH // 2 - player_width // 2
+        self.player_lives = 3
+        self.shield_active = False
+        self.shield_timer = 0
+
+        # Player bullets
+        self.bullets = ProjectilePool(512, bullet_width, bullet_height)
+        self.multi_shot = False
+        self.multi_timer = 0
+
+        # Enemy formation (moves as one; see formation.py)
+        self.enemy_width, self.enemy_height = 40, 20
+        self.enemy_gap = 20
+        self.enemy_rows = 4
+        self.enemy_cols = 8
+        self.max_enemy_rows = 6  # each wave adds a row up to this
+        self.enemy_direction = 1
+
+        # Enemy bullets
+        self.enemy_bullets = ProjectilePool(2048, 5, 10)
+
+        # Score & wave
+        self.score = 0
+        self.wave = 1
+
+        # Leaderboard (shared with the other games); replays and benchmarks don't post
+        self.scores = shared_store(read_only=bool(self.session.replaying or self.session.bench))
+
+        # Stress preset (benchmarks/run_benchmarks.py): start at wave 20 with a
+        # permanent shield so the run never ends early
+        if self.session.preset == "wave_20":
+            self.wave = 20
+            self.enemy_rows = min(self.max_enemy_rows, self.enemy_rows + 19)
+            self.shield_active = True
+            self.shield_timer = 10 ** 9
+
+        # Stress preset: a 30x36 formation (rows x columns) of small invaders,
+        # past the usual row cap; 36 columns of 18 px leave room to march
+        if self.session.preset == "swarm":
+            self.enemy_width, self.enemy_height, self.enemy_gap = 12, 8, 6
+            self.enemy_rows = self.max_enemy_rows = 30
+            self.enemy_cols = 36
+            self.shield_active = True
+            self.shield_timer = 10 ** 9
+
+        self.create_enemies()
+
+    # Create enemies
+    def create_enemies(self):
+        self.enemies = Formation(self.enemy_rows, self.enemy_cols, self.enemy_width, self.enemy_height,
+                                 gap=(self.enemy_gap, self.enemy_gap))
+
+    def state(self):
+        return (self.player_x, self.player_lives, self.score, self.wave, self.enemy_direction,
+                self.bullets.count, self.enemy_bullets.count, self.shield_timer, self.multi_timer,
+                self.enemies.state())
+
+    def draw_text(self, text, font, color, x, y):
+        self.renderer.blit(text_cache.render(font, text, color), (x, y))
+
+    def game_over(self):
+        # Saved by the score writer thread while the screen shows
+        self.scores.submit("space2", self.score)
+        renderer = self.renderer
+        renderer.invalidate()
+        renderer.begin()
+        self.draw_text("GAME OVER", self.big_font, RED, WIDTH//2 - 150, HEIGHT//2 - 50)
+        self.draw_text(f"Score: {self.score}", self.font, WHITE, WIDTH//2 - 50, HEIGHT//2 + 50)
+        self.draw_text(f"Best: {self.scores.best('space2')}", self.font, WHITE, WIDTH//2 - 50, HEIGHT//2 + 90)
+        renderer.present()
+        self.session.wait(3000)
+
+    def step(self):
+        profiler = self.profiler
+        profiler.begin()
+        bullets, enemy_bullets = self.bullets, self.enemy_bullets
+
+        # Event handling
+        for event in self.session.events():
+            if event.type == pygame.QUIT:
+                return False
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    x = self.player_x + player_width//2
+                    if self.multi_shot:
+                        # Shoot 3 bullets
+                        bullets.spawn(x - 15, player_y, bullet_speed)
+                        bullets.spawn(x, player_y, bullet_speed)
+                        bullets.spawn(x + 15, player_y, bullet_speed)
                     else:
-                        multi_shot = True
-                        multi_timer = 300
-                break
-
-    # Check if wave cleared
-    if not enemies:
-        wave += 1
-        enemy_rows = min(6, enemy_rows + 1)  # increase difficulty
-        create_enemies()
-
-    # Power-up timers
-    if shield_active:
-        shield_timer -= 1
-        if shield_timer <= 0:
-            shield_active = False
-    if multi_shot:
-        multi_timer -= 1
-        if multi_timer <= 0:
-            multi_shot = False
-
-    # Drawing
-    screen.fill(BLACK)
-    # Draw player
-    pygame.draw.rect(screen, GREEN, (player_x, player_y, player_width, player_height))
-    if shield_active:
-        pygame.draw.circle(screen, YELLOW, (player_x + player_width//2, player_y + player_height//2), 40, 2)
-
-    # Draw bullets
-    for bullet in bullets:
-        pygame.draw.rect(screen, WHITE, bullet)
-    for e_bullet in enemy_bullets:
-        pygame.draw.rect(screen, RED, e_bullet)
-
-    # Draw enemies
-    for enemy in enemies:
-        pygame.draw.rect(screen, WHITE, enemy)
-
-    # Draw score & lives & wave
-    draw_text(f"Score: {score}", font, WHITE, 10, 10)
-    draw_text(f"Lives: {player_lives}", font, WHITE, WIDTH - 120, 10)
-    draw_text(f"Wave: {wave}", font, WHITE, WIDTH//2 - 50, 10)
-
-    pygame.display.flip()
-    clock.tick(60)
+                        bullets.spawn(x - bullet_width//2, player_y, bullet_speed)
+
+        # Keys pressed
+        keys = self.session.pressed()
+        if keys[pygame.K_LEFT] and self.player_x > 0:
+            self.player_x -= player_speed
+        if keys[pygame.K_RIGHT] and self.player_x < WIDTH - player_width:
+            self.player_x += player_speed
+        profiler.mark("events")
+
+        # Move bullets and enemy bullets (off-screen ones are recycled)
+        bullets.update(0, HEIGHT)
+        enemy_bullets.update(0, HEIGHT)
+        profiler.mark("movement")
+
+        # Collision: enemy bullets & player (one pass over the pool's arrays)
+        hits = enemy_bullets.overlapping((self.player_x, player_y, player_width, player_height))
+        if hits:
+            enemy_bullets.kill_many(hits)
+            if not self.shield_active:
+                for _ in hits:
+                    self.player_lives -= 1
+                    if self.player_lives <= 0:
+                        self.game_over()
+                        return False
+        profiler.mark("collision")
+
+        # Move enemies: one offset for the whole formation, edges from its bbox
+        enemies = self.enemies
+        enemies.move(enemy_speed_x * self.enemy_direction)
+        left, _, span, _ = enemies.bbox()
+        move_down = left + span >= WIDTH - 10 or left <= 10
+        profiler.mark("movement")
+
+        # Randomly fire bullets (each invader with enemy_fire_rate, sampled in bulk)
+        for i in enemies.shooters(random, enemy_fire_rate):
+            x, y, _, _ = enemies.rect(i)
+            enemy_bullets.spawn(x + self.enemy_width//2, y + self.enemy_height, enemy_bullet_speed)
+        profiler.mark("spawning")
+
+        if move_down:
+            self.enemy_direction *= -1
+            enemies.move(0, 20)
+        profiler.mark("movement")
+
+        # Collision: player bullets & enemies (direct grid lookup)
+        spent = set()
+        for b in range(bullets.count):
+            hits = enemies.query(bullets.rect(b))
+            if not hits:
+                continue
+            enemies.kill(hits[0])
+            spent.add(bullets.ids[b])
+            self.score += 10
+            # Random powerup
+            if random.random() < 0.1:
+                # 50% chance shield or multi-shot
+                if random.random() < 0.5:
+                    self.shield_active = True
+                    self.shield_timer = max(self.shield_timer, 300)  # lasts 5 seconds (assuming 60 FPS)
+                else:
+                    self.multi_shot = True
+                    self.multi_timer = 300
+        if spent:
+            bullets.kill_many(spent)
+        profiler.mark("collision")
+
+        # Check if wave cleared
+        if not enemies:
+            self.wave += 1
+            self.enemy_rows = min(self.max_enemy_rows, self.enemy_rows + 1)  # increase difficulty
+            self.create_enemies()
+        profiler.mark("spawning")
+
+        # Power-up timers
+        if self.shield_active:
+            self.shield_timer -= 1
+            if self.shield_timer <= 0:
+                self.shield_active = False
+        if self.multi_shot:
+            self.multi_timer -= 1
+            if self.multi_timer <= 0:
+                self.multi_shot = False
+        return True
+
+    def render(self):
+        renderer, profiler = self.renderer, self.profiler
+
+        # Drawing
+        renderer.begin()
+        # Draw player
+        renderer.rect(GREEN, (self.player_x, player_y, player_width, player_height))
+        if self.shield_active:
+            renderer.circle(YELLOW, (self.player_x + player_width//2, player_y + player_height//2), 40, 2)
+
+        # Draw bullets and enemies, one sprite batch each
+        enemy_bullets = self.enemy_bullets
+        renderer.blits(renderer.sprite(WHITE, (bullet_width, bullet_height)), self.bullets.positions())
+        renderer.blits(renderer.sprite(RED, (enemy_bullets.width, enemy_bullets.height)),
+                       enemy_bullets.positions())
+        renderer.blits(renderer.sprite(WHITE, (self.enemy_width, self.enemy_height)), self.enemies.positions())
+
+        # Draw score & lives & wave
+        hud, screen = self.hud, self.screen
+        renderer.mark(hud.draw(screen, (10, 10), "Score: ", self.score))
+        renderer.mark(hud.draw(screen, (WIDTH - 120, 10), "Lives: ", self.player_lives))
+        renderer.mark(hud.draw(screen, (WIDTH//2 - 50, 10), "Wave: ", self.wave))
+        profiler.draw(renderer, self.small_font)
+        profiler.mark("drawing")
+
+        renderer.present()
+        profiler.mark("flip")
+        profiler.end()
+
+
+if __name__ == "__main__":
+    game.main(Game)
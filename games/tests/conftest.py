@@ -0,0 +1,27 @@
+import os
+import sys
+
+# The game scripts import their neighbours (snake_sim, formation, ...) and
+# the shared code (common.*); put both on the path, as running them does.
+GAMES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in ("", "snake", "pong", "space", "bird"):
+    path = os.path.join(GAMES_DIR, folder)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import pytest
+
+from common.fonts import fonts
+
+
+@pytest.fixture(autouse=True)
+def shared_fonts(tmp_path, monkeypatch):
+    # Every game takes its fonts from one FontManager per process. Each
+    # test gets it empty, with its own cache file instead of the user's,
+    # and its font objects are dropped afterwards: they don't outlive
+    # pygame.quit()
+    monkeypatch.setattr(fonts, "cache_path", str(tmp_path / "fonts.json"))
+    monkeypatch.setattr(fonts, "paths", None)
+    fonts.fonts.clear()
+    yield
+    fonts.fonts.clear()
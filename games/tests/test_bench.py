@@ -0,0 +1,68 @@
+import json
+
+import pygame
+import pytest
+
+from benchmarks import run_benchmarks
+from common import bench, game
+
+# Benchmark harness: every run starts its game in a headless process, plays
+# the requested number of scripted ticks and reports one JSON result, then
+# ends the game through its own quit path. One exit hook writes the
+# partial result of the newest driver.
+
+TICKS = 120
+
+
+@pytest.mark.parametrize("name", sorted(run_benchmarks.RUNS))
+def test_run_reports_a_result(name):
+    result = run_benchmarks.run(name, TICKS, seed=1, render=True)
+    script, preset = run_benchmarks.RUNS[name]
+    assert result["name"] == name and result["preset"] == preset and result["seed"] == 1
+    assert result["ticks"] <= TICKS and result["ticks_per_s"] > 0
+    if preset:
+        # The stress presets are set up to last the whole run
+        assert result["completed"] and result["ticks"] == TICKS
+    frame = result["frame_ms"]
+    assert frame["p50"] <= frame["p99"] <= frame["max"]
+
+
+def test_one_exit_hook_finishes_the_newest(tmp_path, monkeypatch):
+    hooks = []
+    monkeypatch.setattr(bench.atexit, "register", hooks.append)
+    monkeypatch.setattr(bench, "running", None)
+    first = bench.BenchDriver("first.py", [], seed=1, ticks=10, out_path=str(tmp_path / "first.json"))
+    second = bench.BenchDriver("second.py", [], seed=2, ticks=10, out_path=str(tmp_path / "second.json"))
+    assert hooks == [bench.finish_at_exit]
+    bench.finish_at_exit()
+    assert second.done and not first.done
+    with open(tmp_path / "second.json") as f:
+        result = json.load(f)
+    assert result["game"] == "second.py" and not result["completed"]
+
+
+def test_driver_ends_the_frame_loop(tmp_path, monkeypatch):
+    # In-process, as the launcher runs games: the run finishes with a QUIT
+    # the game handles itself, not by exiting the interpreter
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    monkeypatch.setenv("GAMES_SCORES", str(tmp_path / "scores.db"))
+    monkeypatch.setenv("GAMES_SEED", "1")
+    monkeypatch.setenv("GAMES_BENCH_TICKS", "40")
+    monkeypatch.setenv("GAMES_BENCH_OUT", str(tmp_path / "result.json"))
+    for name in ("GAMES_RECORD", "GAMES_REPLAY", "GAMES_CAPTURE", "GAMES_PRESET"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(bench, "running", None)
+    import snake_v2
+
+    pygame.init()
+    try:
+        screen = game.open_display(snake_v2.Game)
+        played = snake_v2.Game(screen)
+        game.run(played)
+    finally:
+        pygame.quit()
+    assert played.play.state == snake_v2.QUIT
+    with open(tmp_path / "result.json") as f:
+        result = json.load(f)
+    assert result["completed"] and result["ticks"] == 40 and result["game"] == "snake_v2.py"
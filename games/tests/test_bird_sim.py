@@ -0,0 +1,138 @@
+import random
+
+import pygame
+
+from bird_sim import BirdSim, GAP_SEQUENCE, REBASE_SCROLL
+
+# BirdSim: the pipe ring buffer holds every pipe on screen in order, and
+# the nearest-pipe collision test agrees with testing the bird's rect
+# against every pipe's rects, as the old list-of-dicts game did. Rounds
+# carry on through the gap sequence, and rebasing the scroll moves nothing
+# on screen.
+
+
+def bot(sim, rng):
+    # Flap when below the middle of the next gap, and now and then at random
+    for x, top in sim.pipes():
+        if x + sim.pipe_width > sim.bird_x:
+            target = top + sim.pipe_gap // 2
+            break
+    else:
+        target = sim.height // 2
+    return sim.bird_y > target or rng.random() < 0.02
+
+
+def hover(sim):
+    # Put the bird in the middle of the next gap, so the round never ends
+    for x, top in sim.pipes():
+        if x + sim.pipe_width > sim.bird_x:
+            sim.bird_y = top + (sim.pipe_gap - sim.bird_size) // 2
+            break
+    sim.bird_velocity = 0
+
+
+def collides_with_every_pipe(sim):
+    bird = pygame.Rect(sim.bird_x, int(sim.bird_y), sim.bird_size, sim.bird_size)
+    if bird.top <= 0 or bird.bottom >= sim.height:
+        return True
+    for x, top in sim.pipes():
+        upper = pygame.Rect(x, 0, sim.pipe_width, top)
+        lower = pygame.Rect(x, top + sim.pipe_gap, sim.pipe_width, sim.height - top - sim.pipe_gap)
+        if bird.colliderect(upper) or bird.colliderect(lower):
+            return True
+    return False
+
+
+def check_pipes(sim):
+    pipes = list(sim.pipes())
+    assert 0 < len(pipes) <= sim.capacity
+    xs = [x for x, _ in pipes]
+    assert xs == sorted(xs)
+    assert all(b - a >= sim.pipe_spacing for a, b in zip(xs, xs[1:]))
+    assert xs[0] >= -sim.pipe_width and xs[-1] <= sim.width
+
+
+def test_pipe_ring_buffer():
+    sim = BirdSim(seed=1)
+    for _ in range(20000):
+        hover(sim)
+        assert not sim.step()
+        check_pipes(sim)
+    assert sim.spawned > sim.capacity * 50
+
+
+def test_nearest_pipe_collision_matches_every_pipe():
+    sim = BirdSim(seed=2)
+    rng = random.Random(2)
+    for _ in range(5000):
+        sim.step(bot(sim, rng))
+        real_y = sim.bird_y
+        for y in list(range(-5, sim.height, 7)) + [rng.uniform(0, sim.height) for _ in range(5)]:
+            sim.bird_y = y
+            assert sim.collides() == collides_with_every_pipe(sim), (sim.scroll, y)
+        sim.bird_y = real_y
+
+
+def test_gaps_come_from_the_seed():
+    assert BirdSim(seed=3).gaps == BirdSim(seed=3).gaps
+    assert BirdSim(seed=3).gaps != BirdSim(seed=4).gaps
+    sim = BirdSim(seed=3)
+    assert len(sim.gaps) == GAP_SEQUENCE
+    assert all(100 <= gap <= 400 for gap in sim.gaps)
+    sim.step()
+    assert list(sim.pipes()) == [(sim.width - sim.pipe_speed, sim.gaps[0])]
+
+
+def test_seeded_runs_repeat():
+    def run(seed):
+        sim = BirdSim(seed=seed)
+        rng = random.Random(seed)
+        states = []
+        for _ in range(3000):
+            sim.step(bot(sim, rng))
+            states.append(sim.state())
+        return states
+    assert run(5) == run(5)
+    assert run(5) != run(6)
+
+
+def test_score_counts_passed_pipes():
+    sim = BirdSim(seed=7)
+    for _ in range(5000):
+        hover(sim)
+        assert not sim.step()
+    assert sim.score == sim.spawned - sim.count > 50
+
+
+def test_new_round_carries_on_through_the_gaps():
+    sim = BirdSim(seed=8)
+    while sim.spawned < 7:
+        hover(sim)
+        sim.step()
+    spawned = sim.spawned
+    sim.bird_y = -100
+    assert sim.step()  # crashed: a new round
+    sim.step()
+    assert list(sim.pipes()) == [(sim.width - sim.pipe_speed, sim.gaps[spawned])]
+    assert sim.spawned == spawned + 1
+
+
+def test_rebase_moves_nothing_on_screen():
+    plain = BirdSim(seed=9)
+    shifted = BirdSim(seed=9)
+    for sim in (plain, shifted):
+        for _ in range(100):
+            hover(sim)
+            sim.step()
+    # Same screen, but the scroll a few ticks short of the rebase
+    offset = REBASE_SCROLL - 3 * shifted.pipe_speed - shifted.scroll
+    shifted.scroll += offset
+    for i in range(shifted.capacity):
+        shifted.pipe_x[i] += offset
+    for _ in range(2000):
+        for sim in (plain, shifted):
+            hover(sim)
+            assert not sim.step()
+        assert list(shifted.pipes()) == list(plain.pipes())
+        assert shifted.score == plain.score
+    assert shifted.scroll < plain.scroll
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from common.broadphase import SpatialHash
+
+# SpatialHash: a query returns the same items as testing every rect
+# (colliderect's rule), with each item once, before and after removals,
+# for integer rects and for float ones (ProjectilePool's).
+
+
+def overlaps(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+@pytest.mark.parametrize("coord", [random.Random.randrange, random.Random.uniform])
+def test_query_matches_every_rect(coord):
+    grid = SpatialHash(32)
+    rng = random.Random(1)
+    rects = {}
+    for item in range(300):
+        rect = (coord(rng, -50, 500), coord(rng, -50, 500), rng.choice([1, 8, 40, 100]), rng.choice([1, 8, 70]))
+        rects[item] = rect
+        grid.insert(item, rect)
+    for item in range(0, 300, 4):
+        grid.remove(item, rects.pop(item))
+    for _ in range(500):
+        query = (coord(rng, -50, 500), coord(rng, -50, 500), coord(rng, 1, 120), coord(rng, 1, 120))
+        hits = grid.query(query)
+        assert len(hits) == len(set(hits))
+        assert set(hits) == {item for item, rect in rects.items() if overlaps(rect, query)}
+
+
+def test_touching_edges_dont_overlap():
+    grid = SpatialHash(64)
+    grid.insert("a", (0, 0, 64, 64))
+    assert grid.query((64, 0, 10, 10)) == []
+    assert grid.query((63, 63, 10, 10)) == ["a"]
+
+
+def test_remove_and_clear():
+    grid = SpatialHash(16)
+    grid.insert("a", (0, 0, 40, 40))
+    grid.insert("b", (10, 10, 5, 5))
+    grid.remove("a", (0, 0, 40, 40))
+    assert grid.query((0, 0, 100, 100)) == ["b"]
+    grid.clear()
+    assert grid.query((0, 0, 100, 100)) == []
@@ -0,0 +1,98 @@
+import pygame
+
+from common.capture import FrameRecorder, FrameRing, export
+
+# Frame capture ring: a recorder keeps the last `capacity` frames on disk,
+# and the reader and exporter give them back oldest first, pixel exact. A
+# dropped frame leaves a gap the raw export fills with the frame before.
+
+SIZE = (4, 3)
+
+
+def color(n):
+    return (20 * n, 255 - 20 * n, 7 * n)
+
+
+def rgb(n):
+    return bytes(color(n)) * (SIZE[0] * SIZE[1])
+
+
+def record(path, frames, capacity=5, **kwargs):
+    surface = pygame.Surface(SIZE)
+    recorder = FrameRecorder(str(path), surface, fps=30, capacity=capacity, **kwargs)
+    for n in range(frames):
+        surface.fill(color(n))
+        assert recorder.capture(surface, tick=100 + n, wait=True)
+    recorder.close()
+    return recorder
+
+
+def test_ring_keeps_the_last_frames(tmp_path):
+    path = tmp_path / "run.cap"
+    recorder = record(path, 12)
+    assert recorder.frames == 12 and recorder.dropped == 0
+
+    ring = FrameRing(str(path))
+    assert ring.size == SIZE and ring.fps == 30 and ring.count == 12
+    entries = list(ring.entries())
+    assert [number for number, _, _, _ in entries] == [7, 8, 9, 10, 11]
+    assert [tick for _, _, tick, _ in entries] == [107, 108, 109, 110, 111]
+    assert [slot for _, _, _, slot in entries] == [2, 3, 4, 0, 1]
+    seconds = [s for _, s, _, _ in entries]
+    assert seconds == sorted(seconds)
+    for number, _, _, slot in entries:
+        assert ring.pixels(slot) == rgb(number)
+    ring.close()
+
+
+def test_raw_export(tmp_path):
+    path = tmp_path / "run.cap"
+    record(path, 12)
+    out = tmp_path / "run.rgb"
+    summary = export(str(path), str(out), raw=True)
+    assert summary.startswith("5 frames (#7..#11), 4x3, 30 FPS game")
+    assert out.read_bytes() == b"".join(rgb(n) for n in range(7, 12))
+
+
+def test_png_export(tmp_path):
+    path = tmp_path / "run.cap"
+    record(path, 3)
+    export(str(path), str(tmp_path / "frames"))
+    for n in range(3):
+        frame = pygame.image.load(str(tmp_path / "frames" / f"frame_{n:06d}.png"))
+        assert frame.get_at((1, 1))[:3] == color(n)
+
+
+def test_fewer_frames_than_capacity(tmp_path):
+    path = tmp_path / "run.cap"
+    record(path, 2)
+    ring = FrameRing(str(path))
+    assert [number for number, _, _, _ in ring.entries()] == [0, 1]
+    ring.close()
+    assert export(str(path), str(tmp_path / "none.rgb"), raw=True).startswith("2 frames")
+
+
+def test_dropped_frames_repeat_the_one_before(tmp_path):
+    path = tmp_path / "run.cap"
+    surface = pygame.Surface(SIZE)
+    recorder = FrameRecorder(str(path), surface, fps=30, capacity=8, spares=1)
+    for n in range(6):
+        surface.fill(color(n))
+        if n in (2, 5):
+            # The writer still has the only spare: the frame is dropped
+            spare = recorder.free.get()
+            assert not recorder.capture(surface, tick=100 + n)
+            recorder.free.put(spare)
+        else:
+            assert recorder.capture(surface, tick=100 + n, wait=True)
+    recorder.close()
+    assert recorder.frames == 6 and recorder.dropped == 2
+
+    ring = FrameRing(str(path))
+    assert ring.count == 6
+    assert [number for number, _, _, _ in ring.entries()] == [0, 1, 3, 4]
+    ring.close()
+    out = tmp_path / "run.rgb"
+    summary = export(str(path), str(out), raw=True)
+    assert "2 frames dropped" in summary
+    assert out.read_bytes() == b"".join(rgb(n) for n in (0, 1, 1, 3, 4, 4))
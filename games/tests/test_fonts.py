@@ -0,0 +1,91 @@
+import json
+import os
+import shutil
+
+import pygame
+import pytest
+
+from common.fonts import FontManager
+
+# FontManager: a font name is looked up once, and the result (a path or
+# "not installed") is remembered across processes through the cache file.
+
+BUNDLED = os.path.join(os.path.dirname(pygame.__file__), pygame.font.get_default_font())
+
+
+class FontSystem:
+    # Stand-in for the system font table, counting lookups
+    def __init__(self, folder):
+        self.folder = folder
+        self.installed = {}
+        self.lookups = []
+
+    def install(self, name, file_name):
+        path = str(self.folder / file_name)
+        shutil.copy(BUNDLED, path)
+        self.installed[name] = path
+        return path
+
+    def match_font(self, name):
+        self.lookups.append(name)
+        return self.installed.get(name)
+
+
+@pytest.fixture
+def system(monkeypatch, tmp_path):
+    system = FontSystem(tmp_path)
+    system.install("bundled", "bundled.ttf")
+    monkeypatch.setattr(pygame.font, "match_font", system.match_font)
+    pygame.font.init()
+    yield system
+    pygame.quit()
+
+
+def test_fonts_are_shared_and_looked_up_once(system, tmp_path):
+    manager = FontManager(str(tmp_path / "fonts.json"))
+    font = manager.get("bundled", 20)
+    assert manager.get("bundled", 20) is font
+    assert manager.get("Bundled", 30) is not font
+    assert system.lookups == ["bundled"] and manager.scans == 1
+
+
+def test_cache_file_saves_the_lookup(system, tmp_path):
+    cache = str(tmp_path / "fonts.json")
+    first = FontManager(cache)
+    first.get("bundled", 20)
+    first.get("comicsansms", 30)
+    with open(cache) as f:
+        assert json.load(f) == {"bundled": system.installed["bundled"], "comicsansms": None}
+
+    # The next process opens both without asking the system
+    second = FontManager(cache)
+    assert second.get("bundled", 20).size("Score") == first.get("bundled", 20).size("Score")
+    second.get("comicsansms", 30)
+    assert second.scans == 0 and len(system.lookups) == 2
+
+
+def test_missing_font_falls_back_to_the_bundled_one(system, tmp_path):
+    manager = FontManager(str(tmp_path / "fonts.json"))
+    font = manager.get("comicsansms", 30)
+    assert font.size("Score: 12") == pygame.font.Font(None, 30).size("Score: 12")
+
+
+def test_moved_font_file_is_looked_up_again(system, tmp_path):
+    cache = str(tmp_path / "fonts.json")
+    FontManager(cache).get("bundled", 20)
+    os.remove(system.installed["bundled"])
+    moved = system.install("bundled", "moved.ttf")
+    manager = FontManager(cache)
+    manager.get("bundled", 20)
+    assert manager.scans == 1 and system.lookups == ["bundled", "bundled"]
+    assert FontManager(cache).read()["bundled"] == moved
+
+
+def test_clear_forgets_the_lookups(system, tmp_path):
+    cache = str(tmp_path / "fonts.json")
+    manager = FontManager(cache)
+    manager.get("bundled", 20)
+    manager.clear()
+    assert FontManager(cache).read() == {}
+    manager.get("bundled", 20)
+    assert manager.scans == 2
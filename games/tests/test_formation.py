@@ -0,0 +1,89 @@
+import random
+
+from formation import Formation, binomial
+
+# Formation: query() finds the same members as testing every rect, kills
+# keep the dense member array and the bounding box right, and a seeded
+# RNG picks the same shooters.
+
+
+def overlaps(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+def brute_query(formation, rect):
+    rect = tuple(map(int, rect))
+    return sorted(i for i in range(formation.rows * formation.cols)
+                  if i in formation and overlaps(formation.rect(i), rect))
+
+
+def check_members(formation):
+    alive = [i for i in range(formation.rows * formation.cols) if i in formation]
+    members = formation.members[:formation.count]
+    assert sorted(members) == alive
+    for index, i in enumerate(members):
+        assert formation.slot[i] == index
+    if alive:
+        rects = [formation.rect(i) for i in alive]
+        left = min(r[0] for r in rects)
+        top = min(r[1] for r in rects)
+        right = max(r[0] + r[2] for r in rects)
+        bottom = max(r[1] + r[3] for r in rects)
+        assert formation.bbox() == (left, top, right - left, bottom - top)
+
+
+def test_query_matches_every_rect():
+    formation = Formation(5, 8, 40, 20)
+    rng = random.Random(1)
+    for _ in range(30):
+        formation.kill(rng.randrange(40))
+    formation.move(13, 7)
+    for _ in range(2000):
+        rect = (rng.uniform(0, 800), rng.uniform(0, 400), rng.choice([1, 5, 30, 90]), rng.choice([1, 10, 50]))
+        assert formation.query(rect) == brute_query(formation, rect)
+
+
+def test_kills_keep_members_and_bbox():
+    formation = Formation(6, 7, 12, 8, gap=(6, 6))
+    rng = random.Random(2)
+    order = list(range(42))
+    rng.shuffle(order)
+    for i in order:
+        formation.kill(i)
+        formation.kill(i)  # already dead
+        assert i not in formation
+        check_members(formation)
+    assert len(formation) == 0 and not formation
+
+
+def test_move_shifts_everything():
+    formation = Formation(2, 3, 40, 20)
+    before = formation.rects()
+    formation.move(5, -3)
+    assert formation.rects() == [(x + 5, y - 3, w, h) for x, y, w, h in before]
+    assert formation.positions() == [(x, y) for x, y, _, _ in formation.rects()]
+    assert formation.state() == (5, -3, (1 << 6) - 1)
+
+
+def test_shooters_repeat_with_the_seed():
+    formation = Formation(30, 36, 12, 8)
+    for i in range(0, 1080, 3):
+        formation.kill(i)
+    first = [formation.shooters(random.Random(seed), 0.01) for seed in range(20)]
+    again = [formation.shooters(random.Random(seed), 0.01) for seed in range(20)]
+    assert first == again
+    for shots in first:
+        assert len(set(shots)) == len(shots)
+        assert all(i in formation for i in shots)
+
+
+def test_binomial():
+    rng = random.Random(3)
+    assert binomial(rng, 0, 0.5) == 0
+    assert binomial(rng, 10, 0) == 0
+    assert binomial(rng, 10, 1) == 10
+    draws = [binomial(rng, 2000, 0.01) for _ in range(2000)]
+    assert all(0 <= d <= 2000 for d in draws)
+    assert abs(sum(draws) / len(draws) - 20) < 1
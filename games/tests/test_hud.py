@@ -0,0 +1,96 @@
+import random
+
+import pygame
+import pytest
+
+from common.hud import TextCache, DigitAtlas, Hud
+from common.render import Renderer
+from snake_sim import SnakeSim
+from snake_view import SnakeView, blue, red
+from test_render import toward_food
+
+# HUD text: labels go through SDL_ttf once, numbers are composed from the
+# digit atlas, and the snake overlay only redraws when its values change.
+
+
+class CountingFont:
+    def __init__(self, font):
+        self.font = font
+        self.renders = 0
+
+    def render(self, text, antialias, color):
+        self.renders += 1
+        return self.font.render(text, antialias, color)
+
+
+@pytest.fixture
+def font(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((64, 64))
+    yield CountingFont(pygame.font.Font(None, 30))
+    pygame.quit()
+
+
+def test_text_cache_renders_each_string_once(font):
+    cache = TextCache()
+    first = cache.render(font, "Score: ", red)
+    assert cache.render(font, "Score: ", red) is first
+    cache.render(font, "Score: ", blue)
+    assert font.renders == 2
+
+
+def test_text_cache_evicts_least_recently_used(font):
+    cache = TextCache(capacity=2)
+    cache.render(font, "a", red)
+    cache.render(font, "b", red)
+    cache.render(font, "a", red)
+    cache.render(font, "c", red)
+    cache.render(font, "a", red)
+    assert font.renders == 3
+    cache.render(font, "b", red)
+    assert font.renders == 4
+
+
+def test_digit_atlas_composes_numbers_without_rendering(font):
+    atlas = DigitAtlas(font, red)
+    renders = font.renders
+    surface = pygame.Surface((200, 50))
+    for value in (0, 7, 42, 1234567890, -15):
+        rect = atlas.blit(surface, value, (3, 4))
+        assert rect.size == atlas.size(value)
+        assert rect.topleft == (3, 4)
+    assert font.renders == renders
+
+
+def test_hud_line_renders_labels_once(font):
+    hud = Hud(font, red, cache=TextCache())
+    surface = pygame.Surface((300, 50))
+    renders = font.renders
+    for score in range(100):
+        hud.draw(surface, (10, 10), "Score: ", score, "  High: ", 99)
+    assert font.renders == renders + 2
+
+
+def test_snake_overlay_redraws_only_on_change(font):
+    sim = SnakeSim(seed=3)
+    hud = Hud(font, red, cache=TextCache())
+    view = SnakeView(Renderer(pygame.Surface((sim.width, sim.height)), blue, dirty=True), hud)
+    draws = []
+    draw = hud.draw
+    hud.draw = lambda surface, pos, *parts: draws.append(parts) or draw(surface, pos, *parts)
+    rng = random.Random(3)
+    changes = 0
+    last = None
+    for _ in range(400):
+        if sim.step(toward_food(sim, rng)):
+            sim.reset()
+            view.renderer.invalidate()
+        # A full frame or a new score has to draw the overlay
+        changes += not view.renderer.incremental or sim.score != last
+        last = sim.score
+        view.draw(sim, 5)
+        view.renderer.present()
+    assert changes > 2
+    assert changes <= len(draws) < 200
@@ -0,0 +1,62 @@
+import sys
+
+import pygame
+import pytest
+
+import launcher
+
+# launcher.py: games start one after another on the one display of a
+# single process, Esc ends a game without closing the window, and a game
+# started again reuses what the first start loaded.
+
+
+@pytest.fixture(scope="module")
+def display(tmp_path_factory):
+    # One pygame session for the module, as the launcher has
+    folder = tmp_path_factory.mktemp("launcher")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+        monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+        monkeypatch.setenv("GAMES_SCORES", str(folder / "scores.db"))
+        for name in ("GAMES_RECORD", "GAMES_REPLAY", "GAMES_BENCH_TICKS", "GAMES_CAPTURE", "GAMES_PRESET"):
+            monkeypatch.delenv(name, raising=False)
+        pygame.init()
+        yield pygame.display.set_mode(launcher.MENU_SIZE)
+        pygame.quit()
+
+
+def index(module):
+    return [entry[1] for entry in launcher.GAMES].index(module)
+
+
+def play(game, frames):
+    # A few frames, then Esc
+    for _ in range(frames):
+        assert game.step()
+        game.render()
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE))
+    assert not game.step()
+    assert not game.session.window_closed
+
+
+def test_two_games_in_one_process(display):
+    screen = display
+    for module in ("snake_v2", "pong2", "snake_v2"):
+        game, screen, _ = launcher.start(index(module), screen)
+        assert screen is pygame.display.get_surface()
+        assert screen.get_size() == type(game).size
+        play(game, 30)
+        screen = pygame.display.set_mode(launcher.MENU_SIZE)
+    assert pygame.display.get_init()
+
+
+def test_restarting_a_game_loads_nothing_new(display):
+    game, screen, _ = launcher.start(index("pong2"), pygame.display.set_mode(launcher.MENU_SIZE))
+    play(game, 5)
+    module = type(game).__module__
+    loaded = sys.modules[module]
+    fonts = dict(launcher.fonts.fonts)
+    game, screen, _ = launcher.start(index("pong2"), screen)
+    play(game, 5)
+    assert sys.modules[module] is loaded and type(game).__module__ == module
+    assert launcher.fonts.fonts == fonts
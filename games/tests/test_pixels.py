@@ -0,0 +1,69 @@
+import pygame
+
+from common.pixels import PixelObserver
+
+# Pixel observations: the frame stack comes back oldest to newest across
+# the ring's wrap, grayscale uses the 77/150/29 luma weights, and
+# downsampling keeps every Nth pixel. Runs with or without numpy.
+
+SIZE = (8, 6)
+
+
+def color(k):
+    return (10 * k, (40 * k) % 256, 255 - 7 * k)
+
+
+def frame_bytes(rgb, size=SIZE):
+    return bytes(rgb) * (size[0] * size[1])
+
+
+def test_stack_is_oldest_to_newest_across_the_wrap():
+    surface = pygame.Surface(SIZE)
+    observer = PixelObserver(surface, stack=3)
+    pushed = []
+    for k in range(10):
+        surface.fill(color(k))
+        pushed.append(color(k))
+        frames = bytes(observer.observe())
+        # Before three frames exist, the first one stands in for the older ones
+        expected = [pushed[max(0, i)] for i in range(k - 2, k + 1)]
+        assert frames == b"".join(frame_bytes(rgb) for rgb in expected), k
+        assert bytes(observer.stacked()) == frames
+        assert bytes(observer.latest()) == frame_bytes(color(k))
+
+
+def test_reset_starts_a_new_stack():
+    surface = pygame.Surface(SIZE)
+    observer = PixelObserver(surface, stack=4)
+    for k in range(6):
+        surface.fill(color(k))
+        observer.observe()
+    observer.reset()
+    surface.fill(color(20))
+    assert bytes(observer.observe()) == frame_bytes(color(20)) * 4
+
+
+def test_grayscale_matches_the_luma_weights():
+    surface = pygame.Surface(SIZE)
+    surface.fill((200, 100, 50))
+    observer = PixelObserver(surface, grayscale=True)
+    # (77 * 200 + 150 * 100 + 29 * 50) >> 8 = 31850 >> 8 = 124
+    assert bytes(observer.observe()) == bytes([124]) * (SIZE[0] * SIZE[1])
+    surface.fill((255, 255, 255))
+    assert set(bytes(observer.observe())) == {255}
+
+
+def test_downsample_keeps_every_nth_pixel():
+    surface = pygame.Surface((9, 5))
+    surface.fill((0, 0, 0))
+    for y in (0, 4):
+        for x in (0, 4, 8):
+            surface.set_at((x, y), (x * 20, y * 40, 7))
+    observer = PixelObserver(surface, downsample=4)
+    assert (observer.width, observer.height) == (3, 2)
+    expected = b"".join(bytes((x * 20, y * 40, 7)) for y in (0, 4) for x in (0, 4, 8))
+    assert bytes(observer.observe()) == expected
+
+    gray = PixelObserver(surface, grayscale=True, downsample=4)
+    assert bytes(gray.observe()) == bytes((77 * x * 20 + 150 * y * 40 + 29 * 7) >> 8
+                                          for y in (0, 4) for x in (0, 4, 8))
@@ -0,0 +1,125 @@
+import pytest
+
+from pong_physics import sweep, intercept, WALL, PADDLE
+from pong_sim import PongSim, NO_POINT, PLAYER_POINT, OPPONENT_POINT
+from pong_tournament import play_match
+
+# pong_physics.sweep and PongSim: a swept ball never tunnels through a
+# paddle or leaves the court, intercept() agrees with stepping the ball,
+# and a match replays exactly. Tournament matches between policies that
+# never miss still finish through the rally cap's overtime.
+
+HEIGHT = 600
+SIZE = 20
+PADDLE_RECT = (780, 250, 10, 100)
+
+
+@pytest.mark.parametrize("speed", [5, 40, 200, 1000])
+def test_fast_ball_bounces_off_the_paddle(speed):
+    # One step would carry the ball well past the paddle without sweeping
+    x, y, vx, vy, hits = sweep(700, 290, speed, 0, SIZE, HEIGHT, [PADDLE_RECT])
+    while not hits & PADDLE:
+        assert x + SIZE <= PADDLE_RECT[0]
+        x, y, vx, vy, hits = sweep(x, y, vx, vy, SIZE, HEIGHT, [PADDLE_RECT])
+    assert vx == -speed
+    assert x + SIZE <= PADDLE_RECT[0]
+
+
+def test_ball_missing_the_paddle_passes():
+    x, y, vx, vy, hits = sweep(700, 100, 200, 0, SIZE, HEIGHT, [PADDLE_RECT])
+    assert hits == 0 and (x, vx) == (900, 200)
+
+
+def test_walls_reflect():
+    x, y, vx, vy, hits = sweep(100, 10, 0, -30, SIZE, HEIGHT, [])
+    assert hits == WALL
+    assert y == pytest.approx(20) and vy == 30
+    x, y, vx, vy, hits = sweep(100, HEIGHT - SIZE - 5, 3, 25, SIZE, HEIGHT, [])
+    assert hits == WALL
+    assert y == pytest.approx(HEIGHT - SIZE - 20) and vy == -25
+
+
+def test_ball_stays_in_the_court():
+    x, y, vx, vy = 400, 300, 37.0, 53.0
+    paddles = [(10, 250, 10, 100), PADDLE_RECT]
+    for _ in range(500):
+        x, y, vx, vy, _ = sweep(x, y, vx, vy, SIZE, HEIGHT, paddles)
+        assert 0 <= y <= HEIGHT - SIZE
+        if x < -SIZE or x > 800:
+            break
+
+
+def test_ball_inside_a_paddle_leaves_it():
+    x, y, vx, vy, hits = sweep(775, 290, 5, 0, SIZE, HEIGHT, [PADDLE_RECT])
+    assert hits == 0 and vx == 5
+
+
+def test_intercept_matches_stepping():
+    x, y, vx, vy = 400.0, 123.0, -7.0, 11.0
+    plane = 20
+    predicted = intercept(x, y, vx, vy, SIZE, HEIGHT, plane)
+    while x > plane:
+        x, y, vx, vy, _ = sweep(x, y, vx, vy, SIZE, HEIGHT, [], dt=min(1.0, (x - plane) / -vx))
+    assert y == pytest.approx(predicted)
+    assert intercept(x, y, 7, 0, SIZE, HEIGHT, plane - 100) is None
+
+
+def play(ticks, speedup=1.0):
+    sim = PongSim(speedup=speedup)
+    results = []
+    for tick in range(ticks):
+        # Scripted player: follows the ball, but slower than it
+        centre = sim.player_y + sim.paddle_height // 2
+        ball = sim.ball_y + sim.ball_size // 2
+        results.append(sim.step(max(-3, min(3, ball - centre)), 0))
+        assert 0 <= sim.ball_y <= sim.height - sim.ball_size
+        assert 0 <= sim.player_y <= sim.height - sim.paddle_height
+    return sim, results
+
+
+def test_match_repeats():
+    first, results = play(5000)
+    second, again = play(5000)
+    assert results == again
+    assert first.state() == second.state()
+
+
+def test_points_are_scored_and_served():
+    sim, results = play(5000)
+    assert results.count(PLAYER_POINT) == sim.player_score
+    assert results.count(OPPONENT_POINT) == sim.opponent_score
+    assert results.count(NO_POINT) == len(results) - sim.player_score - sim.opponent_score
+    assert sim.player_score + sim.opponent_score > 0
+
+
+def test_speedup_grows_the_rally_speed_and_serve_resets_it():
+    sim = PongSim(ai_enabled=False, speedup=1.5)
+    sim.opponent_y = sim.ball_y - 40
+    sim.ball_vx, sim.ball_vy = -5, 0
+    while not sim.hits & PADDLE:
+        sim.step()
+    assert sim.rally == 1 and sim.ball_vx == pytest.approx(7.5)
+    sim.serve()
+    assert sim.ball_vx == -5  # back to the serve speed, the other way
+    assert (abs(sim.ball_vx), abs(sim.ball_vy)) == sim.serve_speed and sim.rally == 0
+
+
+INTERCEPT = ("intercept", {"speed": 5})
+TRACK = ("track", {"speed": 5})
+
+
+def test_capped_rallies_go_to_overtime():
+    # At constant speed neither policy misses; past 10 hits the ball speeds
+    # up until one does, and every point is played out
+    left, right, ticks, rallies, hits, longest = play_match(INTERCEPT, TRACK, seed=1, points=3,
+                                                            max_ticks=100_000, max_rally=10)
+    assert max(left, right) == 3 and rallies == left + right
+    assert longest > 10 and ticks < 100_000
+    assert play_match(INTERCEPT, TRACK, seed=1, points=3, max_ticks=100_000, max_rally=10) == \
+        (left, right, ticks, rallies, hits, longest)
+
+
+def test_uncapped_rallies_run_to_max_ticks():
+    left, right, ticks, rallies, _, _ = play_match(INTERCEPT, TRACK, seed=1, points=3, max_ticks=3000,
+                                                   max_rally=0)
+    assert (left, right, ticks, rallies) == (0, 0, 3000, 0)
@@ -0,0 +1,135 @@
+import asyncio
+import struct
+
+import pytest
+
+from pong_net import (put_varint, get_varint, encode_snapshot, decode_snapshot, snapshot_state,
+                      move_paddle, PongServer, SNAPSHOT, NO_BASE, PADDLE_SPEED, HELLO, WELCOME, INPUT,
+                      VERSION, MAX_COMMANDS, CATCH_UP)
+from pong_sim import PongSim
+
+# pong_net's wire format: zigzag varints and delta snapshots decode to
+# what was encoded, against a base or without one. The server paces each
+# client to one command per tick and ignores malformed packets.
+
+
+@pytest.mark.parametrize("value", [0, 1, -1, 63, -64, 64, 300, -300, 2 ** 31, -2 ** 31, 2 ** 62])
+def test_varint_round_trip(value):
+    out = bytearray()
+    put_varint(out, value)
+    assert get_varint(bytes(out) + b"\xff", 0) == (value, len(out))
+
+
+def test_small_values_take_one_byte():
+    for value in range(-64, 64):
+        out = bytearray()
+        put_varint(out, value)
+        assert len(out) == 1
+
+
+def test_full_snapshot_round_trip():
+    state = (390, 290, 5, -5, 250, 250, 0, 3)
+    data = encode_snapshot(120, state, 0, None, 17)
+    assert data[0] == SNAPSHOT
+    assert decode_snapshot(data, {}) == (120, state, 17)
+
+
+def test_delta_snapshot_round_trip():
+    base = (390, 290, 5, -5, 250, 250, 0, 3)
+    state = (395, 285, 5, -5, 250, 244, 0, 3)
+    data = encode_snapshot(123, state, 120, base, 9)
+    _, _, back, _, mask = struct.unpack_from("<BIBIB", data)
+    assert back == 3
+    assert mask == 0b100011  # ball x, ball y, right paddle
+    assert len(data) == 11 + 3
+    assert decode_snapshot(data, {120: base}) == (123, state, 9)
+    assert decode_snapshot(data, {}) is None  # base not known (yet)
+
+
+def test_unchanged_state_is_header_only():
+    state = (1, 2, 3, 4, 5, 6, 7, 8)
+    data = encode_snapshot(10, state, 9, state, 0)
+    assert len(data) == 11
+    assert decode_snapshot(data, {9: state})[1] == state
+    assert len(encode_snapshot(10, NO_BASE, 0, None, 0)) == 11
+
+
+def test_snapshots_of_a_running_sim():
+    sim = PongSim()
+    bases = {}
+    acked, base = 0, None
+    for tick in range(1, 600):
+        sim.step(0, 0)
+        state = snapshot_state(sim)
+        decoded = decode_snapshot(encode_snapshot(tick, state, acked, base, tick), bases)
+        assert decoded == (tick, state, tick)
+        bases[tick] = state
+        if tick % 3 == 0:
+            acked, base = tick, state
+
+
+def test_move_paddle_clamps():
+    sim = PongSim()
+    assert move_paddle(100, 1, sim) == 100 + PADDLE_SPEED
+    assert move_paddle(2, -1, sim) == 0
+    bottom = sim.height - sim.paddle_height
+    assert move_paddle(bottom - 1, 1, sim) == bottom
+
+
+class Transport:
+    def __init__(self):
+        self.sent = []
+
+    def sendto(self, data, addr):
+        self.sent.append((addr, data))
+
+
+def input_packet(first, directions, acked=0):
+    return struct.pack("<BIIB", INPUT, acked, first, len(directions)) + struct.pack(f"<{len(directions)}b",
+                                                                                     *directions)
+
+
+def test_server_paces_and_validates_input():
+    async def run():
+        server = PongServer()
+        transport = Transport()
+        server.connection_made(transport)
+        left, right, stranger = ("l", 1), ("r", 2), ("s", 3)
+        server.datagram_received(bytes((HELLO, VERSION)), left)
+        server.datagram_received(bytes((HELLO, VERSION)), right)
+        server.datagram_received(bytes((HELLO, VERSION + 1)), stranger)
+        assert [addr for addr, data in transport.sent if data[0] == WELCOME] == [left, right]
+        assert stranger not in server.players
+        player = server.players[left]
+        start = server.sim.opponent_y
+
+        # Sixteen commands at once still move the paddle one step per tick
+        server.datagram_received(input_packet(1, [1] * MAX_COMMANDS), left)
+        assert player.applied_seq == 1
+        now = asyncio.get_running_loop().time()
+        for tick in range(5):
+            server.update(now)
+            assert player.applied_seq == 2 + tick
+        assert server.sim.opponent_y == start + 6 * PADDLE_SPEED
+
+        # The queue is capped, the oldest commands go first
+        server.datagram_received(input_packet(17, [1] * MAX_COMMANDS), left)
+        assert len(player.commands) == MAX_COMMANDS and player.dropped == 10
+        assert player.commands[0][0] == 17
+
+        # Malformed packets are ignored
+        applied = player.applied_seq
+        for data in (bytes((INPUT, 0, 0)), input_packet(40, [1] * (MAX_COMMANDS + 1)),
+                     input_packet(40, [1, 1, 1])[:-1]):
+            server.datagram_received(data, left)
+        assert player.applied_seq == applied and player.next_seq == 33
+        assert len(player.commands) == MAX_COMMANDS
+
+        # An idle client banks CATCH_UP commands on top of the one per tick
+        idle = server.players[right]
+        for _ in range(10):
+            server.update(now)
+        server.datagram_received(input_packet(1, [-1] * 8), right)
+        assert idle.applied_seq == 1 + CATCH_UP
+
+    asyncio.run(run())
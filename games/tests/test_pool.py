@@ -0,0 +1,93 @@
+import random
+
+from common.pool import ProjectilePool
+
+# ProjectilePool: live projectiles stay packed in [0, count), removing one
+# swaps the last into its slot, and handles keep naming the same
+# projectile until it dies.
+
+
+def check_pool(pool):
+    ids, slot = pool.ids, pool.slot
+    assert sorted(ids) == list(range(pool.capacity))  # every handle exactly once
+    for i in range(pool.count):
+        assert slot[ids[i]] == i
+    for i in range(pool.count, pool.capacity):
+        assert slot[ids[i]] == -1
+
+
+def test_swap_remove():
+    pool = ProjectilePool(8, 5, 10)
+    handles = [pool.spawn(i, 100 + i, -1) for i in range(5)]
+    pool.remove(1)
+    # The last one moved into slot 1; the others didn't move
+    assert pool.count == 4
+    assert [pool.x[i] for i in range(4)] == [0, 4, 2, 3]
+    assert not pool.alive(handles[1])
+    assert pool.slot[handles[4]] == 1
+    check_pool(pool)
+
+
+def test_handles_follow_their_projectile():
+    pool = ProjectilePool(64, 5, 10)
+    rng = random.Random(1)
+    live = {}
+    for _ in range(2000):
+        if live and rng.random() < 0.45:
+            handle = rng.choice(list(live))
+            pool.kill(handle)
+            pool.kill(handle)  # dead already: nothing happens
+            del live[handle]
+        else:
+            x = float(rng.randrange(800))  # exact in the float32 array
+            handle = pool.spawn(x, 300, 0)
+            if len(live) == pool.capacity:
+                assert handle is None  # full: the shot is dropped
+                continue
+            assert handle not in live
+            live[handle] = x
+        check_pool(pool)
+        assert pool.count == len(live)
+        for handle, x in live.items():
+            assert pool.alive(handle)
+            assert pool.x[pool.slot[handle]] == x
+
+
+def test_kill_many_ignores_order_and_repeats():
+    def run(order):
+        pool = ProjectilePool(16, 5, 10)
+        handles = [pool.spawn(i, 0, 0) for i in range(10)]
+        pool.kill_many([handles[i] for i in order])
+        check_pool(pool)
+        return list(pool.x[:pool.count])
+    assert run([1, 4, 7]) == run([7, 1, 4]) == run([4, 4, 7, 1, 1])
+
+
+def test_update_drops_what_leaves():
+    pool = ProjectilePool(16, 5, 10)
+    up = pool.spawn(0, 5, -8)
+    down = pool.spawn(1, 592, 5)  # 597, then past the bottom
+    stays = pool.spawn(2, 300, 5)
+    pool.update(0, 600)
+    assert not pool.alive(up) and pool.alive(down) and pool.alive(stays)
+    pool.update(0, 600)
+    assert not pool.alive(down) and pool.alive(stays)
+    assert pool.y[pool.slot[stays]] == 310
+    check_pool(pool)
+    pool.clear()
+    assert pool.count == 0 and not pool.alive(stays)
+    check_pool(pool)
+
+
+def test_overlapping_matches_colliderect():
+    pool = ProjectilePool(256, 5, 10)
+    rng = random.Random(2)
+    for _ in range(200):
+        pool.spawn(rng.uniform(0, 200), rng.uniform(0, 200), 0)
+    rect = (60, 70, 40, 30)
+    x, y, w, h = rect
+    expected = {pool.ids[i] for i in range(pool.count)
+                if pool.x[i] < x + w and x < pool.x[i] + 5 and pool.y[i] < y + h and y < pool.y[i] + 10}
+    assert set(pool.overlapping(rect)) == expected
+    assert expected  # the test hits something
+    assert list(pool.positions()) == [(r[0], r[1]) for r in pool.rects()]
@@ -0,0 +1,92 @@
+import csv
+import json
+
+import pytest
+
+from common import profiler
+from common.profiler import FrameProfiler
+
+# Frame profiler: time between marks goes to the marked phase, the ring
+# keeps the newest frames oldest first, the dumps hold what it kept, and
+# one exit hook dumps the newest profiler per path.
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now += ms / 1000
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.delenv("GAMES_PROFILE_OUT", raising=False)
+    monkeypatch.setattr(profiler.time, "perf_counter", clock)
+    return clock
+
+
+def run_frames(prof, clock, frames):
+    for frame in range(frames):
+        prof.begin()
+        clock.advance(1)
+        prof.mark("events")
+        clock.advance(frame)
+        prof.mark("drawing")
+        clock.advance(2)
+        prof.mark("events")  # a phase may be marked twice
+        prof.end()
+
+
+def test_ring_keeps_newest_frames(clock):
+    prof = FrameProfiler(phases=("events", "drawing"), capacity=4)
+    run_frames(prof, clock, 6)
+    assert prof.frames == 6
+    assert prof.column("events") == pytest.approx([3, 3, 3, 3])
+    assert prof.column("drawing") == pytest.approx([2, 3, 4, 5])
+    stats = prof.summary()
+    assert stats["drawing"]["max"] == pytest.approx(5)
+    assert stats["total"]["p50"] == pytest.approx(7)
+
+
+def test_partial_ring(clock):
+    prof = FrameProfiler(phases=("events", "drawing"), capacity=10)
+    assert prof.summary()["total"] == {"p50": 0.0, "p99": 0.0, "max": 0.0}
+    run_frames(prof, clock, 3)
+    assert prof.column("drawing") == pytest.approx([0, 1, 2])
+
+
+def test_dumps(clock, tmp_path):
+    prof = FrameProfiler(phases=("events", "drawing"), capacity=4)
+    run_frames(prof, clock, 6)
+
+    prof.dump(str(tmp_path / "frames.csv"))
+    with open(tmp_path / "frames.csv") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["frame", "events", "drawing"]
+    assert [int(row[0]) for row in rows[1:]] == [2, 3, 4, 5]
+    assert [float(row[2]) for row in rows[1:]] == pytest.approx([2, 3, 4, 5])
+
+    prof.dump(str(tmp_path / "frames.json"))
+    with open(tmp_path / "frames.json") as f:
+        data = json.load(f)
+    assert data["frames"] == 6
+    assert data["samples_ms"]["drawing"] == pytest.approx([2, 3, 4, 5])
+
+
+def test_one_exit_hook_dumps_the_newest(clock, tmp_path, monkeypatch):
+    hooks = []
+    monkeypatch.setattr(profiler.atexit, "register", hooks.append)
+    monkeypatch.setattr(profiler, "exit_dumps", {})
+    out = str(tmp_path / "frames.json")
+    FrameProfiler(phases=("events", "drawing"), out_path=out)
+    newest = FrameProfiler(phases=("events", "drawing"), out_path=out)
+    run_frames(newest, clock, 2)
+    assert hooks == [profiler.dump_at_exit]
+    profiler.dump_at_exit()
+    with open(out) as f:
+        assert json.load(f)["frames"] == 2
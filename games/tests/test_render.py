@@ -0,0 +1,149 @@
+import random
+
+import pygame
+import pytest
+
+from common.hud import Hud
+from common.render import Renderer
+from snake_sim import SnakeSim, LEFT, RIGHT, UP, DOWN
+from snake_view import SnakeView, black, blue, red
+
+# Dirty-rect frames and batched sprite blits: drawing only what changed
+# since the last frame, or one pre-rendered sprite per entity, leaves the
+# same pixels as repainting everything with one draw call per entity.
+
+MOVES = {LEFT: (-1, 0), RIGHT: (1, 0), UP: (0, -1), DOWN: (0, 1)}
+
+
+@pytest.fixture
+def display(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.delenv("GAMES_NO_RENDER", raising=False)
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((64, 64))
+    yield
+    pygame.quit()
+
+
+def pixels(surface):
+    return pygame.image.tobytes(surface, "RGB")
+
+
+def toward_food(sim, rng):
+    block = sim.block
+    options = []
+    for action, (dx, dy) in MOVES.items():
+        x, y = sim.x + dx * block, sim.y + dy * block
+        if 0 <= x < sim.width and 0 <= y < sim.height and (x, y) not in sim.occupied \
+                and (x, y) not in sim.obstacle_cells:
+            options.append((abs(x - sim.food[0]) + abs(y - sim.food[1]) + rng.random() * 4 * block, action))
+    return min(options)[1] if options else None
+
+
+def test_snake_dirty_frames_match_full_frames(display):
+    hud = Hud(pygame.font.Font(None, 30), red)
+    sim = SnakeSim(seed=5)
+    full = Renderer(pygame.Surface((sim.width, sim.height)), blue, dirty=False)
+    dirty = Renderer(pygame.Surface((sim.width, sim.height)), blue, dirty=True)
+    views = [SnakeView(full, hud), SnakeView(dirty, hud)]
+    reference = pygame.Surface((sim.width, sim.height))
+    rng = random.Random(5)
+    incremental = 0
+    for _ in range(600):
+        if sim.step(toward_food(sim, rng)):
+            sim.reset()
+            dirty.invalidate()
+        incremental += dirty.incremental
+        for view in views:
+            view.draw(sim, 12)
+            view.renderer.present()
+        draw_each_cell(reference, views[0], sim, 12)
+        assert pixels(full.screen) == pixels(reference)
+        assert pixels(dirty.screen) == pixels(reference)
+    assert incremental > 500 and sim.score
+
+
+def draw_each_cell(surface, view, sim, high_score):
+    # The frame as drawn before sprites: one draw.rect per cell
+    surface.fill(blue)
+    for color, pos in view.items(sim):
+        pygame.draw.rect(surface, color, view.cell(pos))
+    for segment in sim.snake_list:
+        pygame.draw.rect(surface, black, view.cell(segment))
+    view.score_hud.draw(surface, [10, 10], "Score: ", sim.score, "  High: ", high_score)
+
+
+def test_sprite_batches_match_draw_calls(display):
+    size = (320, 240)
+    shapes = [((200, 40, 40), (12, 8), "rect"), ((250, 250, 250), (3, 10), "rect"),
+              ((255, 255, 0), (15, 15), "ellipse")]
+    rng = random.Random(2)
+    entities = [[[rng.randrange(-20, 320), rng.randrange(-20, 240)] for _ in range(40)] for _ in shapes]
+    reference = Renderer(pygame.Surface(size), black, dirty=False)
+    batched = [Renderer(pygame.Surface(size), black, dirty=dirty) for dirty in (False, True)]
+    for frame in range(200):
+        for positions in entities:
+            for pos in positions:
+                pos[0] += rng.randint(-3, 3)
+                pos[1] += rng.randint(-3, 3)
+        if frame % 50 == 0:
+            del entities[0][-5:]  # some go away
+
+        reference.begin()
+        for (color, wh, shape), positions in zip(shapes, entities):
+            draw = reference.ellipse if shape == "ellipse" else reference.rect
+            for pos in positions:
+                draw(color, (pos[0], pos[1], wh[0], wh[1]))
+        reference.present()
+
+        for renderer in batched:
+            renderer.begin()
+            for (color, wh, shape), positions in zip(shapes, entities):
+                renderer.blits(renderer.sprite(color, wh, shape), positions)
+            renderer.present()
+            assert pixels(renderer.screen) == pixels(reference.screen)
+
+
+def play_snake_script(monkeypatch, redraw_every_frame):
+    # snake.py in dirty mode, steered toward the food (C after a crash);
+    # the frames it shows, or every frame fully redrawn for reference
+    import snake
+
+    monkeypatch.setenv("GAMES_SEED", "9")
+    screen = pygame.display.set_mode(snake.Game.size)
+    game = snake.Game(screen)
+    game.renderer = Renderer(screen, snake.blue, dirty=True)
+    keys = {LEFT: pygame.K_LEFT, RIGHT: pygame.K_RIGHT, UP: pygame.K_UP, DOWN: pygame.K_DOWN}
+    rng = random.Random(9)
+
+    def events():
+        if game.state_name != snake.PLAYING:
+            return [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_c)]
+        sim = SnakeSim(seed=0, obstacles=0)
+        sim.x, sim.y, sim.food, sim.occupied = game.x1, game.y1, [game.foodx, game.foody], game.occupied
+        action = toward_food(sim, rng)
+        return [pygame.event.Event(pygame.KEYDOWN, key=keys[action])] if action else []
+
+    game.session.events = events
+    frames = []
+    eaten = 0
+    for _ in range(1500):
+        game.step()
+        if redraw_every_frame:
+            game.renderer.invalidate()
+        game.render()
+        eaten = max(eaten, game.length_of_snake - 1)
+        frames.append(pixels(screen))
+    return frames, eaten
+
+
+def test_snake_script_dirty_frames_match_full_redraws(display, monkeypatch):
+    monkeypatch.delenv("GAMES_RECORD", raising=False)
+    monkeypatch.delenv("GAMES_REPLAY", raising=False)
+    monkeypatch.delenv("GAMES_BENCH_TICKS", raising=False)
+    dirty, eaten = play_snake_script(monkeypatch, False)
+    full, _ = play_snake_script(monkeypatch, True)
+    assert eaten > 3
+    for frame, (got, expected) in enumerate(zip(dirty, full)):
+        assert got == expected, f"frame {frame} differs"
@@ -0,0 +1,158 @@
+import os
+import random
+
+import pygame
+import pytest
+
+from common import game, replay
+
+# Replay logs: a recorded session plays back the same input on the same
+# ticks and the same seeded random draws, checkpoints catch a state that
+# diverges, and the header names the game, keys and preset.
+
+KEYS = [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_SPACE]
+GAME = os.path.join(replay.GAMES_DIR, "tests", "fake_game.py")
+
+
+@pytest.fixture
+def display(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    for name in ("GAMES_RECORD", "GAMES_REPLAY", "GAMES_BENCH_TICKS", "GAMES_CAPTURE", "GAMES_PRESET"):
+        monkeypatch.delenv(name, raising=False)
+    pygame.display.init()
+    yield
+    pygame.quit()
+
+
+def script(ticks, seed):
+    # Per tick, the key events to post: quiet stretches (longer than one
+    # idle record), single presses, and one burst past 63 events
+    rng = random.Random(seed)
+    ticks_events = []
+    for tick in range(ticks):
+        if tick == 150:
+            events = [(pygame.KEYDOWN if i % 2 == 0 else pygame.KEYUP, pygame.K_SPACE) for i in range(100)]
+        elif 20 <= tick < 120 or rng.random() < 0.6:
+            events = []
+        else:
+            events = [(rng.choice((pygame.KEYDOWN, pygame.KEYUP)), rng.choice(KEYS + [pygame.K_a]))]
+        ticks_events.append(events)
+    return ticks_events
+
+
+def play(session, ticks_events, clock):
+    # What the game would see: input, held keys and random draws per tick
+    seen = []
+    state = 0
+    for events in ticks_events:
+        for kind, key in events:
+            pygame.event.post(pygame.event.Event(kind, key=key))
+        got = [(event.type, getattr(event, "key", None)) for event in session.events()]
+        held = tuple(session.pressed()[key] for key in KEYS)
+        draw = random.random()
+        state = (state * 31 + len(got) + held.count(True)) % 1_000_003
+        session.tick(clock, 0, (state, draw))
+        seen.append((got, held, draw))
+    return seen
+
+
+def record(path, monkeypatch, ticks_events, verify_every=5):
+    monkeypatch.setenv("GAMES_RECORD", str(path))
+    monkeypatch.setenv("GAMES_SEED", "1234")
+    monkeypatch.setenv("GAMES_VERIFY_EVERY", str(verify_every))
+    monkeypatch.setenv("GAMES_PRESET", "stress")
+    session = replay.Session(GAME, KEYS)
+    seen = play(session, ticks_events, pygame.time.Clock())
+    session.close()
+    replay.recordings.pop(str(path), None)
+    for name in ("GAMES_RECORD", "GAMES_SEED", "GAMES_VERIFY_EVERY", "GAMES_PRESET"):
+        monkeypatch.delenv(name)
+    return seen
+
+
+def test_record_replay_round_trip(tmp_path, monkeypatch, display):
+    path = tmp_path / "session.rec"
+    ticks_events = script(400, seed=1)
+    recorded = record(path, monkeypatch, ticks_events)
+    # Keys outside the session's set are dropped; the burst is all there
+    assert all(key != pygame.K_a for got, _, _ in recorded for _, key in got)
+    assert len(recorded[150][0]) == 100
+
+    monkeypatch.setenv("GAMES_REPLAY", str(path))
+    session = replay.Session(GAME, KEYS)
+    assert session.replaying and session.seed == 1234 and session.preset == "stress"
+    # Replaying ignores what really happens: post nothing
+    replayed = play(session, [[] for _ in ticks_events], None)
+    assert replayed == recorded
+    assert session.checkpoints == len(ticks_events) // 5
+    with pytest.raises(SystemExit):
+        session.events()  # end of the log
+
+
+def test_header(tmp_path, monkeypatch, display):
+    path = tmp_path / "session.rec"
+    record(path, monkeypatch, script(10, seed=2), verify_every=0)
+    with open(path, "rb") as log:
+        header = replay.read_header(log)
+    assert header == {"game": "tests/fake_game.py", "seed": 1234, "verify_every": 0, "keys": KEYS,
+                      "preset": "stress"}
+    monkeypatch.setenv("GAMES_REPLAY", str(path))
+    assert replay.preset() == "stress"
+    with pytest.raises(replay.ReplayMismatch):
+        replay.Session(os.path.join(replay.GAMES_DIR, "other_game.py"), KEYS)
+    with pytest.raises(replay.ReplayMismatch):
+        replay.Session(GAME, KEYS[:2])
+
+
+def test_preset_sizes_the_display(tmp_path, monkeypatch, display):
+    class Game:
+        size = (64, 48)
+        preset_sizes = {"stress": (80, 60)}
+        caption = "fake"
+
+    assert game.open_display(Game).get_size() == (64, 48)
+    path = tmp_path / "session.rec"
+    record(path, monkeypatch, script(3, seed=4))
+    # Replaying picks the recorded preset's size, whatever the environment says
+    monkeypatch.setenv("GAMES_REPLAY", str(path))
+    assert game.open_display(Game).get_size() == (80, 60)
+
+
+def test_diverging_state_is_caught(tmp_path, monkeypatch, display):
+    path = tmp_path / "session.rec"
+    ticks_events = script(50, seed=3)
+    record(path, monkeypatch, ticks_events)
+    monkeypatch.setenv("GAMES_REPLAY", str(path))
+    session = replay.Session(GAME, KEYS)
+    with pytest.raises(replay.ReplayMismatch, match="diverged at tick 5"):
+        for tick in range(50):
+            session.events()
+            session.tick(None, 0, ("not", "the", "recorded", tick))
+
+
+def test_escape_is_recorded_as_quit(tmp_path, monkeypatch, display):
+    path = tmp_path / "session.rec"
+    ticks_events = [[], [(pygame.KEYDOWN, pygame.K_ESCAPE)], []]
+    recorded = record(path, monkeypatch, ticks_events)
+    assert recorded[1][0] == [(pygame.QUIT, None)]
+    monkeypatch.setenv("GAMES_REPLAY", str(path))
+    session = replay.Session(GAME, KEYS)
+    assert play(session, [[], [], []], None)[1][0] == [(pygame.QUIT, None)]
+
+
+def test_new_recording_closes_the_previous(tmp_path, monkeypatch, display):
+    # As the launcher does: one game after another recording to one path,
+    # with a single exit hook for all of them
+    hooks = []
+    monkeypatch.setattr(replay.atexit, "register", hooks.append)
+    path = str(tmp_path / "session.rec")
+    monkeypatch.setenv("GAMES_RECORD", path)
+    first = replay.Session(GAME, KEYS)
+    second = replay.Session(GAME, KEYS)
+    assert first.log.closed and not second.log.closed
+    assert replay.recordings == {path: second}
+    assert hooks == [replay.close_recordings]
+    replay.close_recordings()
+    assert second.log.closed
+    replay.recordings.clear()
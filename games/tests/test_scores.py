@@ -0,0 +1,108 @@
+import os
+
+from common import scores
+from common.scores import ScoreStore
+
+# ScoreStore: a top-N board per game, best first with ties in submission
+# order, saved by the writer thread and read back by the next store.
+# Read-only stores (replays, benchmarks) never touch the disk, and games
+# share one store per database and mode.
+
+
+def test_ranks_and_board_size(tmp_path):
+    store = ScoreStore(str(tmp_path / "scores.db"), top_n=3)
+    assert store.best("snake") == 0 and store.top("snake") == []
+    assert store.submit("snake", 10) == 0
+    assert store.submit("snake", 30) == 0
+    assert store.submit("snake", 10) == 2  # ties go after the earlier entry
+    assert store.submit("snake", 5) is None  # doesn't place
+    assert store.submit("snake", 20) == 1
+    assert [score for score, _ in store.top("snake")] == [30, 20, 10]
+    assert store.best("snake") == 30
+    assert store.best("pong") == 0
+    store.close()
+
+
+def test_scores_survive_a_restart(tmp_path):
+    path = str(tmp_path / "scores.db")
+    store = ScoreStore(path, top_n=3)
+    for score in (4, 8, 15, 16, 23, 42):
+        store.submit("space2", score)
+    store.submit("bird", 7)
+    store.flush()
+    store.close()
+
+    again = ScoreStore(path, top_n=3)
+    assert again.top("space2") == store.top("space2")
+    assert [score for score, _ in again.top("space2")] == [42, 23, 16]
+    assert again.best("bird") == 7
+    again.close()
+
+
+def test_read_only_keeps_the_disk_as_is(tmp_path):
+    path = str(tmp_path / "scores.db")
+    store = ScoreStore(path, read_only=True)
+    assert store.submit("snake", 99) == 0
+    assert store.best("snake") == 99
+    store.flush()
+    assert not os.path.exists(path)
+
+    writer = ScoreStore(path)
+    writer.submit("snake", 3)
+    writer.flush()
+    writer.close()
+    reader = ScoreStore(path, read_only=True)
+    reader.submit("snake", 50)
+    assert ScoreStore(path).top("snake") == writer.top("snake")
+
+
+def test_read_only_opens_without_writing(tmp_path, monkeypatch):
+    path = tmp_path / "scores.db"
+    writer = ScoreStore(str(path))
+    writer.submit("bird", 12)
+    writer.flush()
+    writer.close()
+    files = sorted(os.listdir(tmp_path))
+    data = path.read_bytes()
+
+    # What is next to the database while the reader has it open
+    seen = []
+    connect = ScoreStore.connect
+
+    class Watched:
+        def __init__(self, db):
+            self.db = db
+
+        def execute(self, *args):
+            return self.db.execute(*args)
+
+        def close(self):
+            seen.append(sorted(os.listdir(tmp_path)))
+            self.db.close()
+
+    monkeypatch.setattr(ScoreStore, "connect", lambda store: Watched(connect(store)))
+    reader = ScoreStore(str(path), read_only=True)
+    assert reader.best("bird") == 12
+    # No -wal or -shm files, and not a byte changed
+    assert seen == [files]
+    assert sorted(os.listdir(tmp_path)) == files
+    assert path.read_bytes() == data
+
+
+def test_shared_store_per_path_and_mode(tmp_path, monkeypatch):
+    monkeypatch.setattr(scores, "stores", {})
+    monkeypatch.setenv("GAMES_SCORES", str(tmp_path / "scores.db"))
+    store = scores.shared_store()
+    assert scores.shared_store() is store
+    reader = scores.shared_store(read_only=True)
+    assert reader is not store and reader.read_only
+    monkeypatch.setenv("GAMES_SCORES", str(tmp_path / "other.db"))
+    assert scores.shared_store() is not store
+
+
+def test_unreadable_database_is_logged(tmp_path, caplog):
+    path = tmp_path / "scores.db"
+    path.write_bytes(b"not a database" * 100)
+    store = ScoreStore(str(path))
+    assert store.best("snake") == 0
+    assert "could not read the score database" in caplog.text
@@ -0,0 +1,38 @@
+from snake_autopilot import Autopilot
+from snake_sim import SnakeSim, LEFT, RIGHT, UP
+
+# Autopilot on a 200x200 board: it stays alive and eats, a planning tick
+# searches no more than its budget (unless it has nothing left to follow),
+# asking twice in a tick gives the same move, and a turn it didn't choose
+# drops its plan.
+
+
+def test_search_stays_within_the_tick_budget():
+    sim = SnakeSim(2000, 2000, 10, obstacles=400, seed=1)
+    pilot = Autopilot(sim)
+    spread = 0
+    for _ in range(4000):
+        layers, overruns, chases = pilot.search_layers, pilot.overruns, pilot.tail_chases
+        action = pilot()
+        assert pilot() == action
+        if pilot.overruns == overruns and pilot.tail_chases == chases:
+            assert pilot.search_layers - layers <= pilot.budget
+            spread += pilot.search_layers > layers
+        assert not sim.step(action)
+    assert sim.length > 30
+    assert pilot.jobs > 30 and spread > pilot.jobs  # plans took several ticks
+    assert pilot.overruns < pilot.jobs // 4
+
+
+def test_steering_off_the_path_drops_the_plan():
+    sim = SnakeSim(2000, 2000, 10, obstacles=0, seed=2)
+    pilot = Autopilot(sim)
+    for _ in range(50):
+        assert not sim.step(pilot())
+    # A turn the autopilot didn't choose (a key press)
+    action = pilot()
+    sim.step(UP if action in (LEFT, RIGHT) else LEFT)
+    action = pilot()
+    head = pilot.bit((sim.x, sim.y))
+    assert pilot.path and pilot.moves[pilot.path[-1] - head] == action
+    assert not sim.step(action)
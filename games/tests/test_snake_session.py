@@ -0,0 +1,145 @@
+import os
+import resource
+import sys
+import tracemalloc
+
+import pygame
+import pytest
+
+from snake_sim import SnakeSim, SnakeSession, PLAYING, GAME_OVER, RESTARTING, QUIT, RIGHT
+
+# Soak: 10,000 scripted restarts of one SnakeSession. Every round runs the
+# snake into the right wall, then presses "C". Python heap and RSS must
+# stay flat after warm-up, and restarting must not nest any calls. In
+# snake_v2, "C" starts the new round before the next frame is drawn.
+
+ROUNDS = 10_000
+WARMUP = 1_000
+MAX_HEAP_GROWTH = 64 * 1024       # bytes
+MAX_RSS_GROWTH = 1024 * 1024      # bytes
+MAX_EXTRA_DEPTH = 20              # frames below the test while a round runs
+
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak RSS (KiB on Linux, bytes on macOS); still catches unbounded growth
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def stack_depth():
+    depth = 0
+    frame = sys._getframe(1)
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+def play_round(session):
+    session.step(RIGHT)
+    while session.state != GAME_OVER:
+        session.step()
+    session.restart()
+
+
+def test_restart_cycle():
+    session = SnakeSession(SnakeSim(seed=1, obstacles=0))
+    assert session.step(RIGHT) == PLAYING
+    while session.step() != GAME_OVER:
+        pass
+    assert session.step() == GAME_OVER  # stays over until restarted
+    session.restart()
+    assert session.state == RESTARTING
+    assert session.step() == PLAYING
+    assert session.rounds == 2
+    assert session.sim.length == 1 and not session.sim.game_close
+    session.quit()
+    assert session.state == QUIT
+
+
+def test_restarts_keep_memory_flat():
+    session = SnakeSession(SnakeSim(seed=1, obstacles=0))
+    body, occupied = session.sim.snake_list, session.sim.occupied
+    tracemalloc.start()
+    try:
+        for _ in range(WARMUP):
+            play_round(session)
+        heap_start, _ = tracemalloc.get_traced_memory()
+        rss_start = rss_bytes()
+
+        for _ in range(ROUNDS - WARMUP):
+            play_round(session)
+        session.step()  # applies the last restart
+        heap_end, _ = tracemalloc.get_traced_memory()
+        rss_end = rss_bytes()
+    finally:
+        tracemalloc.stop()
+
+    assert session.rounds == ROUNDS + 1
+    assert heap_end - heap_start < MAX_HEAP_GROWTH, "heap keeps growing across restarts"
+    assert rss_end - rss_start < MAX_RSS_GROWTH, "RSS keeps growing across restarts"
+    # The same containers are reused round after round
+    sim = session.sim
+    assert sim.snake_list is body and sim.occupied is occupied
+
+
+def test_restarts_do_not_recurse():
+    session = SnakeSession(SnakeSim(seed=1, obstacles=0))
+    base = stack_depth()
+    limit = sys.getrecursionlimit()
+    # A restart that nested a new game loop would run out of stack long
+    # before 10,000 rounds under this limit
+    sys.setrecursionlimit(base + MAX_EXTRA_DEPTH)
+    try:
+        for _ in range(ROUNDS):
+            play_round(session)
+        session.step()
+    finally:
+        sys.setrecursionlimit(limit)
+    assert session.rounds == ROUNDS + 1
+
+
+@pytest.fixture
+def snake_v2(monkeypatch, tmp_path):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    monkeypatch.setenv("GAMES_SCORES", str(tmp_path / "scores.db"))
+    monkeypatch.setenv("GAMES_SEED", "3")
+    for name in ("GAMES_RECORD", "GAMES_REPLAY", "GAMES_BENCH_TICKS", "GAMES_CAPTURE", "GAMES_PRESET"):
+        monkeypatch.delenv(name, raising=False)
+    import snake_v2
+    pygame.init()
+    yield snake_v2.Game(pygame.display.set_mode(snake_v2.Game.size))
+    pygame.quit()
+
+
+def test_snake_v2_restart_draws_the_new_round(snake_v2):
+    game = snake_v2
+    keys = [pygame.K_RIGHT]
+    game.session.events = lambda: [pygame.event.Event(pygame.KEYDOWN, key=key) for key in keys[:1]]
+    while game.play.state != GAME_OVER:
+        assert game.step()
+        game.render()
+        keys.clear()
+    sim = game.sim
+    dead_speed = sim.speed
+    assert game.step()  # the game over screen
+    game.render()
+
+    keys.append(pygame.K_c)
+    assert game.step()
+    keys.clear()
+    # Reset before anything draws it: no dead snake, no leftover step time
+    assert game.play.state == PLAYING and game.play.rounds == 2
+    assert sim.length == 1 and sim.ticks == 0 and sim.prev_head == (sim.x, sim.y)
+    assert game.accumulator == 0 and not game.stepped and sim.speed <= dead_speed
+    game.render()  # still the game over frame
+    assert game.step()
+    assert sim.ticks == 0  # less than a step's worth of frames
+    game.render()
+    head = (int(sim.x) + 1, int(sim.y) + 1)
+    assert game.screen.get_at(head)[:3] == (0, 0, 0)
@@ -0,0 +1,162 @@
+import random
+
+from snake_sim import SnakeSim, FreeCells, LEFT, RIGHT, UP, DOWN
+
+# SnakeSim: seeded runs repeat exactly, walls, the body and food end or
+# grow the snake the way the game shows it, and after every step the body,
+# the occupancy map and the free-cell set agree with each other.
+
+ACTIONS = [LEFT, RIGHT, UP, DOWN, None]
+MOVES = {LEFT: (-1, 0), RIGHT: (1, 0), UP: (0, -1), DOWN: (0, 1)}
+
+
+def snapshot(sim):
+    return (sim.x, sim.y, sim.length, sim.speed, list(sim.food), sim.special_food, sim.poison_food,
+            sim.power_up, sim.power_active, [tuple(pos) for pos in sim.snake_list], sim.game_close)
+
+
+def item_cells(sim):
+    items = (sim.food, sim.special_food, sim.poison_food, sim.power_up)
+    return {sim.cell_id(item) for item in items if item}
+
+
+def check_invariants(sim):
+    body = sim.snake_list
+    assert body[-1] == (sim.x, sim.y)
+    assert sum(sim.occupied.values()) == len(body)
+    assert set(sim.occupied) == set(body)
+
+    # Free cells are exactly the ones under nothing
+    taken = {sim.cell_id(pos) for pos in body} | {sim.cell_id(pos) for pos in sim.obstacle_cells}
+    taken |= item_cells(sim)
+    taken.discard(None)
+    free = sim.free
+    ids = set(free.ids[:free.count])
+    assert len(ids) == free.count
+    assert ids == set(range(free.size)) - taken
+    for i in range(free.count):
+        assert free.slot[free.ids[i]] == i
+
+    # Nothing spawns on anything else
+    items = [sim.cell_id(item) for item in (sim.food, sim.special_food, sim.poison_food, sim.power_up) if item]
+    assert len(items) == len(set(items))
+    assert not set(items) & {sim.cell_id(pos) for pos in sim.obstacle_cells}
+
+
+def greedy(sim, rng):
+    # Toward the food along cells that are on the board and free, so the
+    # snake grows for a while before it boxes itself in
+    block = sim.block
+    options = []
+    for action, (dx, dy) in MOVES.items():
+        x, y = sim.x + dx * block, sim.y + dy * block
+        if 0 <= x < sim.width and 0 <= y < sim.height and (x, y) not in sim.occupied \
+                and (x, y) not in sim.obstacle_cells:
+            options.append((abs(x - sim.food[0]) + abs(y - sim.food[1]) + rng.random() * 4 * block, action))
+    return min(options)[1] if options else None
+
+
+def run(seed, ticks):
+    # Random turns, a new round after every crash
+    sim = SnakeSim(seed=seed)
+    rng = random.Random(seed)
+    states = []
+    for _ in range(ticks):
+        if sim.step(rng.choice(ACTIONS)):
+            sim.reset()
+        states.append(snapshot(sim))
+    return states
+
+
+def test_seeded_runs_repeat():
+    first = run(7, 2000)
+    assert run(7, 2000) == first
+    assert run(8, 2000) != first
+
+
+def test_wall_ends_the_round():
+    sim = SnakeSim(seed=1, obstacles=0)
+    sim.step(RIGHT)
+    while not sim.step():
+        pass
+    # The step that starts past the edge is the one that ends it
+    assert sim.game_close
+    assert sim.x == sim.width + sim.block
+    assert sim.ticks == (sim.width - sim.width / 2) // sim.block + 1
+
+
+def test_running_into_the_body_ends_the_round():
+    # The body starts along the top row, head at x=40 heading down
+    sim = SnakeSim(seed=1, obstacles=0, start_length=5)
+    assert sim.snake_list[-1] == (40.0, 0.0) and sim.dy == sim.block
+    assert not sim.step(DOWN)
+    assert not sim.step(LEFT)
+    assert sim.step(UP)  # back into (30, 0), which the tail hasn't left yet
+
+
+def test_food_grows_the_snake():
+    sim = SnakeSim(seed=2, obstacles=0)
+    sim.free.give(sim.cell_id(sim.food))
+    sim.food = [sim.x + sim.block, sim.y]
+    sim.free.take(sim.cell_id(sim.food))
+    sim.step(RIGHT)
+    assert sim.length == 2
+    assert sim.food != [sim.x, sim.y]
+    check_invariants(sim)
+
+
+def test_body_and_occupancy_agree():
+    sim = SnakeSim(seed=3)
+    rng = random.Random(3)
+    longest = crashes = 0
+    for _ in range(5000):
+        if sim.step(greedy(sim, rng)):
+            crashes += 1
+            sim.reset()
+            continue
+        check_invariants(sim)
+        longest = max(longest, sim.length)
+    assert longest > 10 and crashes
+
+
+def test_long_body_starts_on_the_board():
+    sim = SnakeSim(seed=4, obstacles=0, start_length=150)
+    check_invariants(sim)
+    assert len(sim.snake_list) == len(sim.occupied) == 150
+    rng = random.Random(4)
+    for _ in range(300):
+        if sim.step(greedy(sim, rng)):
+            break
+        check_invariants(sim)
+    assert sim.ticks > 50
+
+
+def test_long_snake_preset_body():
+    # 5,000 segments on 120x120 cells, as the long_snake benchmark runs it
+    sim = SnakeSim(width=1200, height=1200, obstacles=0, start_length=5000, invincible=True)
+    check_invariants(sim)
+    assert len(sim.occupied) == 5000
+    for _ in range(50):
+        assert not sim.step()
+    check_invariants(sim)
+
+
+def test_free_cells():
+    free = FreeCells(10)
+    rng = random.Random(1)
+    for cell in (3, 7, 0, 9):
+        free.take(cell)
+    assert len(free) == 6
+    assert 3 not in free and 5 in free
+    free.take(3)  # already taken
+    assert len(free) == 6
+    for _ in range(50):
+        assert free.pick(rng) in {1, 2, 4, 5, 6, 8}
+    free.give(7)
+    free.give(7)
+    assert len(free) == 7 and 7 in free
+    for cell in range(10):
+        free.take(cell)
+    assert free.pick(rng) is None
+    free.fill()
+    assert len(free) == 10
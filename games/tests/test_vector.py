@@ -0,0 +1,62 @@
+import random
+from multiprocessing import shared_memory
+
+import pytest
+
+from envs.vector import SyncVectorEnv, ProcVectorEnv
+
+# Vector envs: the worker-process runner returns exactly what the
+# in-process one does for the same seeds and actions, auto-reset included,
+# and close() ends the workers and frees the shared memory block.
+
+NUM_ENVS = 5
+STEPS = 400
+
+
+def results(step):
+    obs, rewards, terminated, truncated, info = step
+    return list(obs), list(rewards), list(terminated), list(truncated), info["episodes"]
+
+
+@pytest.mark.parametrize("name", ["bird", "pong", "snake"])
+def test_workers_match_in_process(name):
+    sync = SyncVectorEnv(name, NUM_ENVS, seed=11)
+    procs = ProcVectorEnv(name, NUM_ENVS, workers=2, seed=11)
+    try:
+        obs, _ = sync.reset(seed=11)
+        expected = list(obs)
+        obs, _ = procs.reset(seed=11)
+        assert list(obs) == expected
+
+        rng = random.Random(11)
+        n = sync.action_space.n
+        episodes = 0
+        for _ in range(STEPS):
+            actions = [rng.randrange(n) for _ in range(NUM_ENVS)]
+            expected = results(sync.step(actions))
+            assert results(procs.step(actions)) == expected
+            episodes += len(expected[4])
+        if name != "pong":
+            assert episodes  # auto-reset happened along the way
+    finally:
+        sync.close()
+        procs.close()
+
+
+def test_close_releases_workers_and_shared_memory():
+    envs = ProcVectorEnv("snake", 4, workers=2, seed=1)
+    envs.reset()
+    envs.step([0, 1, 2, 3])
+    name = envs.shm.name
+    processes = envs.processes
+    assert all(process.is_alive() for process in processes)
+
+    envs.close()
+    assert not any(process.is_alive() for process in processes)
+    assert all(process.exitcode == 0 for process in processes)
+    assert envs.shm is None
+    with pytest.raises(ValueError):
+        envs.obs[0]  # the views over the block are released
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+    envs.close()  # a second close does nothing